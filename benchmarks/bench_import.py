@@ -0,0 +1,60 @@
+"""
+Measures the import time of nike_devices in a fresh interpreter and fails when it regresses.
+
+The module must not pull in scrapli, requests, urllib3, python-dotenv or the genie/textfsm parsers at
+import time; they are loaded on first use. Run it in CI to guard against regressions.
+
+Usage:
+    python benchmarks/bench_import.py --max-ms 50 --runs 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+MODULES = ("nike_devices", "nike_fleet")
+LAZY_MODULES = ("scrapli", "requests", "urllib3", "dotenv", "asyncio", "genie", "textfsm", "ntc_templates")
+
+PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = (time.perf_counter() - start) * 1000\n"
+    "loaded = [name for name in {lazy!r} if name in sys.modules]\n"
+    "print(elapsed, ','.join(loaded))\n"
+)
+
+
+def measure(module, runs):
+    timings = []
+    loaded = ""
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", PROBE.format(module=module, lazy=LAZY_MODULES)],
+                                cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.split()
+        timings.append(float(output[0]))
+        loaded = output[1] if len(output) > 1 else ""
+    return min(timings), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-ms", type=float, default=50.0, help="Fail when the best import time is above this.")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        best, loaded = measure(module, args.runs)
+        print(f"{module:14s} {best:8.2f} ms (best of {args.runs})")
+        if loaded:
+            print(f"  FAIL: importing {module} loaded {loaded}")
+            failed = True
+        if best > args.max_ms:
+            print(f"  FAIL: import took longer than {args.max_ms} ms")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Compares the one-connection-per-command behaviour of NikeCiscoDevice with the persistent session mode.
+
+Usage:
+    python benchmarks/bench_session.py 192.168.178.1 jenkins jenkins --iterations 20
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from nike_devices import NikeCiscoDevice  # noqa: E402
+
+
+def run_calls(device, method, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        getattr(device, method)()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("hostname")
+    parser.add_argument("username")
+    parser.add_argument("password")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--method", default="get_clock_info")
+    args = parser.parse_args()
+
+    device = NikeCiscoDevice(args.hostname, args.username, args.password)
+    per_command = run_calls(device, args.method, args.iterations)
+
+    with device:
+        session = run_calls(device, args.method, args.iterations)
+
+    print(f"{args.method} x {args.iterations}")
+    print(f"  connection per command : {per_command:8.2f}s ({per_command / args.iterations * 1000:8.1f} ms/call)")
+    print(f"  persistent session     : {session:8.2f}s ({session / args.iterations * 1000:8.1f} ms/call)")
+    print(f"  speedup                : {per_command / session:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Local mock IOS-XE SSH server replaying the canned outputs in benchmarks/fixtures.
+
+Every 'show ...' command is answered from fixtures/<command with spaces replaced by _>.txt after an optional
+latency, so NikeCiscoDevice can be benchmarked offline. Output size can be scaled by repeating table rows.
+
+Usage:
+    with MockIOSServer(latency=0.05, scale=100) as server:
+        device = NikeCiscoDevice('127.0.0.1', 'bench', 'bench', port=server.port)
+"""
+import asyncio
+import os
+import threading
+
+import asyncssh
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Number of header lines kept once when an output is scaled, the remaining rows are repeated.
+SCALABLE_COMMANDS = {
+    "show interfaces status": 2,
+    "show ip interface brief": 1,
+    "show ip arp": 1,
+    "show mac address-table": 5,
+    "show ip nat translations": 1,
+}
+
+EMPTY_OUTPUT_COMMANDS = ("terminal length", "terminal width", "terminal no monitor")
+
+
+def load_fixtures(scale=1):
+    outputs = {}
+    for name in os.listdir(FIXTURES):
+        # <command>__<suffix>.txt are extra recordings for verify_fast_parsers.py, the mock answers with <command>.txt.
+        if not name.endswith(".txt") or "__" in name:
+            continue
+        command = name[:-4].replace("_", " ")
+        with open(os.path.join(FIXTURES, name)) as f:
+            output = f.read().rstrip("\n")
+        header_lines = SCALABLE_COMMANDS.get(command)
+        if scale > 1 and header_lines is not None:
+            lines = output.splitlines()
+            rows = [line for line in lines[header_lines:] if not line.startswith("Total")]
+            output = "\n".join(lines[:header_lines] + rows * scale)
+        outputs[command] = output
+    return outputs
+
+
+class _Server(asyncssh.SSHServer):
+    def begin_auth(self, username):
+        return True
+
+    def password_auth_supported(self):
+        return True
+
+    def validate_password(self, username, password):
+        return True
+
+
+class MockIOSServer:
+    """
+    Mock IOS-XE SSH server running on its own event loop thread.
+
+    Attributes:
+        hostname(Str): Hostname shown in the prompt.
+        latency(Float): Seconds waited before answering every command.
+        scale(Int): Table rows of the scalable commands are repeated this many times.
+        port(Int): Listening port, 0 picks a free port.
+    """
+
+    def __init__(self, hostname="bench-sw1", latency=0.0, scale=1, port=0):
+        self.hostname = hostname
+        self.latency = latency
+        self.outputs = load_fixtures(scale)
+        self.port = port
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._started = threading.Event()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _answer(self, command):
+        if not command:
+            return ""
+        if command.startswith(EMPTY_OUTPUT_COMMANDS):
+            return ""
+        output = self.outputs.get(command)
+        if output is None:
+            return "                  ^\n% Invalid input detected at '^' marker.\n"
+        return output
+
+    async def _handle(self, process):
+        prompt = f"{self.hostname}#"
+        process.stdout.write(f"\r\n{prompt}")
+        try:
+            async for line in process.stdin:
+                command = line.strip()
+                if command in ("exit", "logout"):
+                    break
+                if self.latency and command:
+                    await asyncio.sleep(self.latency)
+                if process.channel.is_closing():
+                    break
+                output = self._answer(command)
+                if output:
+                    process.stdout.write(output.replace("\n", "\r\n") + "\r\n")
+                process.stdout.write(prompt)
+        except (asyncssh.BreakReceived, asyncssh.TerminalSizeChanged, ConnectionError):
+            pass
+        process.exit(0)
+
+    async def _start_server(self):
+        host_key = asyncssh.generate_private_key("ssh-ed25519")
+        self._server = await asyncssh.create_server(_Server, "127.0.0.1", self.port, server_host_keys=[host_key],
+                                                    process_factory=self._handle)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._start_server())
+        self._started.set()
+        self._loop.run_forever()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="mock-ios", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+        self._server.close()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=2222)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+    with MockIOSServer(latency=args.latency, scale=args.scale, port=args.port) as server:
+        print(f"mock IOS-XE listening on 127.0.0.1:{server.port}")
+        while True:
+            time.sleep(3600)
@@ -0,0 +1,140 @@
+"""
+Local mock VeloCloud Orchestrator REST API for benchmarking NikeVcoDevice offline.
+
+It serves /enterprise/getEnterpriseEdges, /edge/getEdgeConfigurationStack and
+/monitoring/getEnterpriseEdgeLinkStatus for a generated enterprise of `edges` edges.
+
+Usage:
+    with MockVcoServer(edges=1500, latency=0.02) as server:
+        vco = NikeVcoDevice(token='bench', vco_url=server.url)
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+
+
+def make_edges(count):
+    return [{"id": edge_id,
+             "name": f"BENCH{edge_id:05d}",
+             "serialNumber": f"VC{edge_id:08d}",
+             "edgeState": "CONNECTED",
+             "modelNumber": "edge680"}
+            for edge_id in range(1, count + 1)]
+
+
+def make_configuration_stack(edge_id):
+    networks = [{"vlanId": vlan, "name": f"vlan{vlan}", "cidrIp": f"10.{edge_id % 250}.{vlan}.1",
+                 "netmask": "255.255.255.0", "dhcp": {"enabled": True}, "baseDhcpAddr": 10, "numDhcpAddr": 200,
+                 "advertise": True, "interfaces": ["GE1", "GE2"]}
+                for vlan in (10, 20, 30)]
+    routed = [{"name": name, "addressing": {"cidrIp": f"198.51.100.{edge_id % 250}", "netmask": "255.255.255.0",
+                                            "type": "DHCP", "cidrPrefix": 24},
+               "l2": {"duplex": "FULL", "speed": "AUTO"}, "wanOverlay": "AUTO_DISCOVERED"}
+              for name in ("GE3", "GE4")]
+    return [{"id": edge_id * 10, "modules": [
+        {"name": "controlPlane", "data": {}},
+        {"name": "deviceSettings", "data": {"lan": {"management": {"cidrIp": f"172.16.{edge_id % 250}.1"},
+                                                    "networks": networks},
+                                            "routedInterfaces": routed}},
+    ]}]
+
+
+def make_link_status(edges):
+    return [{"edgeName": edge["name"], "edgeSerialNumber": edge["serialNumber"],
+             "edgeHASerialNumber": None, "edgeState": "CONNECTED", "interface": interface,
+             "linkIpAddress": "198.51.100.10", "isp": "Bench ISP", "linkState": "STABLE"}
+            for edge in edges for interface in ("GE3", "GE4")]
+
+
+class MockVcoServer:
+    """
+    Mock VCO REST server running on a background thread.
+
+    Attributes:
+        edges(Int): Number of edges in the enterprise.
+        latency(Float): Seconds waited before answering every request.
+        port(Int): Listening port, 0 picks a free port.
+    """
+
+    def __init__(self, edges=100, latency=0.0, port=0):
+        self.latency = latency
+        self.requests = 0
+        self.edges = make_edges(edges)
+        self._edges_body = json.dumps(self.edges).encode()
+        self._link_status_body = json.dumps(make_link_status(self.edges)).encode()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _body(self, path, data):
+        if path.endswith("/enterprise/getEnterpriseEdges"):
+            return 200, self._edges_body
+        if path.endswith("/edge/getEdgeConfigurationStack"):
+            return 200, json.dumps(make_configuration_stack(int(data["edgeId"]))).encode()
+        if path.endswith("/monitoring/getEnterpriseEdgeLinkStatus"):
+            return 200, self._link_status_body
+        return 404, json.dumps({"error": {"message": f"unknown method {path}"}}).encode()
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes, without this every response waits for a delayed ACK.
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                data = json.loads(self.rfile.read(length) or b"null") or {}
+                mock.requests += 1
+                if mock.latency:
+                    time.sleep(mock.latency)
+                status, body = mock._body(self.path, data)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-vco", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--edges", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    with MockVcoServer(edges=args.edges, latency=args.latency, port=args.port) as server:
+        print(f"mock VCO listening on {server.url}")
+        while True:
+            time.sleep(3600)
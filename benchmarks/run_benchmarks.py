@@ -0,0 +1,206 @@
+"""
+Offline benchmark suite for NikeCiscoDevice and NikeVcoDevice.
+
+Starts the mock IOS-XE SSH server (mock_ios.py) and the mock VCO REST API (mock_vco.py) locally and reports:
+    - per-method latency and peak Python memory of NikeCiscoDevice get_* calls, per connection and in a session
+    - throughput of NikeFleet (threads) and nike_fleet.gather (asyncio) at N concurrent devices
+    - parse time of the canned outputs per parsing module
+    - per-method latency of NikeVcoDevice calls
+    - with --phases, the connect/command/parse/http split recorded by nike_metrics across the whole run
+
+Usage:
+    python benchmarks/run_benchmarks.py --iterations 20 --concurrency 1 10 50 --latency 0.05 --json results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, os.pardir))
+sys.path.insert(0, BENCH_DIR)
+
+from mock_ios import MockIOSServer, load_fixtures  # noqa: E402
+from mock_vco import MockVcoServer  # noqa: E402
+from nike_devices import AsyncNikeCiscoDevice, NikeCiscoDevice, NikeVcoDevice  # noqa: E402
+from nike_fleet import NikeFleet, gather  # noqa: E402
+import nike_metrics  # noqa: E402
+import nike_parsers  # noqa: E402
+
+CISCO_METHODS = [
+    ("get_clock_info", 'no_parse'),
+    ("get_os_version", 'textfsm'),
+    ("get_interface_status", 'textfsm'),
+    ("get_interface_brief", 'textfsm'),
+    ("get_arp_info", 'textfsm'),
+    ("get_mac_address_table", 'textfsm'),
+    ("get_routing_table", 'textfsm'),
+    ("get_cdp_neighbors_details", 'textfsm'),
+    ("get_configuration", None),
+]
+
+VCO_METHODS = [
+    ("getEdgesByName", lambda vco, edge: vco.getEdgesByName(edge["name"]), lambda vco: vco.inventory.invalidate()),
+    ("getEdgeStatus", lambda vco, edge: vco.getEdgeStatus(edge["name"]), lambda vco: vco.link_status.invalidate()),
+    ("getEdgeLanSviInfo", lambda vco, edge: vco.getEdgeLanSviInfo(edge["id"]), lambda vco: vco.invalidate_edge_config()),
+    ("getEdgeWanInterfaceInfo", lambda vco, edge: vco.getEdgeWanInterfaceInfo(edge["id"]),
+     lambda vco: vco.invalidate_edge_config()),
+]
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "mean_ms": statistics.mean(samples) * 1000,
+        "p50_ms": samples[len(samples) // 2] * 1000,
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+    }
+
+
+def timed(call, iterations, reset=None):
+    samples = []
+    for _ in range(iterations):
+        if reset is not None:
+            reset()
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def peak_memory(call):
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_cisco_methods(server, args):
+    results = {}
+    device = NikeCiscoDevice("127.0.0.1", "bench", "bench", port=server.port, transport=args.transport)
+    for method, parsing_module in CISCO_METHODS:
+        call_args = () if parsing_module is None else (parsing_module,)
+        call = lambda: getattr(device, method)(*call_args)  # noqa: E731
+        per_connection = timed(call, args.iterations)
+        with device:
+            session = timed(call, args.iterations)
+            memory = peak_memory(call)
+        results[method] = {"per_connection": summarize(per_connection), "session": summarize(session),
+                           "peak_memory_bytes": memory}
+    return results
+
+
+def bench_fleet(server, args):
+    results = {}
+    for concurrency in args.concurrency:
+        hosts = ["127.0.0.1"] * concurrency
+        fleet = NikeFleet(hosts, "bench", "bench", port=server.port, transport=args.transport)
+        start = time.perf_counter()
+        failures = sum(not result.ok for result in fleet.run("get_interface_status", "textfsm", workers=concurrency))
+        elapsed = time.perf_counter() - start
+        results[f"threads_{concurrency}"] = {"seconds": elapsed, "devices_per_second": concurrency / elapsed,
+                                             "failures": failures}
+
+        devices = [AsyncNikeCiscoDevice("127.0.0.1", "bench", "bench", port=server.port) for _ in hosts]
+        start = time.perf_counter()
+        gathered = asyncio.run(gather(devices, "get_interface_status", "textfsm", concurrency=concurrency))
+        elapsed = time.perf_counter() - start
+        results[f"asyncio_{concurrency}"] = {"seconds": elapsed, "devices_per_second": concurrency / elapsed,
+                                             "failures": sum(not result.ok for result in gathered)}
+    return results
+
+
+def bench_parsing(args):
+    results = {}
+    outputs = load_fixtures(args.scale)
+    for command, output in sorted(outputs.items()):
+        for parsing_module in args.parsing_modules:
+            if parsing_module == 'fast' and command not in nike_parsers.FAST_PARSERS:
+                continue
+            call = lambda: nike_parsers.parse_output(command, output, parsing_module)  # noqa: E731
+            try:
+                call()
+            except ImportError:
+                continue
+            results[f"{command} [{parsing_module}]"] = summarize(timed(call, args.iterations))
+    return results
+
+
+def bench_vco(args):
+    results = {}
+    with MockVcoServer(edges=args.edges, latency=args.latency) as server:
+        vco = NikeVcoDevice(token="bench", vco_url=server.url)
+        edge = server.edges[len(server.edges) // 2]
+        for name, call, reset in VCO_METHODS:
+            cold = timed(lambda: call(vco, edge), args.iterations, reset=lambda: reset(vco))
+            warm = timed(lambda: call(vco, edge), args.iterations)
+            results[name] = {"cold": summarize(cold), "warm": summarize(warm),
+                             "peak_memory_bytes": peak_memory(lambda: (reset(vco), call(vco, edge)))}
+        for concurrency in args.concurrency:
+            vco.invalidate_edge_config()
+            start = time.perf_counter()
+            failures = sum(not result.ok for result in vco.get_all_edge_configs(concurrency=concurrency))
+            elapsed = time.perf_counter() - start
+            results[f"get_all_edge_configs_{concurrency}"] = {"seconds": elapsed,
+                                                              "edges_per_second": len(server.edges) / elapsed,
+                                                              "failures": failures}
+        vco.close()
+    return results
+
+
+def print_table(title, rows):
+    print(f"\n{title}")
+    print("-" * len(title))
+    for name, values in rows.items():
+        print(f"  {name:45s} {json.dumps(values, default=lambda value: round(value, 3))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the mocks wait before every answer.")
+    parser.add_argument("--scale", type=int, default=1, help="Table row multiplier of the canned outputs.")
+    parser.add_argument("--edges", type=int, default=1500, help="Edges in the mock VCO enterprise.")
+    parser.add_argument("--transport", default="system", help="scrapli transport of the sync driver.")
+    parser.add_argument("--parsing-modules", nargs="+", default=["textfsm", "genie", "fast"])
+    parser.add_argument("--skip", nargs="*", default=[], choices=["cisco", "fleet", "parsing", "vco"])
+    parser.add_argument("--phases", action="store_true", help="Report the per-phase timings of nike_metrics.")
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args()
+
+    stats = nike_metrics.StatsRecorder()
+    if args.phases:
+        nike_metrics.set_default_recorder(stats)
+
+    results = {}
+    with MockIOSServer(latency=args.latency, scale=args.scale) as server:
+        if "cisco" not in args.skip:
+            results["cisco"] = bench_cisco_methods(server, args)
+            print_table("NikeCiscoDevice per-method latency", results["cisco"])
+        if "fleet" not in args.skip:
+            results["fleet"] = bench_fleet(server, args)
+            print_table("Fleet throughput (get_interface_status)", results["fleet"])
+    if "parsing" not in args.skip:
+        results["parsing"] = bench_parsing(args)
+        print_table("Parse time", results["parsing"])
+    if "vco" not in args.skip:
+        results["vco"] = bench_vco(args)
+        print_table("NikeVcoDevice per-method latency", results["vco"])
+    if args.phases:
+        results["phases"] = {" ".join(key): totals for key, totals in sorted(stats.summary().items())}
+        print_table("Per-phase totals", results["phases"])
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Checks the parsing_module='fast' parsers (nike_parsers.FAST_PARSERS) against genie on a corpus of recorded outputs
+and reports the speedup.
+
+The corpus is benchmarks/fixtures plus every --corpus directory. A recording is a <command>.txt file with the spaces
+of the command replaced by _, several recordings of one command are told apart by a __<suffix>, e.g.
+show_version__isr4451.txt. Exits 1 when a fast parser and genie disagree, 2 when genie is not installed.
+
+Usage:
+    python benchmarks/verify_fast_parsers.py --corpus ~/recorded_outputs --scale 1 50
+"""
+import argparse
+import os
+import sys
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, os.pardir))
+sys.path.insert(0, BENCH_DIR)
+
+from mock_ios import FIXTURES, SCALABLE_COMMANDS  # noqa: E402
+import nike_parsers  # noqa: E402
+
+
+def load_corpus(directories, scale):
+    recordings = []
+    for directory in directories:
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".txt"):
+                continue
+            command = name[:-4].split("__")[0].replace("_", " ")
+            if command not in nike_parsers.FAST_PARSERS:
+                continue
+            with open(os.path.join(directory, name)) as f:
+                output = f.read()
+            header_lines = SCALABLE_COMMANDS.get(command)
+            if scale > 1 and header_lines is not None:
+                lines = output.splitlines()
+                rows = [line for line in lines[header_lines:] if not line.startswith("Total")]
+                output = "\n".join(lines[:header_lines] + rows * scale)
+            recordings.append((os.path.join(directory, name), command, output))
+    return recordings
+
+
+def first_difference(expected, actual, path="parsed"):
+    """Path and values of the first place where two parsed structures differ, None when they are equal."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key in list(expected) + [key for key in actual if key not in expected]:
+            if key not in actual or key not in expected:
+                return f"{path}[{key!r}]", expected.get(key, "<missing>"), actual.get(key, "<missing>")
+            difference = first_difference(expected[key], actual[key], f"{path}[{key!r}]")
+            if difference:
+                return difference
+        return None
+    return None if expected == actual else (path, expected, actual)
+
+
+def best_of(call, number):
+    return min(timeit.repeat(call, number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", nargs="*", default=[], help="Directories of recorded outputs.")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1],
+                        help="Table row multipliers applied to the scalable commands.")
+    parser.add_argument("--number", type=int, default=20, help="Parses per timing sample.")
+    args = parser.parse_args()
+
+    try:
+        import genie.libs.parser  # noqa: F401
+    except ImportError:
+        print("genie is not installed, nothing to compare the fast parsers with (pip install pyats genie)")
+        sys.exit(2)
+
+    failed = False
+    for scale in args.scale:
+        for path, command, output in load_corpus([FIXTURES] + args.corpus, scale):
+            expected = nike_parsers.genie_parse(command, output)
+            actual = nike_parsers.fast_parse(command, output)
+            difference = first_difference(expected, actual)
+            genie_seconds = best_of(lambda: nike_parsers.genie_parse(command, output), max(1, args.number // 4))
+            fast_seconds = best_of(lambda: nike_parsers.fast_parse(command, output), args.number)
+            status = "ok  " if difference is None else "FAIL"
+            print(f"{status} x{scale:<4d} {os.path.basename(path):40s} genie {genie_seconds * 1000:8.3f} ms  "
+                  f"fast {fast_seconds * 1000:7.3f} ms  speedup {genie_seconds / fast_seconds:6.1f}x")
+            if difference is not None:
+                failed = True
+                print(f"     {difference[0]}: genie {difference[1]!r}, fast {difference[2]!r}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
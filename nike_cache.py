@@ -0,0 +1,264 @@
+from collections import OrderedDict
+import hashlib
+import os
+import pickle
+import threading
+import time
+
+MISS = object()
+
+
+class MemoryCache:
+    """
+    In-memory LRU cache bounded by the pickled size of the stored values.
+    Values are kept pickled, so every get() returns a fresh copy the caller may modify.
+
+    Attributes:
+        max_bytes(Int): Upper bound for the summed size of the cached values.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            expires_at, size, data = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.current_bytes -= size
+                return MISS
+            self._entries.move_to_end(key)
+        return pickle.loads(data)
+
+    def set(self, key, value, ttl):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        size = len(data)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (time.monotonic() + ttl, size, data)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.current_bytes -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCache:
+    """
+    On-disk cache, one pickle file per key, evicting the least recently used files above max_bytes.
+    It survives process restarts, so short-lived Jenkins jobs can share results.
+
+    Attributes:
+        directory(Str): Folder holding the cache files, created if missing.
+        max_bytes(Int): Upper bound for the summed size of the cache files.
+    """
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._sizes = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self._scan()
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(repr(key).encode()).hexdigest() + ".pickle")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                expires_at, stored_key, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return MISS
+        if stored_key != key:
+            return MISS
+        if expires_at < time.time():
+            self.delete(key)
+            return MISS
+        try:
+            # The file mtime is the LRU clock.
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def set(self, key, value, ttl):
+        data = pickle.dumps((time.time() + ttl, key, value), protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.current_bytes += len(data) - self._sizes.get(path, 0)
+            self._sizes[path] = len(data)
+            if self.current_bytes > self.max_bytes:
+                self._evict()
+
+    def delete(self, key):
+        path = self._path(key)
+        with self._lock:
+            self.current_bytes -= self._sizes.pop(path, 0)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            for name in os.listdir(self.directory):
+                if name.endswith(".pickle"):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
+            self._sizes.clear()
+            self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._sizes)
+
+    def _scan(self):
+        """Rebuilds the size accounting from the directory and returns its (mtime, size, path) files.
+        Other processes sharing the directory are only seen here, so it runs at startup and before evicting."""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pickle"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        self._sizes = {path: size for _, size, path in files}
+        self.current_bytes = sum(self._sizes.values())
+        return files
+
+    def _evict(self):
+        # Called with the lock held, once the running total went over max_bytes.
+        files = self._scan()
+        if self.current_bytes <= self.max_bytes:
+            return
+        for _, size, path in sorted(files):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            del self._sizes[path]
+            self.current_bytes -= size
+            if self.current_bytes <= self.max_bytes:
+                break
+
+
+class _Flight:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResultCache:
+    """
+    Result cache for NikeCiscoDevice show commands, keyed by (host, command, parsing_module).
+    Concurrent callers asking for the same key while it is being collected wait for that single
+    device query instead of sending their own (single-flight). Every caller gets its own copy of the result.
+
+    Usage:
+    cache = ResultCache(ttls={"show ip route": 30, "show running-config": 0}, default_ttl=60)
+    device = NikeCiscoDevice('ip address/hostname', 'username', 'password', cache=cache)
+
+    Attributes:
+        backend: MemoryCache (default) or DiskCache instance.
+        ttls(Dict): Per-command TTL in seconds, a TTL of 0 disables caching for that command.
+        default_ttl(Int): TTL used for commands missing from ttls.
+    """
+
+    def __init__(self, backend=None, ttls=None, default_ttl=60):
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def ttl_for(self, command, default=None):
+        """TTL of command: the ttls entry, else the given default (the command registry TTL), else default_ttl."""
+        return self.ttls.get(command, self.default_ttl if default is None else default)
+
+    def get_or_fetch(self, key, fetch, ttl):
+        """Returns the cached value for key, calling fetch() once across all concurrent callers on a miss."""
+        if ttl <= 0:
+            return fetch()
+
+        value = self.backend.get(key)
+        if value is not MISS:
+            return value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            # The leader returns the fetched object itself, the waiters get copies.
+            return pickle.loads(pickle.dumps(flight.value, protocol=pickle.HIGHEST_PROTOCOL))
+
+        try:
+            # Another leader may have filled the key between our miss and taking the lead.
+            value = self.backend.get(key)
+            if value is MISS:
+                value = fetch()
+                self.backend.set(key, value, ttl)
+            flight.value = value
+            return value
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.event.set()
+
+    def invalidate(self, host, command, parsing_modules=None):
+        """Drops the cached results of one command on one host, by default for every parsing_module the devices
+        cache (nike_devices.CACHED_PARSING_MODULES)."""
+        if parsing_modules is None:
+            from nike_devices import CACHED_PARSING_MODULES
+            parsing_modules = CACHED_PARSING_MODULES
+        for parsing_module in parsing_modules:
+            self.backend.delete((host, command, parsing_module))
+
+    def clear(self):
+        self.backend.clear()
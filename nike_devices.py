@@ -1,19 +1,75 @@
-from scrapli.driver.core import IOSXEDriver
 from pprint import pprint
-import requests
+from collections import namedtuple
+import copy
 import json
-import urllib3
+from functools import cached_property
 import os
-import pathlib
-from os.path import join
-from dotenv import load_dotenv
+import re
+import threading
+import time
+import warnings
 
-dotenv_path = join(pathlib.Path().resolve(), '/home/mteke1/oop/devnet_edge/.env')
-load_dotenv(dotenv_path)
+import nike_metrics
 
+# scrapli, requests, urllib3, python-dotenv and the parsers are imported on first use, so importing
+# this module stays cheap for short-lived Jenkins jobs. benchmarks/bench_import.py guards this.
+
+DEFAULT_DOTENV_PATH = '/home/mteke1/oop/devnet_edge/.env'
+# parsing_module values that turn the raw output into structured data in the parse phase.
+PARSED_MODULES = ('genie', 'textfsm', 'fast')
+# parsing_module values whose results _run_command keeps in a ResultCache, 'stream' and 'columnar' are not cached
+# themselves ('columnar' reuses the cached textfsm result).
+CACHED_PARSING_MODULES = ('no_parse',) + PARSED_MODULES
+_env_loaded = False
+
+
+def load_env(dotenv_path=None, override=False):
+    """
+    Loads the .env file holding VELO_TOKEN into os.environ.
+    The path is taken from the argument, the NIKE_DOTENV_PATH environment variable or DEFAULT_DOTENV_PATH.
+    NikeVcoDevice calls it the first time it needs a token that was not passed in.
+    """
+    global _env_loaded
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path or os.environ.get('NIKE_DOTENV_PATH', DEFAULT_DOTENV_PATH), override=override)
+    _env_loaded = True
+
+
+def _iosxe_driver(**device):
+    from scrapli.driver.core import IOSXEDriver
+    return IOSXEDriver(**device)
+
+
+def _async_iosxe_driver(**device):
+    from scrapli.driver.core import AsyncIOSXEDriver
+    return AsyncIOSXEDriver(**device)
+
+
+def _connection_errors():
+    """Exceptions meaning the SSH channel dropped, resolved lazily to keep scrapli out of the import."""
+    from scrapli.exceptions import ScrapliConnectionError, ScrapliConnectionNotOpened
+    return (ScrapliConnectionError, ScrapliConnectionNotOpened, OSError, EOFError)
+
+
+def _close_errors():
+    from scrapli.exceptions import ScrapliException
+    return (ScrapliException, OSError)
+
+
+_json_loads = None
+
+
+def json_loads(data):
+    """Decodes a JSON document with orjson when it is installed, else with the json module. Both take bytes."""
+    global _json_loads
+    if _json_loads is None:
+        try:
+            from orjson import loads
+        except ImportError:
+            loads = json.loads
+        _json_loads = loads
+    return _json_loads(data)
 
-# Disable HTTPS Certificate warning
-urllib3.disable_warnings()
 
 class NikeDevice:
     """
@@ -35,13 +91,34 @@ class NikeCiscoDevice(NikeDevice):
     Usage:
     device = NikeCiscoDevice( 'ip address/hostname', 'username', 'password' )
 
+    By default every get_* method opens and closes its own SSH connection. Use the instance as a
+    context manager (or call connect()/disconnect()) to keep one session open for many calls.
+
+    The show command get_* methods (get_vlan_info, get_arp_info, ...) are generated from CISCO_SHOW_COMMANDS,
+    new ones are added with register_show_command(). The hottest ones also accept parsing_module='fast', which
+    builds the genie structure with a precompiled nike_parsers parser without loading genie. It matches genie on the
+    recorded outputs in benchmarks/fixtures, not on every output genie handles (see nike_parsers), so get_facts()
+    keeps parsing with genie.
+
     Attributes:
         hostname(Str): Specify ip address or hostname if DNS resolution is done.
         username(Str): Specify your tacacs Corparate Short login(CSL) username.
         password(Str): Specify your tacacs Corparate Short login(CSL) password.
+        facts_ttl(Int): Seconds the parsed 'show version' facts are reused by get_facts() and the get_*_info accessors.
+        cache(ResultCache): Optional nike_cache.ResultCache shared by devices to reuse recent show command results.
+        parse_pool(ParsePool): Optional nike_parsers.ParsePool running genie/textfsm parsing in worker processes.
+        config_change_command(Str): Cheap command whose output changes with the configuration, used by
+                                    backup_configuration(), e.g. "show archive".
+        metrics(Recorder): Optional nike_metrics recorder receiving the connect/command/parse timings,
+                           defaults to nike_metrics.default_recorder().
+        sink(ResultSink): Optional nike_storage.ResultSink every collected (not cached) result is written to.
+        driver_options: Optional extra scrapli driver arguments, e.g. port, transport, timeout_ops.
     """
     
-    def __init__(self, hostname, username, password):
+    CONFIG_CHANGE_COMMAND = "show running-config | include Last configuration change"
+
+    def __init__(self, hostname, username, password, facts_ttl=300, cache=None, parse_pool=None,
+                 config_change_command=None, metrics=None, sink=None, **driver_options):
         """Init method of the class"""
         NikeDevice.__init__(self, hostname, username, password)
         self.device = {
@@ -51,456 +128,1037 @@ class NikeCiscoDevice(NikeDevice):
             "auth_secondary": self.password,
             "auth_strict_key": False,
         }
-    
-    def get_configuration(self):
-        """This method is collecting running-configration from IOSXE/IOS devices.
+        self.device.update(driver_options)
+        self._conn = None
+        self.facts_ttl = facts_ttl
+        self._facts = None
+        self._facts_time = 0.0
+        self.cache = cache
+        self.parse_pool = parse_pool
+        self.config_change_command = config_change_command or NikeCiscoDevice.CONFIG_CHANGE_COMMAND
+        self.metrics = metrics or nike_metrics.default_recorder()
+        self.sink = sink
+
+    def __enter__(self):
+        return self.connect()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disconnect()
+
+    def connect(self):
+        """This method opens a persistent SSH session to the device.
+        While the session is open every get_* method is sent through the same scrapli channel
+        instead of doing its own open/close. A dropped channel is reopened automatically.
+
         Usage:
-            device.get_configuration()
-        """
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show running-config")
-        conn.close()
-        return response.result
+            device.connect()
+            device.get_os_version()
+            device.get_vlan_info()
+            device.disconnect()
 
-    def get_interface_status(self, parsing_module='no_parse'):
-        """This method is collecting 'show interface status' output from IOSXE/IOS devices.
+            or
 
-        Attributes:
-            parsing_module:
-                - no_parse  : Collects the data without parsing it
-                - genie     : Collects the output and parse it with genie parser.
-                - textfsm   : Collects the output and parse it with textfsm parser.
-        Usage:
-            device.get_interface_status(parsing_module)
+            with NikeCiscoDevice('ip address/hostname', 'username', 'password') as device:
+                device.get_os_version()
         """
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show interfaces status")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+        if self._conn is None:
+            self._conn = self._open()
+        return self
+
+    def disconnect(self):
+        """This method closes the persistent SSH session opened by connect()."""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except _close_errors():
+                pass
+
+    @property
+    def is_connected(self):
+        """True while a persistent session is held by this instance."""
+        return self._conn is not None
+
+    def _open(self):
+        conn = _iosxe_driver(**self.device)
+        with self.metrics.phase(nike_metrics.CONNECT, self.hostname, "ssh"):
+            conn.open()
+        return conn
+
+    def _reconnect(self):
+        self.disconnect()
+        self.connect()
+
+    def _with_connection(self, operation):
+        """Runs operation(conn) either over the persistent session or over a one-shot connection."""
+        if self._conn is None:
+            conn = self._open()
+            try:
+                return operation(conn)
+            finally:
+                conn.close()
+
+        if not self._conn.isalive():
+            self._reconnect()
+        try:
+            return operation(self._conn)
+        except _connection_errors():
+            # The channel dropped mid-command, reopen it once and retry.
+            self._reconnect()
+            return operation(self._conn)
+
+    def _timed_send(self, conn, command):
+        with self.metrics.phase(nike_metrics.COMMAND, self.hostname, command) as phase:
+            response = conn.send_command(command)
+            phase.bytes = len(response.raw_result)
+        return response
 
-    def get_interface_brief(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show ip interface brief")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    def _send_command(self, command):
+        return self._with_connection(lambda conn: self._timed_send(conn, command))
 
-    def get_interface_description(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show interface description")
-        conn.close()
+    def _send_commands(self, commands):
+        commands = list(commands)
+        # One send_command per command (what scrapli's send_commands does too) so each one is timed on its own.
+        return self._with_connection(lambda conn: [self._timed_send(conn, command) for command in commands])
+
+    @staticmethod
+    def _parse_response(response, parsing_module='no_parse'):
         if parsing_module == 'genie':
             return response.genie_parse_output()
         elif parsing_module == 'textfsm':
             return response.textfsm_parse_output()
+        elif parsing_module == 'fast':
+            from nike_parsers import fast_parse
+            return fast_parse(response.channel_input, response.result)
         else:
             return response.result
 
-    def get_trunk_interfaces(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show interfaces trunk")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
+    def _collect_and_parse(self, command, parsing_module='no_parse'):
+        response = self._send_command(command)
+        if parsing_module not in PARSED_MODULES:
+            result = response.result
         else:
-            return response.result    
+            with self.metrics.phase(nike_metrics.PARSE, self.hostname, command) as phase:
+                phase.bytes = len(response.result)
+                # A fast parse is cheaper than the round trip to a worker process.
+                if self.parse_pool is not None and parsing_module != 'fast':
+                    result = self.parse_pool.parse(command, response.result, parsing_module)
+                else:
+                    result = self._parse_response(response, parsing_module)
+        if self.sink is not None:
+            self.sink.write(self.hostname, command, result, parsing_module)
+        return result
+
+    def iter_command(self, command):
+        """This method sends a command and yields its output line by line while it is still being read from the channel.
+        Only the current line and one read buffer are held in memory, which keeps huge tables cheap.
 
-    def get_snmp_user(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show snmp user")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+        Usage:
+            for line in device.iter_command("show ip nat translations"):
+                print(line)
+        """
+        if self._conn is None:
+            conn = self._open()
+            try:
+                yield from self._iter_channel_lines(conn, command)
+            finally:
+                conn.close()
+            return
+
+        if not self._conn.isalive():
+            self._reconnect()
+        yield from self._iter_channel_lines(self._conn, command, drain=True)
+
+    @staticmethod
+    def _iter_channel_lines(conn, command, drain=False):
+        """Yields the output lines of command. With drain, a consumer stopping early (break, exception or garbage
+        collection) still reads the rest of the output up to the prompt, so the next command sent over the
+        persistent session does not read it as its own output."""
+        conn.acquire_priv(conn.default_desired_privilege_level)
+        prompt = re.compile(conn.comms_prompt_pattern.encode(), flags=re.M | re.I)
+        conn.channel.write(channel_input=command)
+        conn.channel.send_return()
+        buffer = b""
+        echo_skipped = False
+        while True:
+            buffer += conn.channel.read()
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if not echo_skipped:
+                    # First line is the echo of the command itself.
+                    echo_skipped = True
+                    continue
+                try:
+                    yield line.decode(errors="replace")
+                except BaseException:
+                    if drain:
+                        # Only the last partial line can hold the prompt, the rest is dropped as it is read.
+                        while not prompt.search(buffer.strip()):
+                            buffer = (buffer + conn.channel.read()).rsplit(b"\n", 1)[-1]
+                    raise
+            if echo_skipped and prompt.search(buffer.strip()):
+                return
+
+    def _run_command(self, command, parsing_module='no_parse', cache_ttl=None):
+        """Execution engine behind every get_* method: collects and parses one command, going through the
+        result cache when one is configured. cache_ttl is the registry TTL, see CISCO_SHOW_COMMANDS."""
+        if parsing_module == 'stream':
+            from nike_parsers import STREAM_PARSERS
+            return STREAM_PARSERS[command](self.iter_command(command))
+        if parsing_module == 'columnar':
+            from nike_tables import COLUMNAR_TABLES
+            return COLUMNAR_TABLES[command].from_rows(self._run_command(command, 'textfsm', cache_ttl))
+        if self.cache is None:
+            return self._collect_and_parse(command, parsing_module)
+        return self.cache.get_or_fetch(
+            (self.hostname, command, parsing_module),
+            lambda: self._collect_and_parse(command, parsing_module),
+            self.cache.ttl_for(command, cache_ttl),
+        )
+
+    def collect(self, commands, parsing_module='no_parse'):
+        """This method sends a list of commands over a single connection and returns the outputs keyed by command.
 
-    def get_eigrp_neighbor(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show ip eigrp neighbors")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
+        Attributes:
+            commands: List of show commands, e.g. ["show version", "show vlan"]
+            parsing_module:
+                - no_parse  : Collects the data without parsing it
+                - genie     : Collects the output and parse it with genie parser.
+                - textfsm   : Collects the output and parse it with textfsm parser.
+                - fast      : Parses with the nike_parsers.FAST_PARSERS parser of the command, genie for the others.
+        Usage:
+            device.collect(["show version", "show interfaces status"], parsing_module='genie')
+        """
+        parsing_module = _check_parsing_module("collect", parsing_module, CACHED_PARSING_MODULES)
+        responses = self._send_commands(commands)
+        if parsing_module not in PARSED_MODULES:
+            parsed = {response.channel_input: response.result for response in responses}
+        elif self.parse_pool is not None and parsing_module != 'fast':
+            # The outputs are parsed in parallel, so the batch is timed as one phase.
+            with self.metrics.phase(nike_metrics.PARSE, self.hostname, "collect") as phase:
+                phase.bytes = sum(len(response.result) for response in responses)
+                futures = {response.channel_input: self.parse_pool.submit(response.channel_input, response.result, parsing_module)
+                           for response in responses}
+                parsed = {command: future.result() for command, future in futures.items()}
         else:
-            return response.result
+            parsed = {}
+            for response in responses:
+                with self.metrics.phase(nike_metrics.PARSE, self.hostname, response.channel_input) as phase:
+                    phase.bytes = len(response.result)
+                    parsed[response.channel_input] = self._parse_response(response, parsing_module)
+        if self.sink is not None:
+            for command, result in parsed.items():
+                self.sink.write(self.hostname, command, result, parsing_module)
+        return parsed
+
+    def get_configuration(self, store=None):
+        """This method is collecting running-configration from IOSXE/IOS devices.
 
-    def get_eigrp_topology(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show ip eigrp topology")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+        Attributes:
+            store(ConfigStore): Optional nike_storage.ConfigStore. When given, the configuration is only
+                                downloaded if the device reports a change since the stored copy (see backup_configuration).
+        Usage:
+            device.get_configuration()
+            device.get_configuration(store)
+        """
+        if store is None:
+            return self._run_command("show running-config")
+        return store.get(self.backup_configuration(store).digest)
 
-    def get_eigrp_interfaces(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show ip eigrp interfaces")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    def backup_configuration(self, store, force=False):
+        """This method backs the running-configuration up into a nike_storage.ConfigStore, incrementally.
+        It first reads the cheap change indicator (the '! Last configuration change' line) and only transfers
+        and stores the full configuration when it differs from the indicator of the stored copy.
 
-    def get_cdp_neighbors(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show cdp neighbors")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+        Attributes:
+            store(ConfigStore): Content addressed configuration store.
+            force(Bool): Download the configuration even if the indicator did not change.
+        Returns:
+            ConfigBackup(host, changed, digest, previous_digest, diff), diff is a nike_storage.config_diff dict
+            when the configuration changed and a previous copy exists.
+        Usage:
+            result = device.backup_configuration(store)
+            if result.changed:
+                print(result.diff['unified'])
+        """
+        from nike_storage import ConfigBackup, config_diff
+
+        opened_here = not self.is_connected
+        if opened_here:
+            # Indicator and configuration share one login.
+            self.connect()
+        try:
+            indicator = self._send_command(self.config_change_command).result.strip()
+            ref = store.latest(self.hostname)
+            if not force and ref is not None and indicator and ref.get('indicator') == indicator:
+                store.touch(self.hostname, indicator)
+                return ConfigBackup(self.hostname, False, ref['digest'], ref['digest'], None)
+            config = self._send_command("show running-config").result
+        finally:
+            if opened_here:
+                self.disconnect()
+
+        digest, previous = store.put(self.hostname, config, indicator)
+        changed = digest != previous
+        diff = config_diff(store.get(previous), config) if changed and previous else None
+        return ConfigBackup(self.hostname, changed, digest, previous, diff)
+
+    def get_facts(self, refresh=False):
+        """This method returns every field of the genie parsed 'show version' output plus 'number_of_switch'.
+        The result is cached per device for facts_ttl seconds, so the get_*_info accessors below share one
+        'show version' collection and parse. Every call returns its own copy of the cached facts.
 
-    def get_cdp_neighbors_details(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show cdp neighbors detail")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+        Attributes:
+            refresh(Bool): Ignore the cached facts and collect 'show version' again.
+        Usage:
+            device.get_facts()['chassis_sn']
+        """
+        if refresh or self._facts is None or time.monotonic() - self._facts_time > self.facts_ttl:
+            self._facts = _version_facts(self.get_os_version('genie'))
+            self._facts_time = time.monotonic()
+        return copy.deepcopy(self._facts)
 
-    def get_routing_table(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show ip route")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    def invalidate_facts(self):
+        """This method drops the cached 'show version' facts, e.g. after a reload or an upgrade."""
+        self._facts = None
 
-    def get_routing_table_summary(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show ip route summary")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    def get_chassis_info(self, parsing_module='genie'):
+        return self.get_facts()['chassis']
 
-    def get_os_version(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show version")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    def get_image_id_info(self, parsing_module='genie'):
+        return self.get_facts()['image_id']
 
-    def get_clock_info(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show clock")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    def get_system_image_info(self, parsing_module='genie'):
+        return self.get_facts()['system_image']
 
-    def get_environment_power_info(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show environment power all")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    def get_os_info(self, parsing_module='genie'):
+        return self.get_facts()['os']
 
-    def get_environment_temperature(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show environment temperature")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    def get_number_of_switch_info(self, parsing_module='genie'):
+        return self.get_facts()['number_of_switch']
 
-    def get_arp_info(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show ip arp")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    def get_version_platform_info(self, parsing_module='genie'):
+        """Platform reported by 'show version'. get_platform_info() collects 'show platform'."""
+        return self.get_facts()['platform']
 
+    def get_chassis_sn_info(self, parsing_module='genie'):
+        return self.get_facts()['chassis_sn']
 
-    def get_ip_nat_translations(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show ip nat translations")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
 
-    def get_mac_address_table(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show mac address-table")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+def _version_facts(parsed_version):
+    """Flattens the genie parsed 'show version' output into a facts dict."""
+    facts = dict(parsed_version['version'])
+    if 'switch_num' in facts:
+        facts['number_of_switch'] = len(facts['switch_num'].keys())
+    return facts
 
-    def get_module_info(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show module")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
 
-    def get_switch_info(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show switch")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+class AsyncNikeCiscoDevice(NikeDevice):
+    """
+    asyncio version of NikeCiscoDevice built on scrapli's AsyncIOSXEDriver and the asyncssh transport.
+    Every get_* method of NikeCiscoDevice exists here as a coroutine. genie/textfsm parsing runs in the
+    default executor so it does not block the event loop.
 
+    Usage:
+    device = AsyncNikeCiscoDevice( 'ip address/hostname', 'username', 'password' )
+    output = await device.get_interface_status('textfsm')
 
-    def get_switch_detail_info(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show switch detail")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    async with AsyncNikeCiscoDevice( 'ip address/hostname', 'username', 'password' ) as device:
+        version = await device.get_os_version('genie')
+        vlans = await device.get_vlan_info('genie')
 
-    def get_vlan_info(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show vlan")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    Attributes:
+        hostname(Str): Specify ip address or hostname if DNS resolution is done.
+        username(Str): Specify your tacacs Corparate Short login(CSL) username.
+        password(Str): Specify your tacacs Corparate Short login(CSL) password.
+        facts_ttl(Int): Seconds the parsed 'show version' facts are reused by get_facts().
+        parse_pool(ParsePool): Optional nike_parsers.ParsePool running genie/textfsm parsing in worker processes.
+        metrics(Recorder): Optional nike_metrics recorder receiving the connect/command/parse timings.
+        driver_options: Optional extra scrapli driver arguments, e.g. port, timeout_ops.
+    """
 
-    def get_tacacs_info(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show tacacs")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    def __init__(self, hostname, username, password, facts_ttl=300, parse_pool=None, metrics=None, **driver_options):
+        """Init method of the class"""
+        NikeDevice.__init__(self, hostname, username, password)
+        self.device = {
+            "host": self.hostname,
+            "auth_username": self.username,
+            "auth_password": self.password,
+            "auth_secondary": self.password,
+            "auth_strict_key": False,
+            "transport": "asyncssh",
+        }
+        self.device.update(driver_options)
+        self._conn = None
+        self.facts_ttl = facts_ttl
+        self._facts = None
+        self._facts_time = 0.0
+        self.parse_pool = parse_pool
+        self.metrics = metrics or nike_metrics.default_recorder()
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.disconnect()
+
+    async def connect(self):
+        """This method opens a persistent SSH session used by every following get_* call."""
+        if self._conn is None:
+            self._conn = await self._open()
+        return self
+
+    async def disconnect(self):
+        """This method closes the persistent SSH session opened by connect()."""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                await conn.close()
+            except _close_errors():
+                pass
+
+    @property
+    def is_connected(self):
+        """True while a persistent session is held by this instance."""
+        return self._conn is not None
+
+    async def _open(self):
+        conn = _async_iosxe_driver(**self.device)
+        with self.metrics.phase(nike_metrics.CONNECT, self.hostname, "ssh"):
+            await conn.open()
+        return conn
+
+    async def _reconnect(self):
+        await self.disconnect()
+        await self.connect()
+
+    async def _with_connection(self, operation):
+        """Awaits operation(conn) either over the persistent session or over a one-shot connection."""
+        if self._conn is None:
+            conn = await self._open()
+            try:
+                return await operation(conn)
+            finally:
+                await conn.close()
+
+        if not self._conn.isalive():
+            await self._reconnect()
+        try:
+            return await operation(self._conn)
+        except _connection_errors():
+            # The channel dropped mid-command, reopen it once and retry.
+            await self._reconnect()
+            return await operation(self._conn)
+
+    async def _timed_send(self, conn, command):
+        with self.metrics.phase(nike_metrics.COMMAND, self.hostname, command) as phase:
+            response = await conn.send_command(command)
+            phase.bytes = len(response.raw_result)
+        return response
 
-    def get_errdisable_recovery_info(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show errdisable recovery")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    async def _send_command(self, command):
+        return await self._with_connection(lambda conn: self._timed_send(conn, command))
 
-    def get_access_list_info(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show access-lists")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    async def _send_commands(self, commands):
+        commands = list(commands)
 
-    def get_ip_protocols_info(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show ip protocols")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+        async def send_all(conn):
+            return [await self._timed_send(conn, command) for command in commands]
+        return await self._with_connection(send_all)
 
-    def get_licence_status(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show license status")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
+    async def _parse_response(self, response, parsing_module='no_parse'):
+        import asyncio
+        if parsing_module not in PARSED_MODULES:
             return response.result
+        with self.metrics.phase(nike_metrics.PARSE, self.hostname, response.channel_input) as phase:
+            phase.bytes = len(response.result)
+            if parsing_module == 'fast':
+                # Fast enough to run on the event loop.
+                return NikeCiscoDevice._parse_response(response, parsing_module)
+            if self.parse_pool is not None:
+                return await asyncio.wrap_future(self.parse_pool.submit(response.channel_input, response.result, parsing_module))
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, NikeCiscoDevice._parse_response, response, parsing_module)
+
+    async def _run_command(self, command, parsing_module='no_parse'):
+        """Execution engine behind every async get_* method."""
+        if parsing_module == 'stream':
+            raise ValueError("parsing_module 'stream' is only supported by NikeCiscoDevice")
+        if parsing_module == 'columnar':
+            from nike_tables import COLUMNAR_TABLES
+            return COLUMNAR_TABLES[command].from_rows(await self._run_command(command, 'textfsm'))
+        response = await self._send_command(command)
+        return await self._parse_response(response, parsing_module)
+
+    async def collect(self, commands, parsing_module='no_parse'):
+        """Async version of NikeCiscoDevice.collect()."""
+        parsing_module = _check_parsing_module("collect", parsing_module, CACHED_PARSING_MODULES)
+        responses = await self._send_commands(commands)
+        return {response.channel_input: await self._parse_response(response, parsing_module) for response in responses}
+
+    async def get_configuration(self):
+        return await self._run_command("show running-config")
+
+    async def get_facts(self, refresh=False):
+        """Async version of NikeCiscoDevice.get_facts()."""
+        if refresh or self._facts is None or time.monotonic() - self._facts_time > self.facts_ttl:
+            self._facts = _version_facts(await self.get_os_version('genie'))
+            self._facts_time = time.monotonic()
+        return copy.deepcopy(self._facts)
+
+    def invalidate_facts(self):
+        """This method drops the cached 'show version' facts."""
+        self._facts = None
+
+    async def get_chassis_info(self, parsing_module='genie'):
+        return (await self.get_facts())['chassis']
+
+    async def get_image_id_info(self, parsing_module='genie'):
+        return (await self.get_facts())['image_id']
+
+    async def get_system_image_info(self, parsing_module='genie'):
+        return (await self.get_facts())['system_image']
+
+    async def get_os_info(self, parsing_module='genie'):
+        return (await self.get_facts())['os']
+
+    async def get_number_of_switch_info(self, parsing_module='genie'):
+        return (await self.get_facts())['number_of_switch']
+
+    async def get_version_platform_info(self, parsing_module='genie'):
+        return (await self.get_facts())['platform']
+
+    async def get_chassis_sn_info(self, parsing_module='genie'):
+        return (await self.get_facts())['chassis_sn']
+
+
+ShowCommand = namedtuple("ShowCommand", ["name", "command", "parsing_modules", "cache_ttl", "usage"])
+
+DEFAULT_PARSING_MODULES = ('no_parse', 'genie', 'textfsm')
+_PARSING_MODULE_DOCS = {
+    'no_parse': "Collects the data without parsing it",
+    'genie': "Collects the output and parse it with genie parser.",
+    'textfsm': "Collects the output and parse it with textfsm parser.",
+    'stream': "Returns a generator yielding one parsed row at a time while the output is read.",
+    'columnar': "Parses with textfsm into a compact nike_tables table (see nike_tables.COLUMNAR_TABLES).",
+    'fast': "Parses with the precompiled nike_parsers.FAST_PARSERS parser into the genie structure, without genie. "
+            "Checked against genie on benchmarks/fixtures only, see nike_parsers for the known differences.",
+}
+
+# Registry of the show commands behind the get_* methods, keyed by method name. Every entry is turned into a thin
+# generated wrapper on NikeCiscoDevice and AsyncNikeCiscoDevice around the single execution engine (_run_command),
+# so session reuse, caching, parse offload and instrumentation apply to every command without per-method code.
+CISCO_SHOW_COMMANDS = {}
+
+
+def _check_parsing_module(name, parsing_module, supported):
+    """Returns the parsing_module to run. Unsupported values still return the raw output like they always did,
+    with a DeprecationWarning."""
+    if parsing_module in supported:
+        return parsing_module
+    warnings.warn(f"{name}() does not support parsing_module {parsing_module!r} (supported: {', '.join(supported)}), "
+                  f"the raw output is returned. This will raise ValueError in a future release.",
+                  DeprecationWarning, stacklevel=3)
+    return 'no_parse'
+
+
+def _getter_doc(spec):
+    lines = [f"This method is collecting '{spec.command}' output from IOSXE/IOS devices.",
+             "",
+             "        Attributes:",
+             "            parsing_module:"]
+    lines += [f"                - {module:10s}: {_PARSING_MODULE_DOCS.get(module, '')}" for module in spec.parsing_modules]
+    lines += ["        Usage:",
+              f"            {spec.usage or f'device.{spec.name}(parsing_module)'}",
+              "        "]
+    return "\n".join(lines)
+
+
+def _make_getter(spec):
+    def getter(self, parsing_module='no_parse'):
+        parsing_module = _check_parsing_module(spec.name, parsing_module, spec.parsing_modules)
+        return self._run_command(spec.command, parsing_module, spec.cache_ttl)
+    getter.__name__ = spec.name
+    getter.__qualname__ = f"NikeCiscoDevice.{spec.name}"
+    getter.__doc__ = _getter_doc(spec)
+    return getter
+
+
+def _make_async_getter(spec):
+    async def getter(self, parsing_module='no_parse'):
+        parsing_module = _check_parsing_module(spec.name, parsing_module, spec.parsing_modules)
+        return await self._run_command(spec.command, parsing_module)
+    getter.__name__ = spec.name
+    getter.__qualname__ = f"AsyncNikeCiscoDevice.{spec.name}"
+    getter.__doc__ = f"Async version of NikeCiscoDevice.{spec.name}(), collects '{spec.command}'."
+    return getter
+
+
+def register_show_command(name, command, parsing_modules=DEFAULT_PARSING_MODULES, cache_ttl=None, usage=None):
+    """
+    Adds a show command to CISCO_SHOW_COMMANDS and generates its get_* method on NikeCiscoDevice and AsyncNikeCiscoDevice.
 
-    def get_platform_info(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show platform")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    Attributes:
+        name(Str): Name of the generated method, e.g. "get_vlan_info".
+        command(Str): CLI string sent to the device.
+        parsing_modules(Tuple): Accepted parsing_module values, anything else returns the raw output with a
+                                DeprecationWarning.
+                                'stream' needs a nike_parsers.STREAM_PARSERS entry, 'columnar' a nike_tables.COLUMNAR_TABLES one.
+        cache_ttl(Int): Seconds a ResultCache may reuse the result, None uses its default_ttl and 0 never caches.
+                        A per-command TTL passed to the ResultCache itself wins over this one.
+        usage(Str): Usage line of the generated docstring.
+    Usage:
+        register_show_command("get_ntp_status", "show ntp status", cache_ttl=30)
+        device.get_ntp_status('genie')
+    """
+    if name in CISCO_SHOW_COMMANDS:
+        raise ValueError(f"{name} is already registered for '{CISCO_SHOW_COMMANDS[name].command}'")
+    if hasattr(NikeCiscoDevice, name):
+        raise ValueError(f"{name} would shadow NikeCiscoDevice.{name}")
+    spec = ShowCommand(name, command, tuple(parsing_modules), cache_ttl, usage)
+    CISCO_SHOW_COMMANDS[name] = spec
+    setattr(NikeCiscoDevice, name, _make_getter(spec))
+    setattr(AsyncNikeCiscoDevice, name, _make_async_getter(spec))
+    return spec
+
+
+register_show_command("get_interface_status", "show interfaces status",
+                      DEFAULT_PARSING_MODULES + ('columnar', 'fast'),
+                      usage="device.get_interface_status('columnar').ports_in_vlan(10)")
+register_show_command("get_interface_brief", "show ip interface brief", DEFAULT_PARSING_MODULES + ('columnar', 'fast'))
+register_show_command("get_interface_description", "show interface description")
+register_show_command("get_trunk_interfaces", "show interfaces trunk")
+register_show_command("get_snmp_user", "show snmp user")
+register_show_command("get_eigrp_neighbor", "show ip eigrp neighbors")
+register_show_command("get_eigrp_topology", "show ip eigrp topology")
+register_show_command("get_eigrp_interfaces", "show ip eigrp interfaces")
+register_show_command("get_cdp_neighbors", "show cdp neighbors")
+register_show_command("get_cdp_neighbors_details", "show cdp neighbors detail")
+register_show_command("get_routing_table", "show ip route", DEFAULT_PARSING_MODULES + ('stream',),
+                      usage="for row in device.get_routing_table('stream'): print(row)")
+register_show_command("get_routing_table_summary", "show ip route summary")
+register_show_command("get_os_version", "show version", DEFAULT_PARSING_MODULES + ('fast',))
+# The clock is different on every call, caching it would only return stale time.
+register_show_command("get_clock_info", "show clock", cache_ttl=0)
+register_show_command("get_environment_power_info", "show environment power all")
+register_show_command("get_environment_temperature", "show environment temperature")
+register_show_command("get_arp_info", "show ip arp", DEFAULT_PARSING_MODULES + ('columnar', 'fast'))
+register_show_command("get_ip_nat_translations", "show ip nat translations", DEFAULT_PARSING_MODULES + ('stream',),
+                      usage="for row in device.get_ip_nat_translations('stream'): print(row)")
+register_show_command("get_mac_address_table", "show mac address-table",
+                      DEFAULT_PARSING_MODULES + ('stream', 'columnar', 'fast'),
+                      usage="device.get_mac_address_table('columnar').macs_on_port('Gi1/0/48')")
+register_show_command("get_module_info", "show module")
+register_show_command("get_switch_info", "show switch")
+register_show_command("get_switch_detail_info", "show switch detail")
+register_show_command("get_vlan_info", "show vlan")
+register_show_command("get_tacacs_info", "show tacacs")
+register_show_command("get_errdisable_recovery_info", "show errdisable recovery")
+register_show_command("get_access_list_info", "show access-lists")
+register_show_command("get_ip_protocols_info", "show ip protocols")
+register_show_command("get_licence_status", "show license status")
+register_show_command("get_platform_info", "show platform")
+register_show_command("get_power_inline_info", "show power inline")
+register_show_command("get_redundancy_info", "show redundancy")
+register_show_command("get_etherchannel_summary_info", "show etherchannel summary")
+
+
+class EdgeInventory:
+    """
+    Indexed copy of the enterprise edge list of a NikeVcoDevice.
+    The full list is downloaded once and hash indexed by name, id and serial number. It is downloaded
+    again when it is older than ttl seconds or when refresh() is called.
 
-    def get_power_inline_info(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show power inline")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    Usage:
+    inventory = EdgeInventory(vco, ttl=300)
+    inventory.by_name('NER0502D01')['id']
 
-    def get_redundancy_info(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show redundancy")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    Attributes:
+        vco(NikeVcoDevice): Orchestrator the edges are fetched from.
+        ttl(Int): Seconds before the list is downloaded again.
+    """
 
+    def __init__(self, vco, ttl=300):
+        self.vco = vco
+        self.ttl = ttl
+        self._edges = None
+        self._fetched_at = 0.0
+        self._by_name = {}
+        self._by_id = {}
+        self._by_serial = {}
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """This method downloads the edge list again and rebuilds the indexes."""
+        edges = []
+        by_name, by_id, by_serial = {}, {}, {}
+        # setdefault keeps the first edge on duplicates, like the linear scans did.
+        for edge in self.vco.iter_edges():
+            edges.append(edge)
+            by_name.setdefault(edge.get('name'), edge)
+            by_id.setdefault(edge.get('id'), edge)
+            if edge.get('serialNumber'):
+                by_serial.setdefault(edge['serialNumber'], edge)
+        with self._lock:
+            self._edges = edges
+            self._by_name, self._by_id, self._by_serial = by_name, by_id, by_serial
+            self._fetched_at = time.monotonic()
+
+    def invalidate(self):
+        """This method makes the next lookup download the edge list again."""
+        self._edges = None
+
+    def _ensure_fresh(self):
+        if self._edges is None or time.monotonic() - self._fetched_at > self.ttl:
+            self.refresh()
+
+    @property
+    def edges(self):
+        self._ensure_fresh()
+        return self._edges
+
+    def by_name(self, name):
+        self._ensure_fresh()
+        return self._by_name.get(name)
+
+    def by_id(self, edge_id):
+        self._ensure_fresh()
+        return self._by_id.get(int(edge_id))
+
+    def by_serial(self, serial_number):
+        self._ensure_fresh()
+        return self._by_serial.get(serial_number)
+
+
+class EdgeConfig:
+    """
+    Parsed /edge/getEdgeConfigurationStack response of one Edge.
+    The views below are computed on first access and kept, so one API call serves the whole report. They are shared
+    by every caller of get_edge_config() and must not be modified, the getEdge* methods of NikeVcoDevice return copies.
 
-    def get_etherchannel_summary_info(self, parsing_module='no_parse'):
-        conn = IOSXEDriver(**self.device)
-        conn.open()
-        response = conn.send_command("show etherchannel summary")
-        conn.close()
-        if parsing_module == 'genie':
-            return response.genie_parse_output()
-        elif parsing_module == 'textfsm':
-            return response.textfsm_parse_output()
-        else:
-            return response.result
+    Usage:
+    config = vco.get_edge_config(edgeId)
+    config.management_ip
+    config.lan_svis
+    config.wan_interfaces
 
-    def get_chassis_info(self, parsing_module='genie'):
-        return self.get_os_version ('genie')['version']['chassis']
+    Attributes:
+        edge_id(Int): Edge ID.
+        raw(List): Configuration stack as returned by the orchestrator.
+    """
 
-    def get_image_id_info(self, parsing_module='genie'):
-        return self.get_os_version ('genie')['version']['image_id']
-    
-    def get_system_image_info(self, parsing_module='genie'):
-        return self.get_os_version ('genie')['version']['system_image']
+    def __init__(self, edge_id, raw):
+        self.edge_id = edge_id
+        self.raw = raw
+        self.fetched_at = time.monotonic()
 
-    def get_os_info(self, parsing_module='genie'):
-        return self.get_os_version ('genie')['version']['os']
+    @property
+    def age(self):
+        return time.monotonic() - self.fetched_at
 
-    def get_number_of_switch_info(self, parsing_module='genie'):
-        return len(self.get_os_version ('genie')['version']['switch_num'].keys())
+    @cached_property
+    def modules(self):
+        return self.raw[0]["modules"]
 
-    def get_platform_info(self, parsing_module='genie'):
-        return self.get_os_version ('genie')['version']['platform']
+    @cached_property
+    def device_settings(self):
+        return self.modules[1]["data"]
+
+    @cached_property
+    def management_ip(self):
+        return self.device_settings["lan"]["management"]["cidrIp"]
+
+    @cached_property
+    def lan_svis(self):
+        lan_interfaces = {}
+        for network in self.device_settings["lan"]["networks"]:
+            lan_interfaces[network["vlanId"]] = {
+                        "svi_name" : network["name"],
+                        "ip_address" : network["cidrIp"],
+                        "subnet_mask" : network["netmask"],
+                        "dhcp_enabled" : network["dhcp"]["enabled"],
+                        "dhcp_pool_base_number": network["baseDhcpAddr"],
+                        "dhcp_pool_size" : network["numDhcpAddr"],
+                        "advertised" : network["advertise"],
+                        "physical_interface" : network["interfaces"]
+                        }
+        return lan_interfaces
+
+    @cached_property
+    def wan_interfaces(self):
+        wan_interfaces = {}
+        for interface in self.device_settings["routedInterfaces"]:
+            wan_interfaces[interface["name"]] = {
+                        "ipv4_address" : interface["addressing"]["cidrIp"],
+                        "subnet_mask"  : interface["addressing"]["netmask"],
+                        "type" : interface["addressing"]["type"],
+                        "cidr_prefix" : interface["addressing"]["cidrPrefix"],
+                        "duplex" : interface["l2"]["duplex"],
+                        "speed" : interface["l2"]["speed"],
+                        "overlay": interface["wanOverlay"]
+                        }
+        return wan_interfaces
+
+
+class LinkStatusSnapshot:
+    """
+    Enterprise wide /monitoring/getEnterpriseEdgeLinkStatus table of a NikeVcoDevice, grouped by edge name.
+    The table is downloaded at most once per ttl seconds and every per-edge query is answered from it.
+
+    Usage:
+    snapshot = LinkStatusSnapshot(vco, ttl=60)
+    snapshot.wan_interfaces('NER0502D01')
+
+    Attributes:
+        vco(NikeVcoDevice): Orchestrator the link status is fetched from.
+        ttl(Int): Polling interval, seconds before the table is downloaded again.
+    """
+
+    def __init__(self, vco, ttl=60):
+        self.vco = vco
+        self.ttl = ttl
+        self._links = None
+        self._by_edge = {}
+        self._fetched_at = 0.0
+
+    def refresh(self):
+        """This method downloads the link status table again."""
+        links = []
+        by_edge = {}
+        for link in self.vco.iter_vco_request('/monitoring/getEnterpriseEdgeLinkStatus',
+                                              data={
+                                                  "enterpriseId": NikeVcoDevice.PROD_ENTERPRISE_ID}):
+            links.append(link)
+            by_edge.setdefault(link["edgeName"], []).append(link)
+        self._links, self._by_edge = links, by_edge
+        self._fetched_at = time.monotonic()
+
+    def invalidate(self):
+        """This method makes the next query download the link status table again."""
+        self._links = None
+
+    def _ensure_fresh(self):
+        if self._links is None or time.monotonic() - self._fetched_at > self.ttl:
+            self.refresh()
+
+    @property
+    def links(self):
+        self._ensure_fresh()
+        return self._links
+
+    def status(self, name):
+        """Links of the given edge, or every link when name is empty."""
+        self._ensure_fresh()
+        if not name:
+            return self._links
+        return self._by_edge.get(name, [])
+
+    def serial_numbers(self, name):
+        """Active and standby serial numbers of an HA edge pair."""
+        links = self.status(name)
+        return {'edgeName': links[0]['edgeName'],
+                'Active_VCE_SN': links[0]['edgeSerialNumber'],
+                "Standby_VCE_SN": links[0]['edgeHASerialNumber']
+                }
+
+    def wan_interfaces(self, name):
+        """WAN link state per interface of the given edge, or every link when name is empty."""
+        if not name:
+            return self.status(name)
+        wan_link = {}
+        for link in self.status(name):
+            wan_link[link["interface"]] = {"ip_address": link["linkIpAddress"],
+                                           "isp_info": link["isp"],
+                                           "link_state": link["linkState"],
+                                           "linkVpnState": link["linkState"],
+                                           "edgeState": link["edgeState"]}
+        return wan_link
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter. acquire() blocks until the caller may send its request.
+
+    Usage:
+    bucket = TokenBucket(rate=20)
+    bucket.acquire()
+
+    Attributes:
+        rate(Float): Tokens added per second, i.e. the sustained requests per second.
+        burst(Int): Tokens that can be spent at once after an idle period.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Take the token now, even into debt, so waiters are served in order and sleep outside the lock.
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
+EdgeConfigResult = namedtuple("EdgeConfigResult", ["edge_id", "config", "error"])
+EdgeConfigResult.ok = property(lambda self: self.error is None)
 
-    def get_chassis_sn_info(self, parsing_module='genie'):
-        return self.get_os_version ('genie')['version']['chassis_sn']
 
 class NikeVcoDevice:
-    VCO_URL = "https://nike.velocloud.net/portal/rest"
-    PROD_ENTERPRISE_ID = 1
-    VELO_TOKEN = os.environ.get("VELO_TOKEN")
-    
-    def __init__(self):
-        self._token = NikeVcoDevice.VELO_TOKEN
+    """
+    This class is used for querying the VeloCloud Orchestrator(VCO) REST API.
+    All calls share one pooled keep-alive requests.Session, so TLS is only negotiated once per pooled connection.
+    Requests answered with 429 or 5xx are retried with exponential backoff.
 
-    def post_vco_request(self, method, data=None):
+    Usage:
+    vco = NikeVcoDevice()
+    vco.getEdgesByName('NER0502D01')
 
+    Attributes:
+        token(Str): VCO API token, defaults to VELO_TOKEN from the environment or the .env file (see load_env).
+        vco_url(Str): REST base url, defaults to NikeVcoDevice.VCO_URL.
+        pool_size(Int): Maximum number of kept-alive connections to the orchestrator.
+        retries(Int): Retries on connection errors and 429/5xx responses.
+        backoff_factor(Float): Backoff between retries, sleeps backoff_factor * 2 ** (retry - 1) seconds.
+        timeout(Float): Default per-call timeout in seconds.
+        inventory_ttl(Int): Seconds the indexed edge list behind the getEdge*By* lookups is reused.
+        edge_config_ttl(Int): Seconds a fetched Edge configuration stack is reused.
+        link_status_ttl(Int): Seconds the enterprise link status table behind getEdgeStatus and friends is reused.
+        metrics(Recorder): Optional nike_metrics recorder receiving the http/parse timings of every REST call.
+    """
+    VCO_URL = "https://nike.velocloud.net/portal/rest"
+    PROD_ENTERPRISE_ID = 1
+    # Set to override the token for every instance, otherwise it is read from the environment / .env file.
+    VELO_TOKEN = None
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    def __init__(self, token=None, vco_url=None, pool_size=10, retries=3, backoff_factor=0.5, timeout=30,
+                 inventory_ttl=300, edge_config_ttl=300, link_status_ttl=60, metrics=None):
+        import requests
+        import urllib3
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        # Disable HTTPS Certificate warning
+        urllib3.disable_warnings()
+
+        if token is None and NikeVcoDevice.VELO_TOKEN is None:
+            if not _env_loaded:
+                load_env()
+            token = os.environ.get("VELO_TOKEN")
+        self._token = token or NikeVcoDevice.VELO_TOKEN
+        self.vco_url = vco_url or NikeVcoDevice.VCO_URL
+        self.timeout = timeout
         self.headers = {'Content-Type': 'application/json',
-                    'Accept': 'application/json',
-                    'Authorization': 'Token ' + self._token}
+                        'Accept': 'application/json',
+                        'Authorization': 'Token ' + self._token}
+
+        # The VCO calls used here are read-only, so POST is safe to retry.
+        retry = Retry(total=retries,
+                      backoff_factor=backoff_factor,
+                      status_forcelist=NikeVcoDevice.RETRY_STATUS_CODES,
+                      allowed_methods=None,
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.verify = False
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.inventory = EdgeInventory(self, ttl=inventory_ttl)
+        self.edge_config_ttl = edge_config_ttl
+        self._edge_configs = {}
+        self.link_status = LinkStatusSnapshot(self, ttl=link_status_ttl)
+        self.metrics = metrics or nike_metrics.default_recorder()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """This method closes the pooled connections to the orchestrator."""
+        self.session.close()
+
+    def post_vco_request(self, method, data=None, timeout=None, raise_for_status=False):
+        """
+        This posts one REST call and returns its decoded JSON body, error bodies included.
+        :param raise_for_status: (optional) Raise requests.HTTPError on 4xx/5xx answers instead
+        """
+        with self.metrics.phase(nike_metrics.HTTP, self.vco_url, method) as phase:
+            response = self.session.post(self.vco_url + method,
+                                         data=json.dumps(data),
+                                         timeout=timeout or self.timeout
+                                         )
+            phase.bytes = len(response.content)
+            if response.status_code >= 400:
+                phase.error = f"HTTP {response.status_code}"
+        if raise_for_status:
+            response.raise_for_status()
+        with self.metrics.phase(nike_metrics.PARSE, self.vco_url, method) as phase:
+            phase.bytes = len(response.content)
+            # Decoding the bytes directly skips the decoded str copy of response.text.
+            return json_loads(response.content)
+
+    def iter_vco_request(self, method, data=None, timeout=None, chunk_size=64 * 1024):
+        """
+        Streaming version of post_vco_request for methods returning a JSON array. The body is decoded
+        incrementally while it is read from the socket and the array elements are yielded one at a time,
+        so only one chunk and the current element are held in memory.
+        Raises ValueError when the orchestrator does not answer with an array, e.g. with an error object.
+        :param method: REST method, e.g. '/enterprise/getEnterpriseEdges'
+        :param chunk_size: (optional) Bytes read from the socket at a time
 
-        response = requests.post(NikeVcoDevice.VCO_URL + method,
-                                 headers=self.headers,
-                                 verify=False,
-                                 data=json.dumps(data)
-                                 )
-        return json.loads(response.text)
+        Usage:
+        for link in vco.iter_vco_request('/monitoring/getEnterpriseEdgeLinkStatus', data={"enterpriseId": 1}):
+            print(link["edgeName"], link["linkState"])
+        """
+        from nike_parsers import iter_json_array
+
+        with self.metrics.phase(nike_metrics.HTTP, self.vco_url, method) as phase:
+            response = self.session.post(self.vco_url + method,
+                                         data=json.dumps(data),
+                                         timeout=timeout or self.timeout,
+                                         stream=True
+                                         )
+            if response.status_code >= 400:
+                phase.error = f"HTTP {response.status_code}"
+        try:
+            # The body is transferred while it is decoded, so the parse phase includes the download.
+            with self.metrics.phase(nike_metrics.PARSE, self.vco_url, method) as phase:
+                received = 0
+
+                def chunks():
+                    nonlocal received
+                    for chunk in response.iter_content(chunk_size):
+                        received += len(chunk)
+                        yield chunk
+                try:
+                    yield from iter_json_array(chunks())
+                except GeneratorExit:
+                    # The caller stopped early, that is not a failed call.
+                    return
+                finally:
+                    phase.bytes = received
+        finally:
+            response.close()
+
+    def iter_edges(self):
+        """
+        This yields the Edges of the enterprise one at a time while the edge list is still being downloaded
+        """
+        return self.iter_vco_request('/enterprise/getEnterpriseEdges',
+                                     data={
+                                         "enterpriseId": NikeVcoDevice.PROD_ENTERPRISE_ID
+                                     })
 
     def getEdgesByName(self, name='') -> list:
         """
@@ -508,16 +1166,12 @@ class NikeVcoDevice:
         :param name: (optional) Edge Name
         :return: The Edge with the specified name or id, if provided, otherwise a list of all Edges
         """
-        response = self.post_vco_request('/enterprise/getEnterpriseEdges',
-                            data={
-                                "enterpriseId": NikeVcoDevice.PROD_ENTERPRISE_ID
-                            })
         if name:
-            for edge in response:
-                if edge['name'] == name:
-                    return edge
+            edge = self.inventory.by_name(name)
+            if edge is not None:
+                return edge
 
-        return response
+        return self.inventory.edges
 
     def getEdgeIdByName(self, name='') -> list:
         """
@@ -526,16 +1180,12 @@ class NikeVcoDevice:
         :param edge_id: (optional) Edge ID
         :return: The Edge with the specified name or id, if provided, otherwise a list of all Edges
         """
-        response = self.post_vco_request('/enterprise/getEnterpriseEdges',
-                            data={
-                                "enterpriseId": NikeVcoDevice.PROD_ENTERPRISE_ID
-                            })
         if name:
-            for edge in response:
-                if edge['name'] == name:
-                    return edge['id']
+            edge = self.inventory.by_name(name)
+            if edge is not None:
+                return edge['id']
 
-        return response
+        return self.inventory.edges
 
     def getEdgesById(self, id='') -> list:
         """
@@ -544,92 +1194,130 @@ class NikeVcoDevice:
         :param edge_id: (optional) Edge ID
         :return: The Edge with the specified name or id, if provided, otherwise a list of all Edges
         """
-        response = self.post_vco_request('/enterprise/getEnterpriseEdges',
-                            data={
-                                "enterpriseId": NikeVcoDevice.PROD_ENTERPRISE_ID
-                            })
         if id:
-            for edge in response:
-                if edge['id'] == int(id):
-                    return edge
+            edge = self.inventory.by_id(id)
+            if edge is not None:
+                return edge
 
-        return response
+        return self.inventory.edges
 
-    def getEdgeConfiguration(self, edgeId: int) -> list:
+    def getEdgeIdsByNames(self, names) -> dict:
         """
-        This returns a list of Edges from VeloCloud Orchestrator
-        :param name: (optional) Edge Name
-        :param edge_id: (optional) Edge ID
-        :return: The Edge with the specified name or id, if provided, otherwise a list of all Edges
+        This returns the Edge ids of many Edges from a single inventory download
+        :param names: Edge Names
+        :return: Dict of Edge Name to Edge ID, None for names that are not found
         """
-        response = self.post_vco_request('/edge/getEdgeConfigurationStack',
-                            data={
-                                "enterpriseId": NikeVcoDevice.PROD_ENTERPRISE_ID,
-                                "edgeId": edgeId
-                            })
-        print(type(response))
-        return response
-
+        return {name: edge['id'] if edge is not None else None
+                for name, edge in ((name, self.inventory.by_name(name)) for name in names)}
 
-
-    def getEdgeManagementIp(self, edgeId: int) -> list:
+    def getEdgeBySerialNumber(self, serial_number: str):
         """
-        This returns a list of Edges from VeloCloud Orchestrator
-        :param name: (optional) Edge Name
-        :param edge_id: (optional) Edge ID
-        :return: The Edge with the specified name or id, if provided, otherwise a list of all Edges
+        This returns the Edge with the given serial number, None if it is not found
+        :param serial_number: Edge Serial Number
         """
-        response = self.post_vco_request('/edge/getEdgeConfigurationStack',
-                            data={
-                                "enterpriseId": NikeVcoDevice.PROD_ENTERPRISE_ID,
-                                "edgeId": edgeId
-                            })
-        return response[0]["modules"][1]["data"]["lan"]["management"]["cidrIp"]
+        return self.inventory.by_serial(serial_number)
 
+    def get_edge_config(self, edgeId: int, refresh=False):
+        """
+        This returns the parsed configuration stack of an Edge as an EdgeConfig.
+        The stack is fetched once per Edge and reused for edge_config_ttl seconds.
+        Raises requests.HTTPError on 4xx/5xx answers and ValueError when the orchestrator answers with
+        anything but a configuration stack, e.g. an error object. Failed calls are not cached.
+        :param edgeId: Edge ID
+        :param refresh: (optional) Fetch the configuration stack again
+        """
+        config = self._edge_configs.get(edgeId)
+        if refresh or config is None or config.age > self.edge_config_ttl:
+            response = self.post_vco_request('/edge/getEdgeConfigurationStack',
+                                data={
+                                    "enterpriseId": NikeVcoDevice.PROD_ENTERPRISE_ID,
+                                    "edgeId": edgeId
+                                }, raise_for_status=True)
+            if not (isinstance(response, list) and response and isinstance(response[0], dict)
+                    and "modules" in response[0]):
+                raise ValueError(f"Edge {edgeId}: unexpected getEdgeConfigurationStack response {response!r:.200}")
+            config = EdgeConfig(edgeId, response)
+            self._edge_configs[edgeId] = config
+        return config
+
+    def get_all_edge_configs(self, edge_ids=None, concurrency=8, rate_limit=None, refresh=False):
+        """
+        This fetches the configuration stacks of many Edges concurrently and yields an
+        EdgeConfigResult(edge_id, config, error) as each one completes. A failing Edge, an HTTP 4xx/5xx
+        answer or an error object instead of the stack, is reported in error (ok is False) and does not
+        stop the others. Fetched stacks are cached like get_edge_config() does, so
+        getEdgeLanSviInfo/getEdgeWanInterfaceInfo are answered locally afterwards.
+        :param edge_ids: (optional) Edge IDs, defaults to every Edge of the enterprise
+        :param concurrency: (optional) Requests in flight at the same time, keep it at or below pool_size
+        :param rate_limit: (optional) Maximum requests per second sent to the orchestrator
+        :param refresh: (optional) Fetch the stacks again even if they are cached
 
-    def getEdgeLanSviInfo(self, edgeId: int) -> list:
-        response = self.post_vco_request('/edge/getEdgeConfigurationStack',
-                            data={
-                                "enterpriseId": NikeVcoDevice.PROD_ENTERPRISE_ID,
-                                "edgeId": edgeId
-                            })
-        lan_interfaces = {}
+        Usage:
+        for result in vco.get_all_edge_configs(concurrency=16, rate_limit=20):
+            if result.ok:
+                print(result.edge_id, result.config.lan_svis)
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        if edge_ids is None:
+            edge_ids = [edge['id'] for edge in self.inventory.edges]
+        bucket = TokenBucket(rate_limit) if rate_limit else None
+
+        def fetch(edge_id):
+            if bucket is not None:
+                bucket.acquire()
+            return self.get_edge_config(edge_id, refresh=True)
+
+        pending = []
+        for edge_id in edge_ids:
+            config = self._edge_configs.get(edge_id)
+            if not refresh and config is not None and config.age <= self.edge_config_ttl:
+                yield EdgeConfigResult(edge_id, config, None)
+            else:
+                pending.append(edge_id)
+        if not pending:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="vco-fanout")
+        try:
+            futures = {executor.submit(fetch, edge_id): edge_id for edge_id in pending}
+            for future in as_completed(futures):
+                try:
+                    yield EdgeConfigResult(futures[future], future.result(), None)
+                except Exception as error:
+                    yield EdgeConfigResult(futures[future], None, error)
+        finally:
+            # Stop the queued requests when the caller stops iterating early.
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def invalidate_edge_config(self, edgeId=None):
+        """
+        This drops the cached configuration stack of one Edge, or of every Edge when edgeId is not given
+        """
+        if edgeId is None:
+            self._edge_configs.clear()
+        else:
+            self._edge_configs.pop(edgeId, None)
 
-        for i in range(0,len(response[0]["modules"][1]["data"]["lan"]["networks"])):
-            lan_interfaces[response[0]["modules"][1]["data"]["lan"]["networks"][i]["vlanId"]] = {
-                        "svi_name" : response[0]["modules"][1]["data"]["lan"]["networks"][i]["name"],
-                        "ip_address" : response[0]["modules"][1]["data"]["lan"]["networks"][i]["cidrIp"],
-                         "subnet_mask" : response[0]["modules"][1]["data"]["lan"]["networks"][i]["netmask"],
-                         "dhcp_enabled" : response[0]["modules"][1]["data"]["lan"]["networks"][i]["dhcp"]["enabled"],
-                         "dhcp_pool_base_number": response[0]["modules"][1]["data"]["lan"]["networks"][i]["baseDhcpAddr"],
-                         "dhcp_pool_size" : response[0]["modules"][1]["data"]["lan"]["networks"][i]["numDhcpAddr"],
-                         "advertised" : response[0]["modules"][1]["data"]["lan"]["networks"][i]["advertise"],
-                         "physical_interface" : response[0]["modules"][1]["data"]["lan"]["networks"][i]["interfaces"]
-                        }
+    def getEdgeConfiguration(self, edgeId: int) -> list:
+        """
+        This returns the raw configuration stack of an Edge from VeloCloud Orchestrator
+        :param edgeId: Edge ID
+        """
+        return copy.deepcopy(self.get_edge_config(edgeId).raw)
 
-        return lan_interfaces
+    def getEdgeManagementIp(self, edgeId: int) -> list:
+        """
+        This returns the management ip address of an Edge
+        :param edgeId: Edge ID
+        """
+        return self.get_edge_config(edgeId).management_ip
 
+    def getEdgeLanSviInfo(self, edgeId: int) -> list:
+        return copy.deepcopy(self.get_edge_config(edgeId).lan_svis)
 
     def getEdgeWanInterfaceInfo(self, edgeId: int) -> list:
-        response = self.post_vco_request('/edge/getEdgeConfigurationStack',
-                            data={
-                                "enterpriseId": NikeVcoDevice.PROD_ENTERPRISE_ID,
-                                "edgeId": edgeId
-                            })
-        wan_interfaces = {}
-
-        for i in range(0,len(response[0]["modules"][1]["data"]["routedInterfaces"])):
-            wan_interfaces[response[0]["modules"][1]["data"]["routedInterfaces"][i]["name"]] = {
-                        "ipv4_address" : response[0]["modules"][1]["data"]["routedInterfaces"][i]["addressing"]["cidrIp"],
-                        "subnet_mask"  : response[0]["modules"][1]["data"]["routedInterfaces"][i]["addressing"]["netmask"],
-                        "type" : response[0]["modules"][1]["data"]["routedInterfaces"][i]["addressing"]["type"],
-                        "cidr_prefix" : response[0]["modules"][1]["data"]["routedInterfaces"][i]["addressing"]["cidrPrefix"],
-                        "duplex" : response[0]["modules"][1]["data"]["routedInterfaces"][i]["l2"]["duplex"],
-                        "speed" : response[0]["modules"][1]["data"]["routedInterfaces"][i]["l2"]["speed"],
-                        "overlay": response[0]["modules"][1]["data"]["routedInterfaces"][i]["wanOverlay"]
-                             }
-
-        return wan_interfaces
+        return copy.deepcopy(self.get_edge_config(edgeId).wan_interfaces)
 
     def getEdgeStatus(self, name: str):
         """
@@ -637,18 +1325,7 @@ class NikeVcoDevice:
         over a specified time intervaland list of metrics. On success, this method returns an array of healthsStats
         objects for all requested edges and metrics
         """
-        vce_status_by_name = []
-
-        response = self.post_vco_request('/monitoring/getEnterpriseEdgeLinkStatus',
-                            data={
-                                "enterpriseId": NikeVcoDevice.PROD_ENTERPRISE_ID})
- 
-        for i in range(len(response)):
-            if name == response[i]["edgeName"]:
-                vce_status_by_name.append(response[i])
-            elif not name:
-                return response
-        return vce_status_by_name
+        return self.link_status.status(name)
 
     def getEdgeSerialNumber(self, name:str):
         """
@@ -656,14 +1333,7 @@ class NikeVcoDevice:
         over a specified time intervaland list of metrics. On success, this method returns an array of healthsStats
         objects for all requested edges and metrics
         """
-
-        vce_status_response = self.getEdgeStatus(name)
-
-        vce_serial_number = {'edgeName': vce_status_response[0]['edgeName'],
-                             'Active_VCE_SN': vce_status_response[0]['edgeSerialNumber'],
-                             "Standby_VCE_SN": vce_status_response[0]['edgeHASerialNumber']
-                            }
-        return vce_serial_number
+        return self.link_status.serial_numbers(name)
 
     def getWanInterfaceStatus(self, name: str):
         """
@@ -671,26 +1341,7 @@ class NikeVcoDevice:
         over a specified time intervaland list of metrics. On success, this method returns an array of healthsStats
         objects for all requested edges and metrics
         """
-        vce_wan_interface_status_by_name = []
-
-        response = self.post_vco_request('/monitoring/getEnterpriseEdgeLinkStatus',
-                            data={
-                                "enterpriseId": NikeVcoDevice.PROD_ENTERPRISE_ID})
- 
-        for i in range(len(response)):
-            if name == response[i]["edgeName"]:
-                vce_wan_interface_status_by_name.append(response[i])
-            elif not name:
-                return response
-        wan_link = {}
-        
-        for i in range(len(vce_wan_interface_status_by_name)):
-            wan_link[vce_wan_interface_status_by_name[i]["interface"]] = {"ip_address":vce_wan_interface_status_by_name[i]["linkIpAddress"],
-                                                                          "isp_info": vce_wan_interface_status_by_name[i]["isp"],
-                                                                          "link_state": vce_wan_interface_status_by_name[i]["linkState"],
-                                                                          "linkVpnState": vce_wan_interface_status_by_name[i]["linkState"],
-                                                                          "edgeState": vce_wan_interface_status_by_name[i]["edgeState"]}
-        return wan_link
+        return self.link_status.wan_interfaces(name)
 
 
 #my_vco = NikeVcoDevice()
@@ -0,0 +1,122 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+
+from nike_devices import AsyncNikeCiscoDevice, NikeCiscoDevice
+
+
+class FleetResult(namedtuple("FleetResult", ["host", "result", "error", "elapsed"])):
+    """
+    Outcome of one get_* call on one host.
+
+    Attributes:
+        host(Str): Hostname or ip address of the device.
+        result: Return value of the get_* method, None if the call failed.
+        error(Exception): Exception raised for this host, None on success.
+        elapsed(Float): Seconds spent on this host.
+    """
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class NikeFleet:
+    """
+    This class runs NikeCiscoDevice get_* methods across many devices at once with a bounded thread pool.
+    Results are yielded as each device finishes and a failing host never stops the run.
+
+    Usage:
+    fleet = NikeFleet(['10.0.0.1', '10.0.0.2'], 'username', 'password')
+    for result in fleet.run("get_interface_status", parsing_module="textfsm", workers=50, timeout=30):
+        if result.ok:
+            pprint(result.result)
+        else:
+            print(result.host, result.error)
+
+    Attributes:
+        hosts(List): Ip addresses or hostnames of the devices.
+        username(Str): Specify your tacacs Corparate Short login(CSL) username.
+        password(Str): Specify your tacacs Corparate Short login(CSL) password.
+        device_options: Optional extra arguments passed to every NikeCiscoDevice.
+    """
+
+    def __init__(self, hosts, username, password, **device_options):
+        self.hosts = list(hosts)
+        self.username = username
+        self.password = password
+        self.device_options = device_options
+
+    def make_device(self, host, timeout=None):
+        """This method returns a NikeCiscoDevice for host with the fleet credentials and device_options."""
+        options = dict(self.device_options)
+        if timeout is not None:
+            # scrapli has no single per-host deadline, so bound every phase of the connection instead.
+            options.setdefault("timeout_socket", timeout)
+            options.setdefault("timeout_transport", timeout)
+            options.setdefault("timeout_ops", timeout)
+        return NikeCiscoDevice(host, self.username, self.password, **options)
+
+    def _run_host(self, host, method, args, kwargs, timeout):
+        start = time.perf_counter()
+        try:
+            device = self.make_device(host, timeout)
+            result = getattr(device, method)(*args, **kwargs)
+        except Exception as error:
+            return FleetResult(host, None, error, time.perf_counter() - start)
+        return FleetResult(host, result, None, time.perf_counter() - start)
+
+    def run(self, method, *args, workers=16, timeout=None, **kwargs):
+        """This method calls the given get_* method on every host and yields a FleetResult as each host finishes.
+
+        Attributes:
+            method(Str): Name of the NikeCiscoDevice method, e.g. "get_interface_status".
+            workers(Int): Maximum number of devices polled at the same time.
+            timeout(Float): Per-host socket, transport and command timeout in seconds.
+            args/kwargs: Passed to the method, e.g. parsing_module="textfsm".
+        Usage:
+            fleet.run("get_os_version", parsing_module="genie", workers=100)
+        """
+        if not callable(getattr(NikeCiscoDevice, method, None)):
+            raise AttributeError(f"NikeCiscoDevice has no method '{method}'")
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = [executor.submit(self._run_host, host, method, args, kwargs, timeout) for host in self.hosts]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def run_all(self, method, *args, workers=16, timeout=None, **kwargs):
+        """Same as run() but waits for every host and returns a dict of FleetResult keyed by host."""
+        return {result.host: result for result in self.run(method, *args, workers=workers, timeout=timeout, **kwargs)}
+
+
+async def gather(devices, method, *args, concurrency=500, **kwargs):
+    """
+    Awaits the given get_* method on many AsyncNikeCiscoDevice instances with at most `concurrency` sessions open
+    at the same time and returns a list of FleetResult in the order of `devices`.
+
+    Usage:
+        devices = [AsyncNikeCiscoDevice(host, 'username', 'password') for host in hosts]
+        results = await gather(devices, "get_interface_status", parsing_module="textfsm", concurrency=1000)
+    """
+    import asyncio
+
+    if not callable(getattr(AsyncNikeCiscoDevice, method, None)):
+        raise AttributeError(f"AsyncNikeCiscoDevice has no method '{method}'")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_device(device):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await getattr(device, method)(*args, **kwargs)
+            except Exception as error:
+                return FleetResult(device.hostname, None, error, time.perf_counter() - start)
+            return FleetResult(device.hostname, result, None, time.perf_counter() - start)
+
+    return await asyncio.gather(*(run_device(device) for device in devices))
@@ -0,0 +1,233 @@
+import threading
+import time
+
+# Phases recorded by the devices.
+CONNECT = "connect"   # SSH connect, including TACACS authentication (scrapli authenticates inside open())
+COMMAND = "command"   # Sending one show command and reading its output
+PARSE = "parse"       # genie/textfsm parsing of a command output, json decoding of a VCO response
+HTTP = "http"         # One VCO REST round trip
+
+
+class Phase:
+    """
+    Times one phase of a call and reports it to its recorder when the with block exits.
+    Set bytes to the transferred/parsed size and error to flag a failure that raised nothing (e.g. HTTP 503).
+    """
+    __slots__ = ("recorder", "phase", "host", "operation", "bytes", "error", "_start")
+
+    def __init__(self, recorder, phase, host, operation):
+        self.recorder = recorder
+        self.phase = phase
+        self.host = host
+        self.operation = operation
+        self.bytes = 0
+        self.error = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        error = exc_type.__name__ if exc_type is not None else self.error
+        self.recorder.observe(self.phase, self.host, self.operation, time.perf_counter() - self._start,
+                              self.bytes, error)
+        return False
+
+
+class _NullPhase:
+    """Phase of the NullRecorder. One instance is shared by every caller, so bytes and error ignore writes and
+    always read as 0 and None."""
+    __slots__ = ()
+
+    @property
+    def bytes(self):
+        return 0
+
+    @bytes.setter
+    def bytes(self, value):
+        pass
+
+    @property
+    def error(self):
+        return None
+
+    @error.setter
+    def error(self, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class Recorder:
+    """
+    Base class of the instrumentation backends. Subclasses implement observe().
+
+    Usage:
+    with recorder.phase(nike_metrics.COMMAND, 'sw1', 'show version') as phase:
+        response = conn.send_command('show version')
+        phase.bytes = len(response.raw_result)
+    """
+
+    def phase(self, phase, host, operation):
+        return Phase(self, phase, host, operation)
+
+    def observe(self, phase, host, operation, seconds, nbytes, error):
+        raise NotImplementedError
+
+
+class NullRecorder(Recorder):
+    """Default recorder, records nothing. phase() hands out one shared object, so a disabled hook costs a method call."""
+
+    def phase(self, phase, host, operation):
+        return _NULL_PHASE
+
+    def observe(self, phase, host, operation, seconds, nbytes, error):
+        pass
+
+
+NULL_RECORDER = NullRecorder()
+_default_recorder = NULL_RECORDER
+
+
+def set_default_recorder(recorder):
+    """Sets the recorder used by devices created without metrics=..., e.g. every device of a NikeFleet."""
+    global _default_recorder
+    _default_recorder = recorder or NULL_RECORDER
+
+
+def default_recorder():
+    return _default_recorder
+
+
+class StatsRecorder(Recorder):
+    """
+    In-process aggregation of the phases, handy for benchmarks and for logging a summary at the end of a job.
+
+    Usage:
+    stats = StatsRecorder()
+    fleet = NikeFleet(hosts, 'username', 'password', metrics=stats)
+    ...
+    pprint(stats.summary())
+
+    Attributes:
+        by_host(Bool): Also keep the totals per host, not only per phase and operation.
+    """
+
+    def __init__(self, by_host=False):
+        self.by_host = by_host
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def observe(self, phase, host, operation, seconds, nbytes, error):
+        key = (phase, operation, host) if self.by_host else (phase, operation)
+        with self._lock:
+            totals = self._totals.get(key)
+            if totals is None:
+                totals = self._totals[key] = [0, 0.0, 0.0, 0, 0]
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] = max(totals[2], seconds)
+            totals[3] += nbytes
+            totals[4] += error is not None
+
+    def summary(self):
+        """Returns {(phase, operation[, host]): {'count', 'seconds', 'max_seconds', 'bytes', 'errors'}}."""
+        with self._lock:
+            return {key: dict(zip(('count', 'seconds', 'max_seconds', 'bytes', 'errors'), totals))
+                    for key, totals in self._totals.items()}
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+
+
+class PrometheusRecorder(Recorder):
+    """
+    Exports the phases as Prometheus metrics through prometheus_client:
+        <namespace>_phase_seconds          histogram of the phase durations
+        <namespace>_phase_bytes_total      bytes transferred or parsed
+        <namespace>_phase_errors_total     failed phases, labelled with the error
+
+    Usage:
+    prometheus_client.start_http_server(9100)
+    device = NikeCiscoDevice('ip address/hostname', 'username', 'password', metrics=PrometheusRecorder())
+
+    Attributes:
+        registry(CollectorRegistry): Registry the metrics are created in, defaults to prometheus_client's global one.
+        namespace(Str): Metric name prefix.
+        host_label(Bool): Add a host label. Off by default, a large fleet makes the label cardinality explode.
+        buckets(Tuple): Histogram buckets in seconds.
+    """
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    def __init__(self, registry=None, namespace="nike", host_label=False, buckets=DEFAULT_BUCKETS):
+        from prometheus_client import REGISTRY, Counter, Histogram
+
+        registry = registry or REGISTRY
+        self.host_label = host_label
+        labels = ["phase", "operation"] + (["host"] if host_label else [])
+        self.seconds = Histogram(f"{namespace}_phase_seconds", "Duration of one collector phase.",
+                                 labels, buckets=buckets, registry=registry)
+        self.bytes = Counter(f"{namespace}_phase_bytes", "Bytes transferred or parsed by a collector phase.",
+                             labels, registry=registry)
+        self.errors = Counter(f"{namespace}_phase_errors", "Failed collector phases.",
+                              labels + ["error"], registry=registry)
+
+    def observe(self, phase, host, operation, seconds, nbytes, error):
+        labels = (phase, operation, host) if self.host_label else (phase, operation)
+        self.seconds.labels(*labels).observe(seconds)
+        if nbytes:
+            self.bytes.labels(*labels).inc(nbytes)
+        if error is not None:
+            self.errors.labels(*labels, error).inc()
+
+
+class _SpanPhase(Phase):
+    __slots__ = ("_span_manager", "_span")
+
+    def __enter__(self):
+        self._span_manager = self.recorder.tracer.start_as_current_span(
+            f"nike.{self.phase}",
+            attributes={"nike.phase": self.phase, "nike.host": str(self.host), "nike.operation": str(self.operation)},
+        )
+        self._span = self._span_manager.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._span.set_attribute("nike.bytes", self.bytes)
+        if exc_type is None and self.error is not None:
+            from opentelemetry.trace import Status, StatusCode
+            self._span.set_status(Status(StatusCode.ERROR, self.error))
+        return self._span_manager.__exit__(exc_type, exc_value, traceback)
+
+
+class OpenTelemetryRecorder(Recorder):
+    """
+    Emits every phase as an OpenTelemetry span named nike.<phase>, nested under the caller's current span.
+    Exceptions are recorded on the span by the OpenTelemetry SDK.
+
+    Usage:
+    device = NikeCiscoDevice('ip address/hostname', 'username', 'password', metrics=OpenTelemetryRecorder())
+
+    Attributes:
+        tracer(Tracer): Tracer creating the spans, defaults to opentelemetry.trace.get_tracer("nike").
+    """
+
+    def __init__(self, tracer=None):
+        if tracer is None:
+            from opentelemetry import trace
+            tracer = trace.get_tracer("nike")
+        self.tracer = tracer
+
+    def phase(self, phase, host, operation):
+        return _SpanPhase(self, phase, host, operation)
+
+    def observe(self, phase, host, operation, seconds, nbytes, error):
+        pass
@@ -0,0 +1,957 @@
+from concurrent.futures import ProcessPoolExecutor
+import io
+import re
+
+GENIE_PLATFORM = "iosxe"
+TEXTFSM_PLATFORM = "cisco_iosxe"
+
+# Per worker process caches, filled on first use or by _warm_worker.
+_genie_devices = {}
+_textfsm_templates = {}
+
+
+def _genie_device(platform):
+    device = _genie_devices.get(platform)
+    if device is None:
+        from genie.conf.base import Device
+        device = Device("nike_device", custom={"abstraction": {"order": ["os"]}}, os=platform)
+        _genie_devices[platform] = device
+    return device
+
+
+def _textfsm_template(platform, command):
+    key = (platform, command)
+    if key not in _textfsm_templates:
+        from scrapli.helper import _textfsm_get_template
+        template = _textfsm_get_template(platform, command)
+        if template is None:
+            _textfsm_templates[key] = None
+        else:
+            with template:
+                _textfsm_templates[key] = template.read()
+    return _textfsm_templates[key]
+
+
+def genie_parse(command, output, platform=GENIE_PLATFORM):
+    """Parses raw output with the genie parser of the command, returns [] when genie cannot parse it."""
+    from genie.libs.parser.utils import get_parser
+    device = _genie_device(platform)
+    try:
+        get_parser(command, device)
+        parsed = device.parse(command, output=output)
+    except Exception:
+        return []
+    return parsed if isinstance(parsed, (list, dict)) else []
+
+
+def textfsm_parse(command, output, platform=TEXTFSM_PLATFORM):
+    """Parses raw output with the ntc-templates template of the command, returns [] when there is none."""
+    import textfsm
+    template = _textfsm_template(platform, command)
+    if template is None:
+        return []
+    fsm = textfsm.TextFSM(io.StringIO(template))
+    try:
+        rows = fsm.ParseText(output)
+    except textfsm.parser.TextFSMError:
+        return []
+    header = [column.lower() for column in fsm.header]
+    return [dict(zip(header, row)) for row in rows]
+
+
+def parse_output(command, output, parsing_module):
+    """Parses raw command output the same way scrapli's Response.genie_parse_output/textfsm_parse_output do."""
+    if parsing_module == 'genie':
+        return genie_parse(command, output)
+    elif parsing_module == 'textfsm':
+        return textfsm_parse(command, output)
+    elif parsing_module == 'fast':
+        return fast_parse(command, output)
+    else:
+        return output
+
+
+def _warm_worker(parsing_modules, commands):
+    # Pay for the heavy imports and the template lookups once per worker instead of once per parse.
+    if 'genie' in parsing_modules:
+        import genie.libs.parser.utils  # noqa: F401
+        _genie_device(GENIE_PLATFORM)
+    if 'textfsm' in parsing_modules:
+        import textfsm  # noqa: F401
+        for command in commands:
+            _textfsm_template(TEXTFSM_PLATFORM, command)
+
+
+class ParsePool:
+    """
+    Pool of warm parser processes, so CPU heavy genie/textfsm parsing runs on all cores and off the
+    threads that collect output from the devices.
+
+    Usage:
+    with ParsePool(workers=8) as pool:
+        device = NikeCiscoDevice('ip address/hostname', 'username', 'password', parse_pool=pool)
+        device.get_routing_table('genie')
+
+    Attributes:
+        workers(Int): Number of parser processes, defaults to the number of cores.
+        parsing_modules(Tuple): Parsers imported when a worker starts.
+        warm_commands(List): Commands whose textfsm templates are loaded when a worker starts.
+    """
+
+    def __init__(self, workers=None, parsing_modules=('genie', 'textfsm'), warm_commands=()):
+        self._executor = ProcessPoolExecutor(max_workers=workers,
+                                             initializer=_warm_worker,
+                                             initargs=(tuple(parsing_modules), tuple(warm_commands)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, command, output, parsing_module):
+        """Queues one parse and returns a concurrent.futures.Future of the parsed output."""
+        return self._executor.submit(parse_output, command, output, parsing_module)
+
+    def parse(self, command, output, parsing_module):
+        """Parses in a worker process and waits for the result."""
+        return self.submit(command, output, parsing_module).result()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+# Streaming row parsers. Each takes an iterable of output lines and yields one dict per table row, using the
+# lower-cased ntc-templates field names, so huge tables never have to be held in memory as a whole.
+
+_NAT_PROTOCOLS = {'tcp', 'udp', 'icmp', 'gre', 'esp', '---'}
+_MAC_ROW = re.compile(r'^\s*\*?\s*(?P<vlan>All|\d+|N/A)\s+(?P<mac>[0-9a-fA-F]{4}\.[0-9a-fA-F]{4}\.[0-9a-fA-F]{4})\s+'
+                      r'(?P<type>\S+)(?:\s+(?:Yes|No|-)\s+\S+)?\s+(?P<ports>\S.*?)\s*$')
+_ROUTE_SUBNETTED = re.compile(r'^\s+\d+\.\d+\.\d+\.\d+/(?P<len>\d+) is subnetted')
+_ROUTE_ENTRY = re.compile(r'^(?P<code>[A-Za-z+%&]\S*(?: [A-Z]{1,2}\d?)?)\s+(?P<network>\d+\.\d+\.\d+\.\d+)'
+                          r'(?:/(?P<len>\d+))?\s*(?P<rest>.*)$')
+_ROUTE_VIA = re.compile(r'^\[(?P<distance>\d+)/(?P<metric>\d+)\] via (?P<nexthop>[^,\s]+)(?P<extra>.*)$')
+_ROUTE_CONNECTED = re.compile(r'^is (?:directly connected|a summary)(?P<extra>.*)$')
+_UPTIME = re.compile(r'^(?:\d+:\d+:\d+|\d+[ywdhm]\S*|never)$')
+
+
+def _split_nat_address(address):
+    ip, _, port = address.partition(':')
+    return ip, port
+
+
+def iter_nat_translation_rows(lines):
+    """Yields show ip nat translations rows."""
+    for line in lines:
+        fields = line.split()
+        if len(fields) == 5 and fields[0].lower() in _NAT_PROTOCOLS:
+            row = {'protocol': fields[0]}
+            for name, address in zip(('inside_global', 'inside_local', 'outside_local', 'outside_global'), fields[1:]):
+                row[f'{name}_ip'], row[f'{name}_port'] = _split_nat_address(address)
+            yield row
+
+
+def iter_mac_address_rows(lines):
+    """Yields show mac address-table rows."""
+    for line in lines:
+        match = _MAC_ROW.match(line)
+        if match:
+            yield {'destination_address': match['mac'],
+                   'type': match['type'],
+                   'vlan_id': match['vlan'],
+                   'destination_port': [port.strip() for port in match['ports'].split(',')]}
+
+
+def _route_extra(extra):
+    uptime = nexthop_if = ''
+    for item in (item.strip() for item in extra.split(',')):
+        if not item:
+            continue
+        if _UPTIME.match(item):
+            uptime = item
+        else:
+            nexthop_if = item
+    return uptime, nexthop_if
+
+
+def iter_route_rows(lines):
+    """Yields show ip route rows, one per next hop."""
+    subnet_length = ''
+    route = None
+    for line in lines:
+        stripped = line.strip()
+        match = _ROUTE_SUBNETTED.match(line)
+        if match:
+            subnet_length = match['len']
+            continue
+        if 'is variably subnetted' in line:
+            subnet_length = ''
+            continue
+
+        match = _ROUTE_ENTRY.match(line)
+        if match:
+            code = match['code'].split()
+            route = {'protocol': code[0].rstrip('*'),
+                     'type': code[1] if len(code) > 1 else '',
+                     'network': match['network'],
+                     'prefix_length': match['len'] or subnet_length}
+            stripped = match['rest']
+            if not stripped:
+                # The next hops follow on the next lines.
+                continue
+        elif route is None or not line[:1].isspace():
+            continue
+
+        match = _ROUTE_VIA.match(stripped)
+        if match:
+            uptime, nexthop_if = _route_extra(match['extra'])
+            yield dict(route, distance=match['distance'], metric=match['metric'],
+                       nexthop_ip=match['nexthop'], nexthop_if=nexthop_if, uptime=uptime)
+            continue
+
+        match = _ROUTE_CONNECTED.match(stripped)
+        if match:
+            uptime, nexthop_if = _route_extra(match['extra'])
+            yield dict(route, distance='', metric='', nexthop_ip='', nexthop_if=nexthop_if, uptime=uptime)
+
+
+STREAM_PARSERS = {
+    "show ip nat translations": iter_nat_translation_rows,
+    "show mac address-table": iter_mac_address_rows,
+    "show ip route": iter_route_rows,
+}
+
+
+# Fast parsers. Precompiled single pass parsers for the hottest commands, returning the structure of the genie
+# iosxe parser of the command without importing genie. benchmarks/verify_fast_parsers.py checks them against genie
+# on the recorded outputs in benchmarks/fixtures (IOS-XE 9300 stack and single switch, ISR4451, classic IOS 2960X
+# stack), add recordings of other platforms with --corpus before relying on them there. Known differences:
+# - show version: when the 'Switch Ports Model ...' header has no Mode column but the rows have one, genie keeps
+#   the mode in sw_image, the fast parser reads it as mode.
+
+# genie's generic INTERFACE_ABBREVIATION_MAPPING_TABLE.
+_INTERFACE_ABBREVIATIONS = {
+    'Eth': 'Ethernet', 'SEth': 'Service-Ethernet', 'Lo': 'Loopback', 'lo': 'Loopback', 'Fa': 'FastEthernet',
+    'Fas': 'FastEthernet', 'Po': 'Port-channel', 'PO': 'Port-channel', 'Null': 'Null', 'Gi': 'GigabitEthernet',
+    'Gig': 'GigabitEthernet', 'GE': 'GigabitEthernet', 'Te': 'TenGigabitEthernet', 'Ten': 'TenGigabitEthernet',
+    'Tw': 'TwoGigabitEthernet', 'Two': 'TwoGigabitEthernet', 'Twe': 'TwentyFiveGigE', 'Fi': 'FiveGigabitEthernet',
+    'Fiv': 'FiveGigabitEthernet', 'Fif': 'FiftyGigE', 'Fifty': 'FiftyGigabitEthernet', 'mgmt': 'mgmt', 'Vl': 'Vlan',
+    'Tu': 'Tunnel', 'Hs': 'HSSI', 'AT': 'ATM', 'Et': 'Ethernet', 'BD': 'BDI', 'Ser': 'Serial', 'Se': 'Serial',
+    'Fo': 'FortyGigabitEthernet', 'For': 'FortyGigabitEthernet', 'Hu': 'HundredGigE', 'Hun': 'HundredGigE',
+    'TwoH': 'TwoHundredGigabitEthernet', 'Fou': 'FourHundredGigE', 'vl': 'vasileft', 'vr': 'vasiright',
+    'BE': 'Bundle-Ether', 'tu': 'Tunnel', 'M-E': 'M-Ethernet', 'BAGG': 'Bridge-Aggregation',
+    'Ten-GigabitEthernet': 'TenGigabitEthernet', 'Wl': 'Wlan-GigabitEthernet', 'Di': 'Dialer', 'Vi': 'Virtual-Access',
+    'Ce': 'Cellular', 'Vp': 'Virtual-PPP', 'pw': 'pseudowire',
+}
+_INTERFACE_TYPE = re.compile(r'[-a-zA-Z]+')
+_INTERFACE_NUMBER = re.compile(r'\d[\w./]*')
+_expanded_interfaces = {}
+
+
+def expand_interface_name(name):
+    """Full interface name the way genie's Common.convert_intf_name writes it, e.g. Gi1/0/1 -> GigabitEthernet1/0/1."""
+    expanded = _expanded_interfaces.get(name)
+    if expanded is None:
+        interface_type = _INTERFACE_TYPE.search(name)
+        number = _INTERFACE_NUMBER.search(name)
+        if interface_type is None or number is None:
+            expanded = name
+        elif interface_type.group() in _INTERFACE_ABBREVIATIONS:
+            expanded = _INTERFACE_ABBREVIATIONS[interface_type.group()] + number.group()
+        else:
+            expanded = name[0].capitalize() + name[1:].replace(' ', '').replace('ethernet', 'Ethernet')
+        if len(_expanded_interfaces) < 65536:
+            _expanded_interfaces[name] = expanded
+    return expanded
+
+
+_PORT_STATUSES = frozenset(('connected', 'notconnect', 'suspended', 'inactive', 'disabled', 'err-disabled',
+                            'monitoring'))
+
+
+def fast_interfaces_status(output):
+    """show interfaces status, genie structure {'interfaces': {name: {...}}}."""
+    interfaces = {}
+    for line in output.splitlines():
+        words = line.split()
+        # The status is the last status keyword followed by at least vlan, duplex and speed, the one the
+        # greedy name group of the genie regex ends up with.
+        for index in range(len(words) - 4, 0, -1):
+            if words[index] in _PORT_STATUSES:
+                break
+        else:
+            continue
+        line = line.strip()
+        # Offsets of the status and type columns, found right to left so a name or type with inner spaces is kept.
+        end = len(line)
+        for position in range(len(words) - 1, index - 1, -1):
+            end = line.rfind(words[position], 0, end)
+            if position == index + 4:
+                type_start = end
+        entry = interfaces.setdefault(expand_interface_name(words[0]), {})
+        name = line[len(words[0]):end].strip()
+        if name:
+            entry['name'] = name
+        entry['status'] = words[index]
+        entry['vlan'] = words[index + 1]
+        entry['duplex_code'] = words[index + 2]
+        entry['port_speed'] = words[index + 3]
+        if len(words) > index + 4:
+            entry['type'] = line[type_start:]
+    return {'interfaces': interfaces} if interfaces else {}
+
+
+def fast_ip_interface_brief(output):
+    """show ip interface brief, genie structure {'interface': {name: {...}}}."""
+    interfaces = {}
+    in_table = False
+    for line in output.splitlines():
+        if not in_table:
+            in_table = line.startswith('Interface') and 'IP-Address' in line
+            continue
+        fields = line.split()
+        if len(fields) < 6:
+            continue
+        interfaces[expand_interface_name(fields[0])] = {
+            'ip_address': fields[1],
+            'interface_is_ok': fields[2],
+            'method': fields[3],
+            'status': ' '.join(fields[4:-1]),
+            'protocol': fields[-1],
+        }
+    return {'interface': interfaces} if interfaces else {}
+
+
+_ARP_ROW = re.compile(r'^[ \t]*(?P<protocol>\w+) +(?P<address>[\d\.\:]+) +(?P<age>[\d\-]+) +(?P<mac>[\w\.]+) '
+                      r'+(?P<type>[\w\.]+)(?: +(?P<interface>[\w\.\/\-]+)(?:[ \t]+pv[ \t]+(?P<private_vlan>\d+))?)?'
+                      r'[ \t\r]*$', re.MULTILINE)
+
+
+def fast_ip_arp(output):
+    """show ip arp, genie structure {'interfaces': {name: {'ipv4': {'neighbors': {ip: {...}}}}}}."""
+    parsed = {}
+    for match in _ARP_ROW.finditer(output):
+        protocol, address, age, mac, entry_type, interface, private_vlan = match.groups()
+        if interface:
+            entry = parsed.setdefault('interfaces', {}).setdefault(interface, {}).setdefault('ipv4', {}) \
+                .setdefault('neighbors', {}).setdefault(address, {})
+            entry['ip'] = address
+            entry['link_layer_address'] = mac
+            entry['type'] = entry_type
+            entry['origin'] = 'static' if age == '-' else 'dynamic'
+            if private_vlan:
+                entry['private_vlan'] = int(private_vlan)
+        else:
+            entry = parsed.setdefault('global_static_table', {}).setdefault(address, {})
+            entry['ip_address'] = address
+            entry['mac_address'] = mac
+            entry['encap_type'] = entry_type
+        entry['age'] = age
+        entry['protocol'] = protocol
+    return parsed
+
+
+_MAC_TOTAL = re.compile(r'^Total +Mac +Addresses +for +this +criterion: +(?P<val>\d+)$')
+_MAC_ENTRY = re.compile(r'^(?P<entry>[\w\*] )?\s*(?P<vlan>All|[\d\-]+) +(?P<mac>[\w.]+) +(?P<entry_type>\w+) '
+                        r'+(?P<intfs>\S+|[^\s]+\s[^\s]+)$')
+_MAC_CONTINUATION = re.compile(r'^(?P<intfs>(vPC Peer-Link)?[\w\/\,\(\)]+)$')
+_MAC_ENTRY_LEARN = re.compile(r'^(?P<entry>[\w\*] )?\s*(?P<vlan>All|[\d\-]+) +(?P<mac>[\w.]+) +(?P<entry_type>\w+) '
+                              r'+(?P<learn>\w+) +(?P<age>[\d\-\~]+) +(?P<intfs>(vPC )?[\w\/\,\-\(\)\s]+)$')
+_MAC_ENTRY_PROTOCOLS = re.compile(r'^(?P<entry>[\w\*] )?\s*(?P<vlan>All|[\d\-]+) +(?P<mac>[\w.]+) '
+                                  r'+(?P<entry_type>\w+) +(?P<protocols>[\w\,]+) +(?P<intfs>\S+|[^\s]+\s[^\s]+)$')
+
+
+def _mac_entry(parsed, match):
+    vlan = match['vlan']
+    vlan = int(vlan) if vlan.isdigit() else vlan.lower()
+    vlan_entry = parsed.setdefault('mac_table', {}).setdefault('vlans', {}).setdefault(str(vlan), {})
+    vlan_entry['vlan'] = vlan
+    mac_entry = vlan_entry.setdefault('mac_addresses', {}).setdefault(match['mac'], {})
+    mac_entry['mac_address'] = match['mac']
+    return mac_entry
+
+
+def _mac_ports(mac_entry, ports, entry_type, extra):
+    for port in ports.split(','):
+        port = expand_interface_name(port)
+        port_entry = mac_entry.setdefault('interfaces', {}).setdefault(port, {})
+        port_entry['interface'] = port
+        port_entry['entry_type'] = entry_type
+        port_entry.update(extra)
+
+
+def fast_mac_address_table(output):
+    """show mac address-table, genie structure {'mac_table': {'vlans': {vlan: {'mac_addresses': {...}}}}}."""
+    parsed = {}
+    mac_entry = parsed
+    # Attributes of the last row, inherited by the port continuation lines of a multi port row.
+    entry_type = entry = learn = age = ''
+    for line in output.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        match = _MAC_TOTAL.match(line) if line.startswith('Total') else None
+        if match:
+            parsed['total_mac_addresses'] = int(match['val'])
+            continue
+
+        match = _MAC_ENTRY.match(line)
+        learn_match = protocols_match = None
+        if match is None:
+            continuation = _MAC_CONTINUATION.match(line)
+            if continuation:
+                ports = continuation['intfs'].strip()
+                if 'drop' in ports.lower():
+                    mac_entry.setdefault('drop', {}).update({'drop': True, 'entry_type': entry_type})
+                    continue
+                extra = {key: value for key, value in (('entry', entry), ('learn', learn), ('age', age)) if value}
+                _mac_ports(mac_entry, ports, entry_type, extra)
+                continue
+            learn_match = match = _MAC_ENTRY_LEARN.match(line)
+            if match is None:
+                protocols_match = match = _MAC_ENTRY_PROTOCOLS.match(line)
+                if match is None:
+                    continue
+
+        mac_entry = _mac_entry(parsed, match)
+        ports = match['intfs'].strip()
+        if 'drop' in ports.lower():
+            mac_entry.setdefault('drop', {}).update({'drop': True, 'entry_type': match['entry_type'].lower()})
+            continue
+        entry_type = match['entry_type'].lower()
+        extra = {}
+        if match['entry']:
+            entry = extra['entry'] = match['entry'].strip()
+        if learn_match is not None:
+            learn = extra['learn'] = match['learn']
+            age = int(match['age']) if match['age'].isdigit() else None
+            if age is not None:
+                extra['age'] = age
+        else:
+            ports = ports.replace(' ', ',')
+            if protocols_match is not None:
+                extra['protocols'] = match['protocols'].split(',')
+        _mac_ports(mac_entry, ports, entry_type, extra)
+    return parsed
+
+
+_VERSION_XE = re.compile(r'^Cisco +([\S\s]+) +Software, +Version +(?P<xe_version>.*)$')
+_VERSION_IOS = re.compile(r'^[Cc]isco +IOS +[Ss]oftware\, +(?P<os>([\S]+)) +Software\, +(?P<platform>.+) Software '
+                          r'+\((?P<image_id>.+)\).+[Vv]ersion +(?P<version>\S+) +.*$')
+_VERSION_IOS_TM = re.compile(r'^(?P<os>[A-Z]+) +\(.*\) +(?P<platform>.+) +Software +\((?P<image_id>.+)\).+'
+                             r'( +Experimental)? +[Vv]ersion +(?P<version>\S+), +(EARLY DEPLOYMENT |PLATFORM SPECIFIC '
+                             r'|SHARED PLATFORM, )?RELEASE SOFTWARE .*$')
+_VERSION_SHORT = re.compile(r'^(?P<ver_short>\d+\.\d+).*')
+_VERSION_LABEL = re.compile(r'^[Cc]isco +(?P<os>[A-Z]+) +[Ss]oftware\s*\[?(?P<location>\w*)?\]?\, +(?P<platform>.+) '
+                            r'+Software +\((?P<image_id>.+)\).+( +Experimental)? +[Vv]ersion +(?P<version>[\w.:()]+) '
+                            r'*,? *(?P<label>(\[.*?(?P<build_label>BLD_\w+)([-:]\S+)? \d+\])|.*)$')
+_VERSION_COPYRIGHT = re.compile(r'^Copyright +\(c\) +(?P<copyright_years>\d+-\d+).*$')
+_VERSION_ROM = re.compile(r'^ROM\:( +(?P<rom>.+?)(?:BOOTLDR\: +(?P<bootldr>.+))?$)?')
+_VERSION_BOOTSTRAP = re.compile(r'^Bootstrap +program +is +(?P<os>.+)$')
+_VERSION_UPTIME = re.compile(r'^(?P<hostname>.+) +uptime +is +(?P<uptime>.+)$')
+_VERSION_LICENSE_LEVEL_TYPE = re.compile(r'(?P<license_level>\S+) +Type\: +(?P<license_type>.+)$')
+_VERSION_LICENSE_CURRENT = re.compile(r'^Current  +Type  +Next reboot')
+_VERSION_LICENSE_PACKAGE = re.compile(r'^(?P<license_package>[\w-]+)(?:\s{2,})(?P<package_license_type>(\w+ )+)'
+                                      r'(?:\s{2,})(?P<next_reload_license_level>\S+)\s*$')
+_VERSION_CHASSIS = (
+    re.compile(r'^(C|c)isco +(?P<chassis>[a-zA-Z0-9\-\/\+]+) +\((?P<processor_type>[^)]*)\) +(.*?)with '
+               r'+(?P<main_mem>[0-9]+)[kK](\/[0-9]+[kK])?'),
+    re.compile(r'^(C|c)isco +(?P<chassis>[a-zA-Z0-9\-\/\+]+) +.* +with +(?P<processor_type>.+) +with '
+               r'+(?P<main_mem>[0-9]+)[kK](\/[0-9]+[kK])?'),
+    re.compile(r'^(A|a)llen-Bradley +(?P<chassis>[a-zA-Z0-9\-\/\+]+) +\((?P<processor_type>[^)]*)\) +(.*?)with '
+               r'+(?P<main_mem>[0-9]+)[kK](\/[0-9]+[kK])?'),
+)
+_VERSION_CHASSIS_SN = re.compile(r'^[pP]rocessor +board +ID +(?P<chassis_sn>[a-zA-Z0-9]+)')
+_VERSION_PORTS = re.compile(r'^(?P<number_of_ports>\d+) +(?P<interface>.+) +(interface(?:s)?|line|port(?:s)?)$')
+_VERSION_MEMORY = re.compile(r'^(?P<mem_size>\d+)K +bytes +of +(?P<memories>.+) +[Mm]emory\.')
+_VERSION_DISK = re.compile(r'^(?P<disk_size>\d+)K bytes of (?P<type_of_disk>.*) at (?P<disks>.+)$')
+_VERSION_OS = re.compile(r'^[Cc]isco +(?P<os>[a-zA-Z\-]+) +[Ss]oftware\,')
+_VERSION_CONFIG_REGISTER = re.compile(r'^[Cc]onfiguration +register +is +(?P<curr_config_register>[a-zA-Z0-9]+)'
+                                      r'(?: +\(will be (?P<next_config_register>[a-zA-Z0-9]+) at next reload\))?')
+_VERSION_SWITCH = re.compile(r'^[Ss]witch +0(?P<switch_number>\d+)$')
+_VERSION_FPGA = re.compile(r'^System FPGA version\s+:\s+(?P<system_fpga_version>(\d+\.?)+)')
+_VERSION_COMPILED = re.compile(r'^Compiled +(?P<compiled_date>[\S\s]+) +by +(?P<compiled_by>\w+)$')
+_VERSION_RETURNED_TO_ROM = re.compile(r'^System +returned +to +ROM +by +(?P<returned_to_rom_by>[\w\s\-]+)(?: +at '
+                                      r'+(?P<returned_to_rom_at>[\w\s\:]+))?(?: +\(SP +by +(?P<sp_by>[\S\s\-]+)\))?$')
+_VERSION_CPU = re.compile(r'^(?P<cpu_name>\S+) +(CPU|cpu|Cpu) +at +(?P<speed>\S+)\,(( +(?P<core>\S+) +core\, '
+                          r'+(?P<l2_cache>\S+) +L2 +[Cc]ache)|( +Supervisor +(?P<supervisor>\S+)))$')
+_VERSION_BOARD_FLASH = re.compile(r'^(?P<processor_board_flash>\S+) +bytes .+$')
+_VERSION_JAWA = re.compile(r'^Jawa +Revision +(?P<jawa_revision>\S+)\, +Snowtrooper +Revision +(?P<snowtrooper_rev>\S+)$')
+_VERSION_LICENSE_ROW = re.compile(r'^(?P<technology>\w[\w\-]+)(?: {2,}(?P<license_level>\w+) {2,}'
+                                  r'(?P<license_type>\w+(?: +\w+)?) {2,}(?P<next_boot>\w+))?$')
+_VERSION_LICENSE_HEADER = re.compile(r'^(?P<aname>Suite|Technology) +((Suite +Current)|(Technology\-package))')
+_VERSION_SUITE_MODULE = re.compile(r'^[Ss]uite +[Ll]icense +[Ii]nformation +for +[Mm]odule\:\'(?P<module>\S+)\'$')
+_VERSION_UDI = re.compile(r'^(?P<device_num>[*\d]+) +(?P<pid>[\S]+) +(?P<sn>[A-Z\d]+)$')
+_VERSION_IMAGE_BASE = re.compile(r'^Image text-base: +(?P<text_base>\S+), data-base: +(?P<data_base>\S+)$')
+_VERSION_ETHERNET = re.compile(r'^(?P<interface>\d+) +(?P<ethernet_type>Virtual Ethernet|Gigabit Ethernet|FastEthernet)'
+                               r'/IEEE 802\.3 +interface\(s\)$')
+_VERSION_REVISIONS = re.compile(r'^(?P<group1>\S+)\s+Revision\s+(?P<group1_int>\d+),\s+(?P<group2>\S+)\s+Revision'
+                                r'\s+(?P<group2_int>\d+)$')
+# genie only reads the table when the header columns are padded to their usual width, classic IOS switches that
+# strip the trailing blanks get no table and no ports/model/sw_ver/sw_image/active keys from it.
+_VERSION_SWITCH_TABLE = re.compile(r'^\s*Switch\s+Ports\s+Model\s{13,}SW Version\s{7,}SW Image\s{14,}(?:Mode\s{3,})?$')
+_VERSION_SWITCH_ROW = re.compile(r'^(?P<active>\*)?\s*(?P<switch>\d+)\s+(?P<ports>\d+)\s+(?P<model>\S+)\s+'
+                                 r'(?P<sw_ver>\S+)\s+(?P<sw_image>\S+)(?:\s+(?P<mode>\S+))?$')
+
+# "<label> : <value>" lines of the switch details, keyed by the lower-cased label.
+_VERSION_SWITCH_FIELDS = {
+    'base ethernet mac address': 'mac_address',
+    'motherboard assembly number': 'mb_assembly_num',
+    'motherboard serial number': 'mb_sn',
+    'model revision number': 'model_rev_num',
+    'motherboard revision number': 'mb_rev_num',
+    'model number': 'model_num',
+    'system serial number': 'system_sn',
+    'power supply part number': 'power_supply_part_nr',
+    'power supply serial number': 'power_supply_sn',
+    'daughterboard assembly number': 'db_assembly_num',
+    'daughterboard serial number': 'db_sn',
+    'top assembly part number': 'top_assembly_part_num',
+    'top assembly revision number': 'top_assembly_rev_num',
+    'version id': 'version_id',
+    'clei code number': 'clei_code_num',
+    'daughterboard revision number': 'db_rev_num',
+    'hardware board revision number': 'hb_rev_num',
+}
+# Single value "<prefix> <value>" lines, checked in this order.
+_VERSION_PREFIXES = (
+    ('Uptime for this control processor is ', 'uptime_this_cp'),
+    ('System restarted at ', 'system_restarted_at'),
+    ('Last reload reason: ', 'last_reload_reason'),
+    ('Last reset from ', 'last_reload_reason'),
+    ('License Type: ', 'license_type'),
+)
+
+
+def _version_software(version, match, labelled):
+    short = _VERSION_SHORT.match(match['version'])
+    if short is None:
+        return False
+    version['version_short'] = short['ver_short']
+    version['platform'] = match['platform'] if labelled else match['platform'].strip()
+    version['version'] = match['version']
+    version['image_id'] = match['image_id']
+    if labelled:
+        if match['label']:
+            version['label'] = match['label']
+        if match['build_label']:
+            version['build_label'] = match['build_label']
+        if match['location']:
+            version['location'] = match['location']
+    if match['os']:
+        version['os'] = match['os']
+    return True
+
+
+def _version_rtr_type(chassis):
+    if 'C3850' in chassis or 'C3650' in chassis:
+        return 'Edison'
+    if 'ASR1' in chassis:
+        return 'ASR1K'
+    if 'CSR1000V' in chassis:
+        return 'CSR1000V'
+    if 'C11' in chassis:
+        return 'ISR'
+    return chassis
+
+
+def fast_version(output):
+    """show version, genie structure {'version': {...}}. Lines are tried in the order of the genie patterns,
+    each pattern behind a cheap literal test so most lines never reach a regex."""
+    version = {}
+    active = {}
+    switch = None
+    uptime_this_cp = None
+    license_table = suite_table = False
+    suite = udi = None
+    switch_table = False
+    switch_rows = {}
+    for raw_line in output.splitlines():
+        line = raw_line.strip()
+        if switch_table:
+            # Rows of the 'Switch Ports Model ...' table, which ends at the first empty line after them.
+            match = _VERSION_SWITCH_ROW.match(line)
+            if match:
+                switch_rows[match['switch']] = match
+            elif not line and switch_rows:
+                switch_table = False
+        if not line:
+            continue
+        first = line[0]
+
+        if 'oftware' in line:
+            match = _VERSION_XE.match(line)
+            if match:
+                version['xe_version'] = match['xe_version']
+                continue
+            match = _VERSION_IOS.match(line) or _VERSION_IOS_TM.match(line)
+            if match and _version_software(version, match, False):
+                continue
+            match = _VERSION_LABEL.match(line)
+            if match and _version_software(version, match, True):
+                continue
+        if first == 'C':
+            if line.startswith('Copyright'):
+                match = _VERSION_COPYRIGHT.match(line)
+                if match:
+                    version.setdefault('image_type', 'developer image')
+                    version.setdefault('copyright_years', match['copyright_years'])
+                    continue
+        elif first == 'T':
+            if line.startswith('Technical Support: http://www.cisco.com/techsupport'):
+                version.setdefault('image_type', 'production image')
+                continue
+        elif first == 'R':
+            if line.startswith('ROM:'):
+                match = _VERSION_ROM.match(line)
+                version['rom'] = match['rom']
+                if match['bootldr']:
+                    version['bootldr'] = match['bootldr']
+                if match['rom'] is not None:
+                    bootstrap = _VERSION_BOOTSTRAP.match(match['rom'])
+                    if bootstrap and 'os' not in version:
+                        version['os'] = bootstrap['os']
+                continue
+        elif first == 'B':
+            if line.startswith('BOOTLDR: '):
+                version['bootldr'] = line[9:].lstrip()
+                continue
+        if 'uptime' in line:
+            match = _VERSION_UPTIME.match(line)
+            if match:
+                version['hostname'] = match['hostname']
+                version['uptime'] = match['uptime']
+                continue
+        if first in 'USLlu':
+            for prefix, key in _VERSION_PREFIXES:
+                if line.startswith(prefix):
+                    version[key] = line[len(prefix):].lstrip()
+                    if key == 'uptime_this_cp':
+                        uptime_this_cp = version[key]
+                    break
+            else:
+                prefix = None
+            if prefix is not None:
+                continue
+            if line.startswith('System image file is "') and line.count('"') > 1:
+                version['system_image'] = line[22:line.rindex('"')]
+                continue
+        if 'icense' in line:
+            if line.startswith(('License Level: ', 'license Level: ', 'License level: ')):
+                level = line.split(':', 1)[1].strip()
+                if 'Type:' in level:
+                    match = _VERSION_LICENSE_LEVEL_TYPE.match(level)
+                    if match:
+                        version['license_type'] = match['license_type']
+                        version['license_level'] = match['license_level']
+                else:
+                    version['license_level'] = level
+                continue
+            if line.startswith('AIR License Level: '):
+                version['air_license_level'] = line[19:].lstrip()
+                continue
+            if line.startswith(('Next reload license Level: ', 'Next reboot license Level: ')):
+                version['next_reload_license_level'] = line.split(':', 1)[1].lstrip()
+                continue
+            if line.startswith(('Next reload AIR license Level: ', 'Next reboot AIR license Level: ')):
+                version['next_reload_air_license_level'] = line.split(':', 1)[1].lstrip()
+                continue
+        if first == 'C' and _VERSION_LICENSE_CURRENT.match(line):
+            version.setdefault('license_package', {})
+            continue
+        if '  ' in line:
+            match = _VERSION_LICENSE_PACKAGE.match(line)
+            if match:
+                version.setdefault('license_package', {})[match['license_package']] = {
+                    'license_level': match['license_package'],
+                    'license_type': match['package_license_type'].strip(),
+                    'next_reload_license_level': match['next_reload_license_level'],
+                }
+                continue
+        if ' with ' in line:
+            for pattern in _VERSION_CHASSIS:
+                match = pattern.match(line)
+                if match:
+                    version['chassis'] = match['chassis']
+                    version['main_mem'] = match['main_mem']
+                    version['processor_type'] = match['processor_type']
+                    version['rtr_type'] = _version_rtr_type(match['chassis'])
+                    break
+            if match:
+                continue
+        if line.startswith('Router operating mode: '):
+            version['router_operating_mode'] = line[23:]
+            continue
+        if line.startswith('Installation mode is '):
+            version['installation_mode'] = line[21:].lstrip()
+            continue
+        if first in 'Pp':
+            match = _VERSION_CHASSIS_SN.match(line)
+            if match:
+                version['chassis_sn'] = match['chassis_sn']
+                continue
+        if first.isdigit():
+            match = _VERSION_PORTS.match(line)
+            if match:
+                version.setdefault('number_of_intfs', {})[match['interface']] = match['number_of_ports']
+                continue
+            match = _VERSION_MEMORY.match(line)
+            if match:
+                version.setdefault('mem_size', {})[match['memories']] = match['mem_size']
+                continue
+            match = _VERSION_DISK.match(line)
+            if match:
+                version.setdefault('disks', {})[match['disks']] = {'disk_size': match['disk_size'],
+                                                                    'type_of_disk': match['type_of_disk']}
+                continue
+        if first in 'Cc':
+            match = _VERSION_OS.match(line)
+            if match:
+                version['os'] = match['os']
+                continue
+            match = _VERSION_CONFIG_REGISTER.match(line)
+            if match:
+                version['curr_config_register'] = match['curr_config_register']
+                if match['next_config_register']:
+                    version['next_config_register'] = match['next_config_register']
+                    continue
+        if first in 'Ss':
+            match = _VERSION_SWITCH.match(line)
+            if match:
+                switch = match['switch_number']
+                version.setdefault('switch_num', {}).setdefault(switch, {})
+                continue
+        if ':' in line:
+            label, _, value = line.partition(':')
+            key = ' '.join(label.split()).lower()
+            if key == 'switch uptime':
+                if value[:1].isspace() and value.strip():
+                    if 'switch_num' in version:
+                        version['switch_num'][switch]['uptime'] = value.strip()
+                    continue
+            elif key in _VERSION_SWITCH_FIELDS and label[-1:].isspace() and value[:1].isspace() and value.strip():
+                value = value.strip()
+                if 'switch_num' in version:
+                    version['switch_num'][switch][_VERSION_SWITCH_FIELDS[key]] = value
+                else:
+                    active.setdefault(_VERSION_SWITCH_FIELDS[key], value)
+                continue
+        if first == 'C':
+            match = _VERSION_COMPILED.match(line)
+            if match:
+                version['compiled_date'] = match['compiled_date']
+                version['compiled_by'] = match['compiled_by']
+                continue
+        if line.startswith('System returned to ROM by '):
+            match = _VERSION_RETURNED_TO_ROM.match(line)
+            if match:
+                version['returned_to_rom_by'] = match['returned_to_rom_by']
+                if match['returned_to_rom_at']:
+                    version['returned_to_rom_at'] = match['returned_to_rom_at']
+                if match['sp_by']:
+                    version['sp_by'] = match['sp_by']
+                continue
+        if line.startswith('Last reload type: '):
+            version['last_reload_type'] = line[18:].lstrip()
+            continue
+        if ' at ' in line:
+            match = _VERSION_CPU.match(line)
+            if match:
+                processor = version.setdefault('processor', {})
+                processor['cpu_type'] = match['cpu_name']
+                processor['speed'] = match['speed']
+                if match['supervisor']:
+                    processor['supervisor'] = match['supervisor']
+                else:
+                    processor['core'] = match['core']
+                    processor['l2_cache'] = match['l2_cache']
+                continue
+        if ' bytes ' in line:
+            match = _VERSION_BOARD_FLASH.match(line)
+            if match:
+                version['processor_board_flash'] = match['processor_board_flash']
+                continue
+        if line.startswith('Running ') and line.endswith(' software') and len(line.split()) == 3:
+            version['running_default_software'] = True
+            continue
+        if first == 'J':
+            match = _VERSION_JAWA.match(line)
+            if match:
+                version['jawa_revision'] = match['jawa_revision']
+                version['snowtrooper_revision'] = match['snowtrooper_rev']
+                continue
+        match = _VERSION_LICENSE_ROW.match(line)
+        if match:
+            if license_table:
+                package = version.setdefault('license_package', {}).setdefault(match['technology'], {})
+                if match['license_type']:
+                    package['license_type'] = match['license_type']
+                if match['license_level']:
+                    package['license_level'] = match['license_level']
+                if match['next_boot']:
+                    package['next_reload_license_level'] = match['next_boot']
+            if suite_table:
+                suite_license = suite.setdefault(match['technology'], {})
+                if match['license_level']:
+                    suite_license['suite_current'] = match['license_level']
+                if match['license_type']:
+                    suite_license['type'] = match['license_type'].strip()
+                if match['next_boot']:
+                    suite_license['suite_next_reboot'] = match['next_boot']
+            continue
+        if first in 'ST':
+            match = _VERSION_LICENSE_HEADER.match(line)
+            if match:
+                if 'Suite' in match['aname']:
+                    suite_table = True
+                if 'Technology' in match['aname']:
+                    license_table = True
+                    suite_table = False
+                continue
+            match = _VERSION_SUITE_MODULE.match(line)
+            if match:
+                suite = version.setdefault('module', {}).setdefault(match['module'], {})
+                continue
+        if line == 'License UDI:':
+            udi = version.setdefault('license_udi', {})
+            continue
+        if udi is not None:
+            match = _VERSION_UDI.match(line)
+            if match:
+                udi.setdefault('device_num', {})[match['device_num']] = {'pid': match['pid'], 'sn': match['sn']}
+                continue
+        if line.startswith('Image text-base: '):
+            match = _VERSION_IMAGE_BASE.match(line)
+            if match:
+                version['image'] = {'text_base': match['text_base'], 'data_base': match['data_base']}
+                continue
+        if first.isdigit() and '/IEEE 802.3' in line:
+            match = _VERSION_ETHERNET.match(line)
+            if match:
+                ethernet_type = '_'.join(match['ethernet_type'].lower().split())
+                version.setdefault('interfaces', {})[ethernet_type] = int(match['interface'])
+                continue
+        if 'Revision' in line:
+            match = _VERSION_REVISIONS.match(line)
+            if match:
+                version['revision'] = {match['group1']: int(match['group1_int']),
+                                       match['group2']: int(match['group2_int'])}
+                continue
+        if line.startswith('System FPGA version'):
+            match = _VERSION_FPGA.match(line)
+            if match:
+                if 'switch_num' in version:
+                    version['switch_num'][switch]['system_fpga_version'] = match['system_fpga_version']
+                else:
+                    active.setdefault('system_fpga_version', match['system_fpga_version'])
+                continue
+        if first == 'S' and not switch_rows and _VERSION_SWITCH_TABLE.match(raw_line):
+            switch_table = True
+
+    if switch_rows:
+        switches = version.setdefault('switch_num', {})
+        for number, row in switch_rows.items():
+            entry = switches.setdefault(number, {})
+            entry.update((key, row[key]) for key in ('ports', 'model', 'sw_ver', 'sw_image', 'mode') if row[key])
+            if row['active']:
+                if uptime_this_cp is not None:
+                    entry['uptime'] = uptime_this_cp
+                entry['active'] = True
+                entry.update(active)
+            else:
+                entry['active'] = False
+    elif active:
+        # No switch table, the details belong to the first free switch number.
+        used = {int(number) for number in version.get('switch_num', {})}
+        number = next(number for number in range(1, len(used) + 2) if number not in used)
+        version.setdefault('switch_num', {}).setdefault(str(number), {}).update(active)
+
+    # genie copies the only license package to the top level keys for backward compatibility.
+    packages = version.get('license_package')
+    if packages and len(packages) == 1:
+        package = next(iter(packages.values()))
+        version.setdefault('license_level', package.get('license_level'))
+        version.setdefault('license_type', package.get('license_type'))
+        version.setdefault('next_reload_license_level', package.get('next_reload_license_level'))
+    return {'version': version} if version else {}
+
+
+FAST_PARSERS = {
+    "show interfaces status": fast_interfaces_status,
+    "show ip interface brief": fast_ip_interface_brief,
+    "show version": fast_version,
+    "show ip arp": fast_ip_arp,
+    "show mac address-table": fast_mac_address_table,
+}
+
+
+def fast_parse(command, output):
+    """Parses raw output with the fast parser of the command, falling back to genie for commands without one.
+    Returns [] when nothing could be parsed, like genie_parse."""
+    parser = FAST_PARSERS.get(command)
+    if parser is None:
+        return genie_parse(command, output)
+    return parser(output) or []
+
+
+
+_JSON_WHITESPACE = " \t\r\n"
+
+
+def iter_json_array(chunks):
+    """
+    Incrementally decodes a top level JSON array from an iterable of bytes chunks (e.g. a streamed HTTP
+    body) and yields its elements one at a time. Only the undecoded tail of the body is buffered, so
+    a large VCO response is never held as bytes, text and objects at the same time.
+    Raises ValueError when the body is not a JSON array.
+    """
+    import codecs
+    import json
+
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    started = False
+    chunks = iter(chunks)
+    eof = False
+    while True:
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            eof = True
+            chunk = b""
+        buffer = buffer[position:] + text_decoder.decode(chunk, final=eof)
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in _JSON_WHITESPACE:
+                position += 1
+            if position == len(buffer):
+                break
+            if not started:
+                if buffer[position] != "[":
+                    if not eof:
+                        # Not an array, read the whole body to report what it is.
+                        break
+                    raise ValueError(f"Expected a JSON array, got: {buffer[position:position + 200]}")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == ",":
+                position += 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                break
+            if end == len(buffer) and not eof:
+                # A number cut by the chunk boundary decodes fine but short, wait for the next chunk.
+                break
+            position = end
+            yield element
+        if eof:
+            raise ValueError("Truncated JSON array")
@@ -0,0 +1,236 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import heapq
+import itertools
+import json
+import random
+import threading
+import time
+
+
+def result_digest(result):
+    """Digest of a get_* result used to tell whether the polled data changed."""
+    if isinstance(result, str):
+        data = result.encode()
+    else:
+        data = json.dumps(result, sort_keys=True, default=str).encode()
+    return hashlib.sha1(data).hexdigest()
+
+
+class PollJob:
+    """
+    One recurring call of a get_* method on one NikeCiscoDevice or NikeVcoDevice.
+    The current interval moves between min_interval and max_interval: it is multiplied by the scheduler's
+    backoff every time the result did not change and by its speedup every time it did.
+
+    Attributes:
+        target: Device or orchestrator the method is called on.
+        method(Str): Name of the method, e.g. "get_interface_status".
+        interval(Float): Seconds between two polls right now.
+        priority(Int): Lower runs first when more jobs are due than there are free workers.
+        runs/changes/errors(Int): Counters of the polls so far.
+        last_result: Result of the last successful poll.
+        last_error(Exception): Exception of the last failed poll, None after a success.
+    """
+
+    def __init__(self, target, method, args, kwargs, interval, min_interval, max_interval, priority):
+        self.target = target
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.base_interval = interval
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.priority = priority
+        self.key = getattr(target, "hostname", None) or getattr(target, "vco_url", None) or id(target)
+        self.next_run = 0.0
+        self.digest = None
+        self.runs = 0
+        self.changes = 0
+        self.errors = 0
+        self.last_result = None
+        self.last_error = None
+        self.cancelled = False
+
+    def __repr__(self):
+        return f"PollJob({self.key}, {self.method}, interval={self.interval:.0f}s)"
+
+
+class PollScheduler:
+    """
+    Adaptive polling scheduler for NikeCiscoDevice and NikeVcoDevice collections.
+    Every job has its own interval with jitter, so polls of many devices spread out instead of hitting TACACS and
+    the orchestrator at the same second. A global worker limit and a per-device limit bound the load, due jobs
+    run in priority order, and jobs whose result keeps coming back unchanged back off up to their max_interval
+    while jobs whose result changes poll more often, down to their min_interval.
+
+    Usage:
+    scheduler = PollScheduler(workers=32, on_result=lambda job, result, error: sink.write(job.key, job.method, result))
+    for device in devices:
+        scheduler.add(device, "get_interface_status", "textfsm", interval=300, priority=0)
+        scheduler.add(device, "get_licence_status", interval=3600, max_interval=86400, priority=9)
+    scheduler.add(vco, "getEdgeStatus", "NER0502D01", interval=60)
+    scheduler.run()           # or scheduler.start() ... scheduler.stop()
+
+    Attributes:
+        workers(Int): Global limit of polls running at the same time.
+        per_device(Int): Limit of polls running at the same time against one device (or orchestrator).
+        jitter(Float): Every interval is randomly stretched or shrunk by up to this fraction.
+        backoff(Float): Interval multiplier after an unchanged result.
+        speedup(Float): Interval multiplier after a changed result.
+        on_result(Callable): on_result(job, result, error) called from the worker after every poll.
+    """
+
+    def __init__(self, workers=16, per_device=1, jitter=0.1, backoff=1.5, speedup=0.5, on_result=None):
+        self.workers = workers
+        self.per_device = per_device
+        self.jitter = jitter
+        self.backoff = backoff
+        self.speedup = speedup
+        self.on_result = on_result
+        self.jobs = []
+        self._limits = {}
+        self._timeline = []
+        self._ready = []
+        self._running = {}
+        self._running_total = 0
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _jittered(self, interval):
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def add(self, target, method, *args, interval=300, min_interval=None, max_interval=None, priority=5, **kwargs):
+        """This method schedules target.method(*args, **kwargs) every interval seconds and returns its PollJob.
+        min_interval/max_interval default to a quarter and eight times the interval. The first poll is spread
+        over the first jitter * interval seconds."""
+        if not callable(getattr(target, method, None)):
+            raise AttributeError(f"{type(target).__name__} has no method '{method}'")
+        job = PollJob(target, method, args, kwargs, interval,
+                      interval / 4 if min_interval is None else min_interval,
+                      interval * 8 if max_interval is None else max_interval, priority)
+        job.next_run = time.monotonic() + random.uniform(0, interval * self.jitter)
+        with self._lock:
+            self.jobs.append(job)
+            heapq.heappush(self._timeline, (job.next_run, next(self._sequence), job))
+        self._wakeup.set()
+        return job
+
+    def remove(self, job):
+        with self._lock:
+            job.cancelled = True
+            self.jobs.remove(job)
+
+    def set_limit(self, target, limit):
+        """Overrides per_device for one target, e.g. a NikeVcoDevice with a pool of 10 connections."""
+        key = getattr(target, "hostname", None) or getattr(target, "vco_url", None) or id(target)
+        with self._lock:
+            self._limits[key] = limit
+        self._wakeup.set()
+
+    def _poll(self, job):
+        result, error = None, None
+        try:
+            result = getattr(job.target, job.method)(*job.args, **job.kwargs)
+        except Exception as exception:
+            error = exception
+        self._finish(job, result, error)
+
+    def _finish(self, job, result, error):
+        job.runs += 1
+        if error is not None:
+            # Keep the interval on errors, the retry is not a sign of (in)activity.
+            job.errors += 1
+            job.last_error = error
+        else:
+            digest = result_digest(result)
+            if job.digest is not None and digest != job.digest:
+                job.changes += 1
+                job.interval = max(job.min_interval, job.interval * self.speedup)
+            elif job.digest is not None:
+                job.interval = min(job.max_interval, job.interval * self.backoff)
+            job.digest = digest
+            job.last_result = result
+            job.last_error = None
+        if self.on_result is not None:
+            try:
+                self.on_result(job, result, error)
+            except Exception:
+                pass
+
+        with self._lock:
+            self._running[job.key] -= 1
+            self._running_total -= 1
+            if not job.cancelled:
+                job.next_run = time.monotonic() + self._jittered(job.interval)
+                heapq.heappush(self._timeline, (job.next_run, next(self._sequence), job))
+        self._wakeup.set()
+
+    def _dispatch(self, executor):
+        """Starts the due jobs the limits allow and returns the seconds until the next job is due."""
+        now = time.monotonic()
+        with self._lock:
+            while self._timeline and self._timeline[0][0] <= now:
+                _, sequence, job = heapq.heappop(self._timeline)
+                if not job.cancelled:
+                    heapq.heappush(self._ready, (job.priority, job.next_run, sequence, job))
+            blocked = []
+            while self._ready and self._running_total < self.workers:
+                entry = heapq.heappop(self._ready)
+                job = entry[3]
+                if job.cancelled:
+                    continue
+                if self._running.get(job.key, 0) >= self._limits.get(job.key, self.per_device):
+                    # The device is busy, the job waits in the ready queue for a slot of that device.
+                    blocked.append(entry)
+                    continue
+                self._running[job.key] = self._running.get(job.key, 0) + 1
+                self._running_total += 1
+                executor.submit(self._poll, job)
+            for entry in blocked:
+                heapq.heappush(self._ready, entry)
+            # Jobs blocked by a busy device are started when its poll finishes (_finish sets the wakeup), the
+            # timeline deadline still applies so the other devices keep being polled in the meantime.
+            return max(0.0, self._timeline[0][0] - now) if self._timeline else None
+
+    def run(self, duration=None):
+        """This method runs the scheduler in the calling thread until stop() is called or for duration seconds."""
+        deadline = None if duration is None else time.monotonic() + duration
+        self._stopped.clear()
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="poll")
+        try:
+            while not self._stopped.is_set():
+                self._wakeup.clear()
+                wait = self._dispatch(executor)
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._wakeup.wait(wait)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def start(self):
+        """This method runs the scheduler in a background thread."""
+        self._thread = threading.Thread(target=self.run, name="poll-scheduler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        """{(key, method): {'interval', 'runs', 'changes', 'errors'}} of every job."""
+        with self._lock:
+            return {(job.key, job.method): {'interval': job.interval, 'runs': job.runs, 'changes': job.changes,
+                                             'errors': job.errors}
+                    for job in self.jobs}
@@ -0,0 +1,501 @@
+from collections import namedtuple
+import difflib
+import gzip
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# Lines of 'show running-config' that change without any configuration change.
+_VOLATILE_CONFIG_LINES = re.compile(
+    r'^(Building configuration\.\.\.|Current configuration\s*:.*|! Last configuration change at.*|'
+    r'! NVRAM config last updated at.*|! No configuration change since last restart|ntp clock-period \d+)\s*$'
+)
+
+ConfigBackup = namedtuple("ConfigBackup", ["host", "changed", "digest", "previous_digest", "diff"])
+
+
+def normalize_config(config):
+    """Strips the volatile header lines so unchanged configurations hash to the same digest."""
+    return "\n".join(line.rstrip() for line in config.splitlines()
+                     if not _VOLATILE_CONFIG_LINES.match(line.strip())).strip() + "\n"
+
+
+def _section_of(lines):
+    """Maps every line number to the top level section (parent line) it belongs to."""
+    sections = []
+    current = None
+    for line in lines:
+        if line and not line[0].isspace() and line != "!":
+            current = line
+        sections.append(current if line[:1].isspace() else line)
+    return sections
+
+
+def config_diff(old, new):
+    """
+    Structured diff between two running configurations.
+
+    Returns a dict with:
+        added/removed: Changed lines.
+        sections: {top level line: {'added': [...], 'removed': [...]}} so a change under
+                  'interface GigabitEthernet1/0/1' is reported against that interface.
+        unified: Unified diff text.
+    """
+    old_lines = normalize_config(old).splitlines()
+    new_lines = normalize_config(new).splitlines()
+    old_sections = _section_of(old_lines)
+    new_sections = _section_of(new_lines)
+    diff = {'added': [], 'removed': [], 'sections': {}}
+
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        for index in range(i1, i2):
+            diff['removed'].append(old_lines[index])
+            diff['sections'].setdefault(old_sections[index], {'added': [], 'removed': []})['removed'].append(old_lines[index])
+        for index in range(j1, j2):
+            diff['added'].append(new_lines[index])
+            diff['sections'].setdefault(new_sections[index], {'added': [], 'removed': []})['added'].append(new_lines[index])
+
+    diff['unified'] = "\n".join(difflib.unified_diff(old_lines, new_lines, 'previous', 'current', lineterm=''))
+    return diff
+
+
+class ConfigStore:
+    """
+    Content addressed store of running configurations.
+    Every distinct (normalized) configuration is written once, gzipped, under objects/<sha256>. A small
+    json ref per host records the latest digest, the change indicator it was taken with and its history.
+
+    Usage:
+    store = ConfigStore('/var/backups/nike')
+    device.backup_configuration(store)
+
+    Attributes:
+        directory(Str): Root folder of the store, created if missing.
+        history_size(Int): Number of previous digests kept in every host ref.
+    """
+
+    def __init__(self, directory, history_size=50):
+        self.directory = directory
+        self.history_size = history_size
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "refs"), exist_ok=True)
+
+    def _object_path(self, digest):
+        return os.path.join(self.directory, "objects", digest[:2], digest)
+
+    def _ref_path(self, host):
+        return os.path.join(self.directory, "refs", re.sub(r'[^\w.\-]', '_', host) + ".json")
+
+    @staticmethod
+    def _write_atomic(path, data):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def latest(self, host):
+        """Ref of the last stored configuration of host, None if there is none."""
+        try:
+            with open(self._ref_path(host)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, digest):
+        """Configuration text stored under digest."""
+        with gzip.open(self._object_path(digest), "rt") as f:
+            return f.read()
+
+    def put(self, host, config, indicator=""):
+        """Stores the configuration of host and returns (digest, previous digest)."""
+        normalized = normalize_config(config)
+        digest = hashlib.sha256(normalized.encode()).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._write_atomic(path, gzip.compress(normalized.encode()))
+
+        with self._lock:
+            ref = self.latest(host) or {'host': host, 'digest': None, 'history': []}
+            previous = ref['digest']
+            if previous != digest:
+                ref['history'] = ([{'digest': previous, 'timestamp': ref.get('timestamp')}] + ref['history']
+                                  if previous else ref['history'])[:self.history_size]
+            ref.update(digest=digest, indicator=indicator, timestamp=time.time())
+            self._write_atomic(self._ref_path(host), json.dumps(ref).encode())
+        return digest, previous
+
+    def touch(self, host, indicator):
+        """Records that the configuration of host was checked and found unchanged."""
+        with self._lock:
+            ref = self.latest(host)
+            if ref is not None:
+                ref.update(indicator=indicator, checked=time.time())
+                self._write_atomic(self._ref_path(host), json.dumps(ref).encode())
+
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    host TEXT NOT NULL,
+    command TEXT NOT NULL,
+    parsing_module TEXT,
+    timestamp REAL NOT NULL,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_by_host_command ON records (host, command, timestamp);
+"""
+
+
+class ResultSink:
+    """
+    Append-only store of collected command results.
+    Records are buffered and written in batches to newline delimited JSON segments, one
+    {"host", "command", "parsing_module", "timestamp", "result"} object per line. With compress=True every batch is
+    one gzip member, so a segment is still a valid .gz file (zcat segments/*.gz | jq). A small sqlite index maps
+    (host, command, timestamp) to the segment, offset and line of every record, so reading the latest result of
+    a host is one seek and one batch decompression instead of a scan of every file.
+
+    Usage:
+    with ResultSink('/var/lib/nike/results') as sink:
+        device = NikeCiscoDevice('ip address/hostname', 'username', 'password', sink=sink)
+        device.get_os_version('textfsm')
+    sink.latest('ip address/hostname', 'show version')['result']
+
+    Attributes:
+        directory(Str): Root folder of the segments and the index, created if missing.
+        batch_size(Int): Buffered records that trigger a flush.
+        flush_interval(Float): Seconds after which a write flushes the buffer even if the batch is not full.
+        compress(Bool): gzip every batch.
+        segment_bytes(Int): Size after which the next batch starts a new segment file.
+    """
+
+    def __init__(self, directory, batch_size=500, flush_interval=5.0, compress=True, segment_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compress = compress
+        self.segment_bytes = segment_bytes
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, "segments"), exist_ok=True)
+        self._index = sqlite3.connect(os.path.join(directory, "index.sqlite"), check_same_thread=False)
+        self._index.executescript(_INDEX_SCHEMA)
+        self._segment = self._last_segment_number()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _last_segment_number(self):
+        numbers = [int(name.split(".")[0]) for name in os.listdir(os.path.join(self.directory, "segments"))
+                   if name.split(".")[0].isdigit()]
+        return max(numbers, default=0)
+
+    def _segment_name(self):
+        return f"{self._segment:06d}.ndjson" + (".gz" if self.compress else "")
+
+    def write(self, host, command, result, parsing_module=None, timestamp=None):
+        """Buffers one result, flushing the buffer when the batch is full or flush_interval has passed."""
+        record = {"host": host, "command": command, "parsing_module": parsing_module,
+                  "timestamp": time.time() if timestamp is None else timestamp, "result": result}
+        with self._lock:
+            self._buffer.append(record)
+            due = (len(self._buffer) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered records as one batch and indexes them."""
+        with self._lock:
+            records, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+            if not records:
+                return
+            lines = [json.dumps(record, default=str, separators=(",", ":")).encode() + b"\n" for record in records]
+            segment = self._segment_name()
+            with open(os.path.join(self.directory, "segments", segment), "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                if self.compress:
+                    member = gzip.compress(b"".join(lines))
+                    f.write(member)
+                    locations = [(offset, len(member), line) for line in range(len(lines))]
+                    end = offset + len(member)
+                else:
+                    f.write(b"".join(lines))
+                    locations = []
+                    for line in lines:
+                        locations.append((offset, len(line), 0))
+                        offset += len(line)
+                    end = offset
+            # The data is on disk before the index points at it, so a crash can only lose index entries.
+            self._index.executemany(
+                "INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(record["host"], record["command"], record["parsing_module"], record["timestamp"], segment) + location
+                 for record, location in zip(records, locations)])
+            self._index.commit()
+            if end >= self.segment_bytes:
+                self._segment += 1
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._index.close()
+
+    def _read(self, segment, offset, length, line, members=None):
+        key = (segment, offset)
+        data = members.get(key) if members is not None else None
+        if data is None:
+            with open(os.path.join(self.directory, "segments", segment), "rb") as f:
+                f.seek(offset)
+                data = f.read(length)
+            if segment.endswith(".gz"):
+                data = gzip.decompress(data).split(b"\n")
+            else:
+                data = [data]
+            if members is not None:
+                members.clear()
+                members[key] = data
+        return json.loads(data[line])
+
+    def latest(self, host, command, parsing_module=None):
+        """Newest record of command on host (optionally for one parsing module), None if there is none."""
+        with self._lock:
+            for record in reversed(self._buffer):
+                if (record["host"] == host and record["command"] == command
+                        and parsing_module in (None, record["parsing_module"])):
+                    return record
+            sql = "SELECT segment, offset, length, line FROM records WHERE host = ? AND command = ?"
+            params = [host, command]
+            if parsing_module is not None:
+                sql += " AND parsing_module = ?"
+                params.append(parsing_module)
+            row = self._index.execute(sql + " ORDER BY timestamp DESC, rowid DESC LIMIT 1", params).fetchone()
+        return None if row is None else self._read(*row)
+
+    def query(self, host=None, command=None, since=None, until=None):
+        """Yields the flushed records matching every given filter, oldest first."""
+        sql = "SELECT segment, offset, length, line FROM records"
+        conditions, params = [], []
+        for condition, value in (("host = ?", host), ("command = ?", command),
+                                 ("timestamp >= ?", since), ("timestamp <= ?", until)):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        with self._lock:
+            rows = self._index.execute(sql + " ORDER BY timestamp, rowid", params).fetchall()
+        # Consecutive records of one batch share a single decompression.
+        members = {}
+        for row in rows:
+            yield self._read(*row, members=members)
+
+
+# Natural key of the rows of a parsed (textfsm) table, one tuple of accepted field names per key component,
+# because the ntc-templates field names changed between releases (e.g. 'address' became 'ip_address').
+NATURAL_KEYS = {
+    "show interfaces status": (("port",),),
+    "show ip interface brief": (("interface", "intf"),),
+    "show ip arp": (("ip_address", "address"),),
+    "show mac address-table": (("destination_address", "mac_address"), ("vlan_id", "vlan")),
+    "show etherchannel summary": (("po_name", "bundle_name"),),
+}
+
+_SNAPSHOT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS baselines (
+    id INTEGER PRIMARY KEY,
+    host TEXT NOT NULL,
+    command TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    rows BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS baselines_by_host_command ON baselines (host, command, timestamp);
+CREATE TABLE IF NOT EXISTS deltas (
+    id INTEGER PRIMARY KEY,
+    host TEXT NOT NULL,
+    command TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    key TEXT NOT NULL,
+    row TEXT
+);
+CREATE INDEX IF NOT EXISTS deltas_by_host_command ON deltas (host, command, timestamp);
+"""
+
+SnapshotChanges = namedtuple("SnapshotChanges", ["added", "removed", "changed"])
+
+
+def _canonical(row):
+    return json.dumps(row, sort_keys=True, default=str, separators=(",", ":"))
+
+
+class SnapshotStore:
+    """
+    Time series of polled tables (interfaces, ARP, MAC, etherchannels ...) stored as one full baseline per
+    device and command followed by row level deltas keyed on the natural key of every row (NATURAL_KEYS).
+    A poll where nothing changed writes nothing, so storage and write I/O follow the churn, not the table size.
+    A new baseline is written once the deltas since the last one outgrow rebase_ratio times the table, which
+    bounds the replay work of a point in time reconstruction.
+
+    Usage:
+    store = SnapshotStore('/var/lib/nike/snapshots')
+    store.record(device.hostname, "show ip arp", device.get_arp_info('textfsm'))
+    store.snapshot(device.hostname, "show ip arp", at=time.time() - 3600)
+    store.changes(device.hostname, "show ip arp", t1, t2).added
+
+    Attributes:
+        directory(Str): Folder holding snapshots.sqlite, created if missing.
+        rebase_ratio(Float): Delta rows since the last baseline, relative to the table size, that trigger a new baseline.
+        natural_keys(Dict): Extra or overriding {command: ((field names), ...)} entries for NATURAL_KEYS.
+    """
+
+    def __init__(self, directory, rebase_ratio=1.0, natural_keys=None):
+        self.directory = directory
+        self.rebase_ratio = rebase_ratio
+        self.natural_keys = dict(NATURAL_KEYS, **(natural_keys or {}))
+        self._lock = threading.Lock()
+        # {(host, command): ({key: canonical row}, delta rows since the baseline)} of the last recorded poll.
+        self._current = {}
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, "snapshots.sqlite"), check_same_thread=False)
+        self._db.executescript(_SNAPSHOT_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def natural_key(self, command, row):
+        """Key of row, the canonical row itself for commands without a NATURAL_KEYS entry."""
+        fields = self.natural_keys.get(command)
+        if fields is None:
+            return _canonical(row)
+        values = []
+        for names in fields:
+            value = next((row[name] for name in names if name in row), None)
+            values.append(','.join(value) if isinstance(value, list) else value)
+        return json.dumps(values)
+
+    def _keyed(self, command, rows):
+        return {self.natural_key(command, row): _canonical(row) for row in rows}
+
+    def _baseline(self, host, command, at):
+        return self._db.execute(
+            "SELECT timestamp, rows FROM baselines WHERE host = ? AND command = ? AND timestamp <= ? "
+            "ORDER BY timestamp DESC, id DESC LIMIT 1", (host, command, at)).fetchone()
+
+    def _final_deltas(self, host, command, after, until):
+        # Last delta of every key in (after, until], sqlite returns the row of MAX(id) for the bare columns.
+        return self._db.execute(
+            "SELECT key, row, MAX(id) FROM deltas WHERE host = ? AND command = ? AND timestamp > ? AND timestamp <= ? "
+            "GROUP BY key", (host, command, after, until)).fetchall()
+
+    def _state(self, host, command, at):
+        """({key: canonical row} at time at, delta rows replayed), ({}, 0) before the first poll."""
+        baseline = self._baseline(host, command, at)
+        if baseline is None:
+            return {}, 0
+        timestamp, rows = baseline
+        state = json.loads(gzip.decompress(rows))
+        deltas = self._final_deltas(host, command, timestamp, at)
+        for key, row, _ in deltas:
+            if row is None:
+                state.pop(key, None)
+            else:
+                state[key] = row
+        return state, len(deltas)
+
+    def record(self, host, command, rows, timestamp=None):
+        """Records one poll of a parsed table (list of dicts) and returns its SnapshotChanges against the previous poll."""
+        timestamp = time.time() if timestamp is None else timestamp
+        new = self._keyed(command, rows)
+        with self._lock:
+            current = self._current.get((host, command))
+            if current is None:
+                current = self._state(host, command, float("inf"))
+            old, since_baseline = current
+            if not old and self._baseline(host, command, float("inf")) is None:
+                self._write_baseline(host, command, timestamp, new)
+                self._current[(host, command)] = (new, 0)
+                return SnapshotChanges([json.loads(row) for row in new.values()], [], [])
+
+            deltas = [(key, row) for key, row in new.items() if old.get(key) != row]
+            deltas += [(key, None) for key in old.keys() - new.keys()]
+            if deltas:
+                self._db.executemany("INSERT INTO deltas (host, command, timestamp, key, row) VALUES (?, ?, ?, ?, ?)",
+                                     [(host, command, timestamp, key, row) for key, row in deltas])
+                since_baseline += len(deltas)
+                if since_baseline > self.rebase_ratio * max(len(new), 1):
+                    self._write_baseline(host, command, timestamp, new)
+                    since_baseline = 0
+                self._db.commit()
+            self._current[(host, command)] = (new, since_baseline)
+        return self._changes(old, dict(deltas))
+
+    def _write_baseline(self, host, command, timestamp, state):
+        self._db.execute("INSERT INTO baselines (host, command, timestamp, rows) VALUES (?, ?, ?, ?)",
+                         (host, command, timestamp, gzip.compress(json.dumps(state).encode())))
+        self._db.commit()
+
+    @staticmethod
+    def _changes(before, after):
+        """SnapshotChanges between the rows of before and the touched keys of after (None meaning removed)."""
+        added, removed, changed = [], [], []
+        for key, row in after.items():
+            old = before.get(key)
+            if row is None:
+                if old is not None:
+                    removed.append(json.loads(old))
+            elif old is None:
+                added.append(json.loads(row))
+            elif old != row:
+                changed.append((json.loads(old), json.loads(row)))
+        return SnapshotChanges(added, removed, changed)
+
+    def snapshot(self, host, command, at=None):
+        """Rows of the table as they were at time at (default now), [] before the first poll."""
+        with self._lock:
+            state, _ = self._state(host, command, time.time() if at is None else at)
+        return [json.loads(row) for row in state.values()]
+
+    def changes(self, host, command, since, until=None):
+        """SnapshotChanges(added, removed, changed) between time since and time until (default now).
+        changed holds (old row, new row) pairs. Only the rows touched in between are decoded."""
+        until = time.time() if until is None else until
+        with self._lock:
+            before, _ = self._state(host, command, since)
+            first = self._baseline(host, command, since) is None
+            if first:
+                # The first poll happened in between, its baseline is not in the deltas.
+                after, _ = self._state(host, command, until)
+                after.update({key: None for key in before.keys() - after.keys()})
+            else:
+                after = {key: row for key, row, _ in self._final_deltas(host, command, since, until)}
+        return self._changes(before, after)
+
+    def history(self, host, command, row_key):
+        """[(timestamp, row or None when removed)] of one row, row_key being its natural key values, e.g. ('10.0.0.1',)."""
+        key = json.dumps(list(row_key))
+        with self._lock:
+            rows = self._db.execute("SELECT timestamp, row FROM deltas WHERE host = ? AND command = ? AND key = ? "
+                                    "ORDER BY timestamp, id", (host, command, key)).fetchall()
+        return [(timestamp, None if row is None else json.loads(row)) for timestamp, row in rows]
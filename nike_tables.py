@@ -0,0 +1,246 @@
+from array import array
+import ipaddress
+import threading
+
+MISSING = -1
+
+
+class StringPool:
+    """
+    Process wide string intern table. Every distinct interface name, vlan, status etc. is stored once
+    and tables only keep its 32 bit code.
+    """
+
+    def __init__(self):
+        self._codes = {}
+        self.values = []
+        self._lock = threading.Lock()
+
+    def encode(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(value)
+                    self._codes[value] = code
+        return code
+
+    def lookup(self, value):
+        """Code of an already interned value, None if the value was never seen."""
+        return self._codes.get(value)
+
+    def decode(self, code):
+        return self.values[code]
+
+
+STRINGS = StringPool()
+
+
+def mac_to_int(mac):
+    digits = mac.replace('.', '').replace(':', '').replace('-', '')
+    try:
+        return int(digits, 16) if len(digits) == 12 else MISSING
+    except ValueError:
+        return MISSING
+
+
+def int_to_mac(value):
+    if value == MISSING:
+        return None
+    digits = f"{value:012x}"
+    return f"{digits[0:4]}.{digits[4:8]}.{digits[8:12]}"
+
+
+def ipv4_to_int(ip):
+    try:
+        return int(ipaddress.IPv4Address(ip))
+    except ValueError:
+        return MISSING
+
+
+def int_to_ipv4(value):
+    return None if value == MISSING else str(ipaddress.IPv4Address(value))
+
+
+# kind: (array typecode, encode, decode)
+_KINDS = {
+    'str': ('I', STRINGS.encode, STRINGS.decode),
+    'mac': ('q', mac_to_int, int_to_mac),
+    'ipv4': ('q', ipv4_to_int, int_to_ipv4),
+}
+
+
+class Row:
+    """Lightweight view of one row of a ColumnarTable, values are decoded on access."""
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, column):
+        return self._table.value(column, self._index)
+
+    def __getattr__(self, column):
+        try:
+            return self._table.value(column, self._index)
+        except KeyError:
+            raise AttributeError(column) from None
+
+    def as_dict(self):
+        return {column: self._table.value(column, self._index) for column in self._table.COLUMNS}
+
+    def __repr__(self):
+        return f"{type(self._table).__name__}.Row({self.as_dict()})"
+
+
+class ColumnarTable:
+    """
+    Column store for parsed show command tables. Strings are interned into STRINGS and kept as 32 bit
+    codes, MAC and IPv4 addresses are packed into 64 bit integers (-1 when missing). Every column is a
+    contiguous array.array, so it can be handed to NumPy without copying.
+
+    Subclasses declare COLUMNS as {column: kind} and ALIASES as {column: (textfsm field names)}.
+    """
+    COLUMNS = {}
+    ALIASES = {}
+
+    def __init__(self):
+        self._columns = {column: array(_KINDS[kind][0]) for column, kind in self.COLUMNS.items()}
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Builds the table from textfsm parsed rows (list of dicts)."""
+        table = cls()
+        for row in rows:
+            table.append(row)
+        return table
+
+    def _field(self, row, column):
+        for name in self.ALIASES.get(column, (column,)):
+            if name in row:
+                value = row[name]
+                return ','.join(value) if isinstance(value, list) else value
+        return ''
+
+    def append(self, row):
+        for column, kind in self.COLUMNS.items():
+            self._columns[column].append(_KINDS[kind][1](self._field(row, column)))
+
+    def __len__(self):
+        return len(next(iter(self._columns.values()))) if self._columns else 0
+
+    def __iter__(self):
+        return (Row(self, index) for index in range(len(self)))
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        return Row(self, index % len(self))
+
+    def value(self, column, index):
+        return _KINDS[self.COLUMNS[column]][2](self._columns[column][index])
+
+    def column(self, column):
+        """Decoded values of one column."""
+        decode = _KINDS[self.COLUMNS[column]][2]
+        return [decode(value) for value in self._columns[column]]
+
+    def _encoded_criteria(self, column, wanted):
+        kind = self.COLUMNS[column]
+        values = wanted if isinstance(wanted, (list, tuple, set, frozenset)) else (wanted,)
+        if kind == 'str':
+            return {code for code in (STRINGS.lookup(value) for value in values) if code is not None}
+        return {_KINDS[kind][1](value) for value in values}
+
+    def indices(self, **criteria):
+        """Row numbers whose columns equal the given values, a list/set value matches any of its items."""
+        selected = range(len(self))
+        for column, wanted in criteria.items():
+            codes = self._encoded_criteria(column, wanted)
+            data = self._columns[column]
+            selected = [index for index in selected if data[index] in codes]
+        return list(selected)
+
+    def where(self, **criteria):
+        """Row views matching the criteria, e.g. table.where(vlan_id='10')."""
+        return [Row(self, index) for index in self.indices(**criteria)]
+
+    def to_numpy(self):
+        """Dict of column to numpy array sharing memory with the table. String columns hold STRINGS codes."""
+        import numpy
+        return {column: numpy.frombuffer(data, dtype=numpy.dtype(data.typecode)) if len(data) else
+                numpy.array([], dtype=numpy.dtype(data.typecode))
+                for column, data in self._columns.items()}
+
+    def to_arrow(self):
+        """pyarrow.Table of the table. The MAC and IPv4 columns share memory with the table, string columns
+        become dictionary arrays holding only the strings that column uses."""
+        import pyarrow
+        import pyarrow.compute
+        arrays = {}
+        for column, data in self._columns.items():
+            kind = self.COLUMNS[column]
+            arrow_type = pyarrow.uint32() if kind == 'str' else pyarrow.int64()
+            values = pyarrow.Array.from_buffers(arrow_type, len(data), [None, pyarrow.py_buffer(data)])
+            if kind == 'str':
+                # Remap the process wide STRINGS codes to positions in a dictionary of the used codes only.
+                codes = pyarrow.compute.unique(values)
+                dictionary = pyarrow.array([STRINGS.values[code] for code in codes.to_pylist()],
+                                           type=pyarrow.string())
+                values = pyarrow.DictionaryArray.from_arrays(pyarrow.compute.index_in(values, value_set=codes),
+                                                             dictionary)
+            arrays[column] = values
+        return pyarrow.table(arrays)
+
+    @property
+    def nbytes(self):
+        return sum(data.itemsize * len(data) for data in self._columns.values())
+
+
+class ArpTable(ColumnarTable):
+    COLUMNS = {'protocol': 'str', 'ip_address': 'ipv4', 'age': 'str', 'mac_address': 'mac', 'type': 'str',
+               'interface': 'str'}
+    ALIASES = {'ip_address': ('ip_address', 'address'), 'mac_address': ('mac_address', 'mac')}
+
+
+class MacAddressTable(ColumnarTable):
+    """A MAC learned on several ports (multicast, flooded entries) gets one row per port."""
+    COLUMNS = {'destination_address': 'mac', 'type': 'str', 'vlan_id': 'str', 'destination_port': 'str'}
+    ALIASES = {'vlan_id': ('vlan_id', 'vlan')}
+
+    def append(self, row):
+        ports = row.get('destination_port', '')
+        if isinstance(ports, str):
+            ports = [port.strip() for port in ports.split(',')]
+        for port in ports or ['']:
+            super().append(dict(row, destination_port=port))
+
+    def macs_on_port(self, port):
+        """MAC addresses learned on a port, e.g. a trunk."""
+        return [row.destination_address for row in self.where(destination_port=port)]
+
+
+class InterfaceStatusTable(ColumnarTable):
+    COLUMNS = {'port': 'str', 'name': 'str', 'status': 'str', 'vlan_id': 'str', 'duplex': 'str', 'speed': 'str',
+               'type': 'str'}
+    ALIASES = {'vlan_id': ('vlan_id', 'vlan')}
+
+    def ports_in_vlan(self, vlan):
+        return [row.port for row in self.where(vlan_id=str(vlan))]
+
+
+class InterfaceBriefTable(ColumnarTable):
+    COLUMNS = {'interface': 'str', 'ip_address': 'ipv4', 'status': 'str', 'proto': 'str'}
+    ALIASES = {'interface': ('interface', 'intf'), 'ip_address': ('ip_address', 'ipaddr'),
+               'proto': ('proto', 'protocol')}
+
+
+COLUMNAR_TABLES = {
+    "show ip arp": ArpTable,
+    "show mac address-table": MacAddressTable,
+    "show interfaces status": InterfaceStatusTable,
+    "show ip interface brief": InterfaceBriefTable,
+}
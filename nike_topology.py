@@ -0,0 +1,378 @@
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import json
+import threading
+import time
+
+from nike_fleet import NikeFleet
+
+CDP_COMMAND = "show cdp neighbors detail"
+VERSION_COMMAND = "show version"
+
+Neighbor = namedtuple("Neighbor", ["local_port", "name", "ip", "platform", "remote_port", "capabilities", "version"])
+
+# textfsm field names of the ntc-templates releases in use, first match wins.
+_CDP_FIELDS = {
+    "name": ("neighbor_name", "destination_host"),
+    "ip": ("mgmt_address", "management_ip", "management_address", "interface_ip"),
+    "platform": ("platform",),
+    "remote_port": ("neighbor_interface", "remote_port"),
+    "local_port": ("local_interface", "local_port"),
+    "capabilities": ("capabilities",),
+    "version": ("neighbor_description", "software_version"),
+}
+
+
+def _first(row, names):
+    for name in names:
+        value = row.get(name)
+        if value:
+            return value
+    return ""
+
+
+def parse_neighbors(parsed, parsing_module='textfsm'):
+    """Turns a textfsm or genie parsed 'show cdp neighbors detail' into a list of Neighbor."""
+    if parsing_module == 'genie':
+        neighbors = []
+        for entry in (parsed or {}).get('index', {}).values():
+            addresses = entry.get('management_addresses') or entry.get('entry_addresses') or {}
+            neighbors.append(Neighbor(entry.get('local_interface', ''), entry.get('device_id', ''),
+                                      next(iter(addresses), ''), entry.get('platform', ''),
+                                      entry.get('port_id', ''), entry.get('capabilities', ''),
+                                      entry.get('software_version', '')))
+        return neighbors
+    return [Neighbor(**{field: _first(row, names) for field, names in _CDP_FIELDS.items()}) for row in parsed or []]
+
+
+def parse_identity(parsed, parsing_module='textfsm'):
+    """(hostname, chassis serial, platform, version) from a textfsm or genie parsed 'show version'."""
+    if parsing_module == 'genie':
+        version = (parsed or {}).get('version', {})
+        return (version.get('hostname', ''), version.get('chassis_sn', ''), version.get('chassis', ''),
+                version.get('version', ''))
+    row = parsed[0] if parsed else {}
+    serial = row.get('serial') or ['']
+    hardware = row.get('hardware') or ['']
+    return (row.get('hostname', ''), serial[0] if isinstance(serial, list) else serial,
+            hardware[0] if isinstance(hardware, list) else hardware, row.get('version', ''))
+
+
+def follow_network_devices(neighbor):
+    """Default crawl filter: switches and routers, but not access points or IP phones."""
+    capabilities = neighbor.capabilities.split()
+    return (bool(neighbor.ip) and ('Switch' in capabilities or 'Router' in capabilities)
+            and 'Trans-Bridge' not in capabilities and 'Phone' not in capabilities)
+
+
+class TopologyGraph:
+    """
+    In-memory L2/L3 adjacency graph built from CDP.
+    Devices are identified by chassis serial once they were crawled, by management IP before that, and every
+    management IP and serial seen for a device points to the same node, so a device is stored (and crawled) once.
+
+    Usage:
+    graph = TopologyGraph.load('topology.json')
+    graph.neighbors(graph.node_for('10.20.0.1'))
+    graph.save('topology.json')
+
+    Attributes:
+        nodes(Dict): {node id: {'hostname', 'ips', 'serial', 'platform', 'version', 'crawled_at', 'error'}}
+        links(Dict): {node id: {local port: (neighbor node id, remote port)}}, change it through set_links
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.links = {}
+        # {node id: ids of the nodes having a link to it}, so re-keying a node only touches the links to it.
+        self._incoming = {}
+        self._by_ip = {}
+        self._by_serial = {}
+        self._lock = threading.RLock()
+
+    def node_for(self, ip=None, serial=None):
+        """Node id known for a management IP or a serial, None if the device was never seen."""
+        with self._lock:
+            return self._by_serial.get(serial) or self._by_ip.get(ip)
+
+    def _index_links(self, node_id):
+        for neighbor, _ in self.links.get(node_id, {}).values():
+            self._incoming.setdefault(neighbor, set()).add(node_id)
+
+    def _unindex_links(self, node_id):
+        for neighbor, _ in self.links.get(node_id, {}).values():
+            sources = self._incoming.get(neighbor)
+            if sources is not None:
+                sources.discard(node_id)
+                if not sources:
+                    del self._incoming[neighbor]
+
+    def _repoint(self, old, new):
+        for source in self._incoming.pop(old, ()):
+            ports = self.links.get(source, {})
+            for port, (neighbor, remote_port) in ports.items():
+                if neighbor == old:
+                    ports[port] = (new, remote_port)
+            self._incoming.setdefault(new, set()).add(source)
+
+    def _merge(self, keep, drop):
+        """Folds node drop into node keep, e.g. when a crawl reveals two IPs belong to one serial."""
+        node = self.nodes.pop(drop)
+        kept = self.nodes[keep]
+        kept['ips'] = kept['ips'] + [ip for ip in node['ips'] if ip not in kept['ips']]
+        for ip in node['ips']:
+            self._by_ip[ip] = keep
+        if node['serial']:
+            self._by_serial[node['serial']] = keep
+        self._unindex_links(keep)
+        self._unindex_links(drop)
+        self.links.setdefault(keep, {}).update(self.links.pop(drop, {}))
+        self._index_links(keep)
+        self._repoint(drop, keep)
+
+    def _rename(self, old, new):
+        self.nodes[new] = self.nodes.pop(old)
+        if old in self.links:
+            self._unindex_links(old)
+            self.links[new] = self.links.pop(old)
+            self._index_links(new)
+        for ip in self.nodes[new]['ips']:
+            self._by_ip[ip] = new
+        self._repoint(old, new)
+
+    def add_device(self, ip=None, serial=None, **attributes):
+        """Adds or updates a device and returns its node id. A device without IP and serial is keyed by hostname."""
+        with self._lock:
+            if not ip and not serial:
+                node_id = f"name:{attributes.get('hostname', '')}"
+            else:
+                node_id = self.node_for(ip, serial)
+                by_ip = self._by_ip.get(ip) if ip else None
+                if by_ip is not None and node_id != by_ip:
+                    # The IP was seen before its serial was known, under a node of its own.
+                    self._merge(node_id, by_ip)
+                if serial and node_id is not None and node_id != serial:
+                    # First time the serial is known, re-key the node on it.
+                    self._rename(node_id, serial)
+                    node_id = serial
+                if node_id is None:
+                    node_id = serial or f"ip:{ip}"
+            if node_id not in self.nodes:
+                self.nodes[node_id] = {'hostname': '', 'ips': [], 'serial': '', 'platform': '',
+                                       'version': '', 'crawled_at': None, 'error': None}
+            node = self.nodes[node_id]
+            if ip:
+                if ip not in node['ips']:
+                    node['ips'].append(ip)
+                self._by_ip[ip] = node_id
+            if serial:
+                node['serial'] = serial
+                self._by_serial[serial] = node_id
+            node.update({key: value for key, value in attributes.items() if value is not None})
+            return node_id
+
+    def set_links(self, node_id, links):
+        """Replaces the links of a node with {local port: (neighbor node id, remote port)}."""
+        with self._lock:
+            self._unindex_links(node_id)
+            self.links[node_id] = dict(links)
+            self._index_links(node_id)
+
+    def neighbors(self, node_id):
+        with self._lock:
+            return sorted({neighbor for neighbor, _ in self.links.get(node_id, {}).values()})
+
+    def edges(self):
+        """Undirected links as a sorted list of ((node, port), (node, port)), each link once."""
+        with self._lock:
+            found = set()
+            for node_id, ports in self.links.items():
+                for port, (neighbor, remote_port) in ports.items():
+                    found.add(tuple(sorted(((node_id, port), (neighbor, remote_port)))))
+            return sorted(found)
+
+    def to_dict(self):
+        with self._lock:
+            return {'nodes': json.loads(json.dumps(self.nodes)),
+                    'links': {node_id: {port: list(link) for port, link in ports.items()}
+                              for node_id, ports in self.links.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        graph = cls()
+        for node_id, node in data.get('nodes', {}).items():
+            graph.nodes[node_id] = node
+            for ip in node.get('ips', []):
+                graph._by_ip[ip] = node_id
+            if node.get('serial'):
+                graph._by_serial[node['serial']] = node_id
+        graph.links = {node_id: {port: tuple(link) for port, link in ports.items()}
+                       for node_id, ports in data.get('links', {}).items()}
+        for node_id in graph.links:
+            graph._index_links(node_id)
+        return graph
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    @classmethod
+    def load(cls, path):
+        """Loads a saved graph, an empty one if the file does not exist yet."""
+        try:
+            with open(path) as f:
+                return cls.from_dict(json.load(f))
+        except FileNotFoundError:
+            return cls()
+
+    def to_networkx(self):
+        """networkx.MultiGraph of the topology, edges carry the two port names."""
+        import networkx
+
+        graph = networkx.MultiGraph()
+        with self._lock:
+            for node_id, node in self.nodes.items():
+                graph.add_node(node_id, **node)
+            for (node_a, port_a), (node_b, port_b) in self.edges():
+                graph.add_edge(node_a, node_b, ports={node_a: port_a, node_b: port_b})
+        return graph
+
+
+class TopologyCrawler:
+    """
+    CDP driven topology discovery. Starting from the seed hosts, every device is polled once for
+    'show cdp neighbors detail' and 'show version' over a single session, and the neighbors it reports are
+    added to the frontier, which is worked on by a bounded pool of workers at the same time.
+    Devices are deduplicated by management IP before they are polled and by chassis serial after.
+
+    Passing the graph of a previous run makes the crawl incremental: devices crawled less than refresh_after
+    seconds ago are not polled again, their stored links are used to continue the crawl instead.
+
+    Usage:
+    graph = TopologyGraph.load('topology.json')
+    crawler = TopologyCrawler('username', 'password', graph=graph, workers=64, timeout=30)
+    crawler.crawl(['10.20.0.1'], refresh_after=24 * 3600)
+    graph.save('topology.json')
+
+    Attributes:
+        username(Str): Specify your tacacs Corparate Short login(CSL) username.
+        password(Str): Specify your tacacs Corparate Short login(CSL) password.
+        graph(TopologyGraph): Graph filled by the crawl, a new one by default.
+        workers(Int): Maximum number of devices polled at the same time.
+        max_depth(Int): Maximum number of CDP hops from the seeds, None for no limit.
+        follow(Callable): follow(Neighbor) -> Bool, whether a neighbor is crawled. Default follow_network_devices.
+        parsing_module(Str): 'textfsm' (default) or 'genie'.
+        timeout(Float): Per-device socket, transport and command timeout in seconds.
+        device_options: Optional extra arguments passed to every NikeCiscoDevice.
+    """
+
+    def __init__(self, username, password, graph=None, workers=32, max_depth=None, follow=follow_network_devices,
+                 parsing_module='textfsm', timeout=None, **device_options):
+        self.graph = graph if graph is not None else TopologyGraph()
+        self.workers = workers
+        self.max_depth = max_depth
+        self.follow = follow
+        self.parsing_module = parsing_module
+        self.timeout = timeout
+        self._fleet = NikeFleet([], username, password, **device_options)
+
+    def _poll(self, host):
+        """Returns ((hostname, serial, platform, version), [Neighbor]) of one device."""
+        device = self._fleet.make_device(host, self.timeout)
+        parsed = device.collect([CDP_COMMAND, VERSION_COMMAND], self.parsing_module)
+        return (parse_identity(parsed[VERSION_COMMAND], self.parsing_module),
+                parse_neighbors(parsed[CDP_COMMAND], self.parsing_module))
+
+    def _record(self, host, identity, neighbors):
+        """Stores a polled device and its links, returns the neighbors to follow."""
+        hostname, serial, platform, version = identity
+        graph = self.graph
+        node_id = graph.add_device(host, serial or None, hostname=hostname, platform=platform, version=version,
+                                   crawled_at=time.time())
+        # add_device skips None values, the error of an earlier failed poll is cleared here.
+        graph.nodes[node_id]['error'] = None
+        links = {}
+        for neighbor in neighbors:
+            known = graph.nodes.get(graph.node_for(neighbor.ip or None), {})
+            # The hostname from 'show version' of a crawled neighbor wins over its CDP device id.
+            neighbor_id = graph.add_device(neighbor.ip or None, None,
+                                           hostname=known.get('hostname') or neighbor.name,
+                                           platform=known.get('platform') or neighbor.platform or None)
+            links[neighbor.local_port] = (neighbor_id, neighbor.remote_port)
+        graph.set_links(node_id, links)
+        return node_id, [neighbor for neighbor in neighbors if self.follow(neighbor)]
+
+    def _stored_neighbor_ips(self, node_id, refresh_after):
+        """Management IPs of the followed neighbors of a device crawled less than refresh_after seconds ago,
+        None when the device must be polled again."""
+        node = self.graph.nodes.get(node_id)
+        if refresh_after is None or node is None or not node.get('crawled_at') or node.get('error') or \
+                time.time() - node['crawled_at'] > refresh_after:
+            return None
+        ips = []
+        for neighbor_id, _ in self.graph.links.get(node_id, {}).values():
+            neighbor = self.graph.nodes.get(neighbor_id, {})
+            # Only neighbors the previous run followed (polled or tried to) are followed again.
+            if (neighbor.get('crawled_at') or neighbor.get('error')) and neighbor.get('ips'):
+                ips.append(neighbor['ips'][0])
+        return ips
+
+    def crawl(self, seeds, refresh_after=None):
+        """This method crawls the topology from the seed hosts and returns the updated graph.
+
+        Attributes:
+            seeds(List): Management IPs or hostnames to start from.
+            refresh_after(Float): Seconds after which a device crawled by a previous run is polled again,
+                                  None polls every reached device.
+        """
+        seen_ips = set()
+        seen_nodes = set()
+        polled_nodes = set()
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="topology")
+        running = {}
+
+        def visit(host, depth):
+            # Walks the stored part of the graph breadth first with an explicit queue, a long chain of devices
+            # crawled recently must not hit the recursion limit.
+            queue = deque([(host, depth)])
+            while queue:
+                host, depth = queue.popleft()
+                if host in seen_ips or (self.max_depth is not None and depth > self.max_depth):
+                    continue
+                seen_ips.add(host)
+                # A device already known under another management IP is visited once.
+                node_id = self.graph.node_for(host)
+                if node_id is not None:
+                    if node_id in seen_nodes:
+                        continue
+                    seen_nodes.add(node_id)
+                stored = self._stored_neighbor_ips(node_id, refresh_after)
+                if stored is not None:
+                    queue.extend((ip, depth + 1) for ip in stored)
+                    continue
+                running[executor.submit(self._poll, host)] = (host, depth)
+
+        try:
+            for seed in seeds:
+                visit(seed, 0)
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    host, depth = running.pop(future)
+                    try:
+                        identity, neighbors = future.result()
+                    except Exception as error:
+                        self.graph.add_device(host, None, error=f"{type(error).__name__}: {error}")
+                        continue
+                    duplicate = bool(identity[1]) and self.graph.node_for(serial=identity[1]) in polled_nodes
+                    node_id, to_follow = self._record(host, identity, neighbors)
+                    seen_nodes.add(node_id)
+                    polled_nodes.add(node_id)
+                    if duplicate:
+                        # Same chassis reached over another management IP, its neighbors are already queued.
+                        continue
+                    for neighbor in to_follow:
+                        visit(neighbor.ip, depth + 1)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return self.graph
@@ -1,10 +1,13 @@
 from netmiko import ConnectHandler
 from pprint import pprint
-import json
+
+from nike_storage import ResultSink
+
+HOST = "192.168.178.1"
 
 net_connect = ConnectHandler(
     device_type="cisco_xe",
-    host="192.168.178.1",
+    host=HOST,
     username="jenkins",
     password="jenkins",
 )
@@ -13,9 +16,7 @@ output = net_connect.send_command(
     "show version", use_textfsm=True
 )
 pprint(output)
-data = json.dumps(output)
 
-with open("show_version.txt", "+a") as f:
-    f.writelines(data)
-    f.close()
-    
+# One NDJSON record per run in results/segments, indexed by host, command and timestamp.
+with ResultSink("results") as sink:
+    sink.write(HOST, "show version", output, parsing_module="textfsm")
@@ -0,0 +1,261 @@
+"""
+Shared fixtures. fake_ios replaces scrapli's IOSXEDriver with an in-memory device answering from OUTPUTS and
+fake_vco serves a small VeloCloud Orchestrator REST API on localhost, so the tests run without a network.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+OUTPUTS = {
+    "show version": "Cisco IOS XE Software, Version 17.03.04a\n"
+                    "sw1 uptime is 12 weeks, 3 days, 4 hours, 22 minutes\n"
+                    "Processor board ID FOC2233X0AB",
+    "show interfaces status": "\n"
+                              "Port         Name               Status       Vlan       Duplex  Speed Type \n"
+                              "Gi1/0/1      uplink-core-1      connected    trunk      a-full a-1000 10/100/1000BaseTX\n"
+                              "Gi1/0/2      printer-2f         connected    20         a-full  a-100 10/100/1000BaseTX\n"
+                              "Gi1/0/3                         notconnect   20           auto   auto 10/100/1000BaseTX",
+    "show ip nat translations": "Pro Inside global      Inside local       Outside local      Outside global\n"
+                                "tcp 203.0.113.10:1024  10.20.0.15:51544   8.8.8.8:443        8.8.8.8:443\n"
+                                "tcp 203.0.113.10:1025  10.20.0.16:50122   1.1.1.1:443        1.1.1.1:443\n"
+                                "udp 203.0.113.10:1026  10.30.0.21:53211   8.8.4.4:53         8.8.4.4:53\n"
+                                "--- 203.0.113.20       10.20.0.50         ---                ---",
+    "show mac address-table": "          Mac Address Table\n"
+                              "-------------------------------------------\n"
+                              "\n"
+                              "Vlan    Mac Address       Type        Ports\n"
+                              "----    -----------       --------    -----\n"
+                              " All    0100.0ccc.cccc    STATIC      CPU\n"
+                              "  20    a4bb.6d11.2201    DYNAMIC     Gi1/0/6\n"
+                              "  30    0100.5e00.0001    STATIC      Gi1/0/1, Gi1/0/2\n"
+                              "Total Mac Addresses for this criterion: 3",
+    "show clock": "*10:12:03.123 UTC Mon Jul 4 2022",
+}
+
+
+class FakeChannel:
+    """Channel of a FakeDriver. Bytes of a streamed command that were not read stay buffered, like on a real
+    session, and are what the next command on that channel reads first."""
+
+    def __init__(self, driver, chunk_size=64):
+        self.driver = driver
+        self.chunk_size = chunk_size
+        self.buffer = b""
+
+    def write(self, channel_input, redacted=False):
+        self._input = channel_input
+
+    def send_return(self):
+        self.driver.ios.commands.append((self.driver.host, self._input))
+        output = self.driver.ios.output(self._input)
+        self.buffer += f"{self._input}\n{output}\n{self.driver.prompt}".encode()
+
+    def read(self):
+        chunk, self.buffer = self.buffer[:self.chunk_size], self.buffer[self.chunk_size:]
+        return chunk
+
+
+class FakeDriver:
+    comms_prompt_pattern = r"^[\w.\-@/:]{1,63}[>#]\s*$"
+    default_desired_privilege_level = "privilege_exec"
+
+    def __init__(self, ios, host, **options):
+        self.ios = ios
+        self.host = host
+        self.options = options
+        self.prompt = f"{host}#"
+        self.alive = False
+        self.channel = FakeChannel(self)
+
+    def open(self):
+        if self.host in self.ios.unreachable:
+            raise OSError(f"connection to {self.host} timed out")
+        self.ios.opened += 1
+        self.ios.drivers.append(self)
+        self.alive = True
+
+    def close(self):
+        self.ios.closed += 1
+        self.alive = False
+
+    def isalive(self):
+        return self.alive
+
+    def acquire_priv(self, desired_priv):
+        pass
+
+    def send_command(self, command):
+        from scrapli.response import Response
+
+        stale = self.channel.buffer
+        self.channel.buffer = b""
+        self.channel.write(command)
+        self.channel.send_return()
+        if stale:
+            # Out of sync: the rest of an earlier output, up to its prompt, is taken as the output of this command.
+            result = stale.decode().rsplit("\n", 1)[0]
+        else:
+            # Drop the echo and the trailing prompt like scrapli does.
+            result = self.channel.buffer.decode().split("\n", 1)[1].rsplit("\n", 1)[0]
+            self.channel.buffer = b""
+        response = Response(self.host, command, textfsm_platform="cisco_iosxe", genie_platform="iosxe")
+        response.record_response(result.encode())
+        return response
+
+    def send_commands(self, commands):
+        return [self.send_command(command) for command in commands]
+
+
+class FakeIOS:
+    """
+    Fleet of fake IOS-XE devices behind every IOSXEDriver created while the fixture is active.
+
+    Attributes:
+        outputs(Dict): Command outputs of the devices.
+        unreachable(Set): Hosts whose open() raises OSError.
+        opened/closed(Int): Number of SSH sessions opened and closed.
+        commands(List): (host, command) of every command sent.
+        drivers(List): Every opened FakeDriver.
+    """
+
+    def __init__(self):
+        self.outputs = dict(OUTPUTS)
+        self.unreachable = set()
+        self.opened = 0
+        self.closed = 0
+        self.commands = []
+        self.drivers = []
+
+    def output(self, command):
+        return self.outputs.get(command, f"% Invalid input detected at '^' marker: {command}")
+
+    def driver(self, host, **options):
+        return FakeDriver(self, host, **options)
+
+
+@pytest.fixture
+def fake_ios(monkeypatch):
+    import scrapli.driver.core
+    import nike_devices
+
+    ios = FakeIOS()
+    monkeypatch.setattr(scrapli.driver.core, "IOSXEDriver", ios.driver)
+    # nike_devices may also hold its own reference to the driver class.
+    monkeypatch.setattr(nike_devices, "IOSXEDriver", ios.driver, raising=False)
+    return ios
+
+
+def make_edges(count):
+    return [{"id": edge_id, "name": f"EDGE{edge_id:03d}", "serialNumber": f"VC{edge_id:08d}",
+             "edgeState": "CONNECTED", "modelNumber": "edge680"}
+            for edge_id in range(1, count + 1)]
+
+
+def make_configuration_stack(edge_id):
+    networks = [{"vlanId": vlan, "name": f"vlan{vlan}", "cidrIp": f"10.{edge_id}.{vlan}.1", "netmask": "255.255.255.0",
+                 "dhcp": {"enabled": True}, "baseDhcpAddr": 10, "numDhcpAddr": 200, "advertise": True,
+                 "interfaces": ["GE1"]}
+                for vlan in (10, 20)]
+    routed = [{"name": "GE3", "addressing": {"cidrIp": f"198.51.100.{edge_id}", "netmask": "255.255.255.0",
+                                             "type": "DHCP", "cidrPrefix": 24},
+               "l2": {"duplex": "FULL", "speed": "AUTO"}, "wanOverlay": "AUTO_DISCOVERED"}]
+    return [{"id": edge_id * 10, "modules": [
+        {"name": "controlPlane", "data": {}},
+        {"name": "deviceSettings", "data": {"lan": {"management": {"cidrIp": f"172.16.{edge_id}.1"},
+                                                    "networks": networks},
+                                            "routedInterfaces": routed}},
+    ]}]
+
+
+def make_link_status(edges):
+    return [{"edgeName": edge["name"], "edgeSerialNumber": edge["serialNumber"], "edgeHASerialNumber": None,
+             "edgeState": "CONNECTED", "interface": "GE3", "linkIpAddress": "198.51.100.10", "isp": "Test ISP",
+             "linkState": "STABLE"}
+            for edge in edges]
+
+
+class FakeVco:
+    """
+    VCO REST API on a localhost HTTP/1.1 server.
+
+    Attributes:
+        edges(List): Edges of the enterprise.
+        failures(Dict): {edge id: (status, body)} answers of /edge/getEdgeConfigurationStack for failing edges.
+        outages(List): HTTP statuses answered to the next calls, whatever the method.
+        calls(List): (method, request body) of every call.
+        connections(Int): TCP connections accepted, to check keep-alive pooling.
+    """
+
+    def __init__(self, edges=5):
+        self.edges = make_edges(edges)
+        self.failures = {}
+        self.outages = []
+        self.calls = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        vco = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with vco._lock:
+                    vco.connections += 1
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"null")
+                method = self.path.split("/portal/rest", 1)[-1]
+                with vco._lock:
+                    vco.calls.append((method, body))
+                status, payload = vco.answer(method, body or {})
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/portal/rest"
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def answer(self, method, body):
+        if self.outages:
+            return self.outages.pop(0), {"error": {"code": -32000, "message": "unavailable"}}
+        if method == "/enterprise/getEnterpriseEdges":
+            return 200, self.edges
+        if method == "/edge/getEdgeConfigurationStack":
+            edge_id = body.get("edgeId")
+            if edge_id in self.failures:
+                return self.failures[edge_id]
+            return 200, make_configuration_stack(edge_id)
+        if method == "/monitoring/getEnterpriseEdgeLinkStatus":
+            return 200, make_link_status(self.edges)
+        return 404, {"error": {"code": -32601, "message": f"method {method} not found"}}
+
+    def count(self, method):
+        return sum(1 for called, _ in self.calls if called == method)
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def fake_vco():
+    vco = FakeVco()
+    yield vco
+    vco.close()
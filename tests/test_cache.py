@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+import nike_devices
+from nike_cache import MISS, DiskCache, MemoryCache, ResultCache
+from nike_devices import NikeCiscoDevice
+
+
+@pytest.fixture(params=["memory", "disk"])
+def cache(request, tmp_path):
+    backend = MemoryCache() if request.param == "memory" else DiskCache(str(tmp_path))
+    return ResultCache(backend=backend)
+
+
+def test_concurrent_misses_fetch_once(cache):
+    calls = []
+    started = threading.Barrier(8)
+    results = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"hostname": "sw1"}
+
+    def worker():
+        started.wait()
+        results.append(cache.get_or_fetch(("sw1", "show version", "genie"), fetch, ttl=60))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [{"hostname": "sw1"}] * 8
+    assert len({id(result) for result in results}) == 8
+
+
+def test_fetch_error_reaches_every_waiter_and_is_not_cached(cache):
+    def fetch():
+        raise OSError("timeout")
+
+    with pytest.raises(OSError):
+        cache.get_or_fetch(("sw1", "show version", "genie"), fetch, ttl=60)
+    assert cache.backend.get(("sw1", "show version", "genie")) is MISS
+
+
+def test_expired_entries_are_fetched_again(cache):
+    calls = []
+    key = ("sw1", "show clock", "no_parse")
+    cache.get_or_fetch(key, lambda: calls.append(1) or len(calls), ttl=0.05)
+    time.sleep(0.1)
+    assert cache.get_or_fetch(key, lambda: calls.append(1) or len(calls), ttl=0.05) == 2
+
+
+def test_zero_ttl_commands_are_never_cached(fake_ios):
+    cache = ResultCache(ttls={"show clock": 0})
+    device = NikeCiscoDevice("sw1", "user", "password", cache=cache)
+    device.get_interface_status()
+    device.get_interface_status()
+    device._run_command("show clock")
+    device._run_command("show clock")
+    assert [command for _, command in fake_ios.commands] == ["show interfaces status", "show clock", "show clock"]
+
+
+def test_devices_share_a_cache_per_host(fake_ios):
+    cache = ResultCache()
+    for _ in range(3):
+        NikeCiscoDevice("sw1", "user", "password", cache=cache).get_interface_status()
+    NikeCiscoDevice("sw2", "user", "password", cache=cache).get_interface_status()
+    assert fake_ios.commands == [("sw1", "show interfaces status"), ("sw2", "show interfaces status")]
+
+
+def test_callers_get_their_own_copy(cache):
+    key = ("sw1", "show version", "genie")
+    first = cache.get_or_fetch(key, lambda: {"version": {"hostname": "sw1"}}, ttl=60)
+    first["version"]["hostname"] = "changed"
+    second = cache.get_or_fetch(key, lambda: None, ttl=60)
+    assert second == {"version": {"hostname": "sw1"}}
+    second["version"].clear()
+    assert cache.get_or_fetch(key, lambda: None, ttl=60) == {"version": {"hostname": "sw1"}}
+
+
+def test_memory_cache_evicts_least_recently_used():
+    backend = MemoryCache(max_bytes=300)
+    for key in range(5):
+        backend.set(key, "x" * 80, ttl=60)
+        backend.get(0)
+    assert backend.get(0) != MISS
+    assert backend.get(1) is MISS
+    assert backend.current_bytes <= 300
+
+
+@pytest.mark.parametrize("parsing_module", nike_devices.CACHED_PARSING_MODULES)
+def test_invalidate_drops_every_cached_parsing_module(cache, parsing_module):
+    key = ("sw1", "show version", parsing_module)
+    cache.get_or_fetch(key, lambda: {"version": {"version": "17.9.4"}}, ttl=60)
+    cache.invalidate("sw1", "show version")
+    assert cache.backend.get(key) is MISS
+
+
+def test_invalidate_drops_a_fast_result(cache):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"version": {"version": "17.9.4"}}
+
+    key = ("sw1", "show version", "fast")
+    cache.get_or_fetch(key, fetch, ttl=60)
+    cache.get_or_fetch(key, fetch, ttl=60)
+    cache.invalidate("sw1", "show version")
+    cache.get_or_fetch(key, fetch, ttl=60)
+    assert len(calls) == 2
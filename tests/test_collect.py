@@ -0,0 +1,35 @@
+import pytest
+
+from nike_devices import NikeCiscoDevice
+
+
+def test_collect_sends_every_command_over_one_connection(fake_ios):
+    device = NikeCiscoDevice("sw1", "user", "password")
+    outputs = device.collect(["show version", "show clock"])
+    assert list(outputs) == ["show version", "show clock"]
+    assert outputs["show clock"] == fake_ios.outputs["show clock"]
+    assert fake_ios.opened == fake_ios.closed == 1
+
+
+def test_collect_reuses_the_persistent_session(fake_ios):
+    with NikeCiscoDevice("sw1", "user", "password") as device:
+        device.collect(["show version", "show clock"])
+        device.collect(["show interfaces status"])
+        device.get_interface_status()
+    assert fake_ios.opened == fake_ios.closed == 1
+    assert [command for _, command in fake_ios.commands] == ["show version", "show clock", "show interfaces status",
+                                                             "show interfaces status"]
+
+
+def test_collect_parses_every_output(fake_ios):
+    pytest.importorskip("ntc_templates")
+    device = NikeCiscoDevice("sw1", "user", "password")
+    parsed = device.collect(["show interfaces status"], parsing_module="textfsm")
+    assert [row["port"] for row in parsed["show interfaces status"]] == ["Gi1/0/1", "Gi1/0/2", "Gi1/0/3"]
+
+
+def test_collect_returns_raw_output_for_unknown_parsing_modules(fake_ios):
+    device = NikeCiscoDevice("sw1", "user", "password")
+    with pytest.warns(DeprecationWarning, match="parsing_module 'ginie'"):
+        outputs = device.collect(["show clock"], parsing_module="ginie")
+    assert outputs == {"show clock": fake_ios.outputs["show clock"]}
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import nike_parsers
+from nike_devices import NikeCiscoDevice
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "benchmarks", "fixtures")
+
+
+def recordings():
+    """(file name, command, output) of the recorded outputs of the commands with a fast parser."""
+    found = []
+    for name in sorted(os.listdir(FIXTURES)):
+        command = name[:-4].split("__")[0].replace("_", " ")
+        if name.endswith(".txt") and command in nike_parsers.FAST_PARSERS:
+            with open(os.path.join(FIXTURES, name)) as f:
+                found.append(pytest.param(command, f.read(), id=name))
+    return found
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name)) as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("command,output", recordings())
+def test_fast_parser_matches_genie(command, output):
+    pytest.importorskip("genie.libs.parser")
+    assert nike_parsers.fast_parse(command, output) == nike_parsers.genie_parse(command, output)
+
+
+def test_fast_parsing_does_not_load_genie():
+    output = fixture("show_ip_arp.txt")
+    code = ("import sys, nike_parsers; "
+            "assert nike_parsers.fast_parse('show ip arp', sys.stdin.read())['interfaces']; "
+            "assert not [module for module in sys.modules if module.startswith('genie')]")
+    subprocess.run([sys.executable, "-c", code], input=output, text=True, check=True,
+                   cwd=os.path.join(FIXTURES, os.pardir, os.pardir))
+
+
+def test_unparseable_output_gives_an_empty_result():
+    assert nike_parsers.fast_parse("show ip interface brief", "% Invalid input detected at '^' marker.") == []
+
+
+def test_blank_line_after_the_interface_brief_header():
+    parsed = nike_parsers.fast_parse("show ip interface brief", fixture("show_ip_interface_brief__blank_line.txt"))
+    assert parsed['interface']["Loopback0"]['ip_address'] == "10.255.0.2"
+    assert len(parsed['interface']) == 8
+
+
+def test_switch_table_is_read_only_with_a_padded_header():
+    # Like genie: the 2960X does not pad its 'Switch Ports Model ...' header, a 9300 does.
+    stack = nike_parsers.fast_parse("show version", fixture("show_version__2960x_stack.txt"))['version']
+    assert 'ports' not in stack['switch_num']['2'] and 'active' not in stack['switch_num']['2']
+    assert stack['switch_num']['2']['system_sn'] == "FOC1932X1AC"
+    padded = nike_parsers.fast_parse("show version", fixture("show_version.txt"))['version']
+    assert padded['switch_num']['2']['ports'] == "65" and padded['switch_num']['2']['active'] is False
+
+
+def test_get_methods_accept_fast(fake_ios):
+    status = NikeCiscoDevice("sw1", "user", "password").get_interface_status('fast')
+    assert sorted(status['interfaces']) == ["GigabitEthernet1/0/1", "GigabitEthernet1/0/2", "GigabitEthernet1/0/3"]
+    assert status['interfaces']["GigabitEthernet1/0/3"]['status'] == "notconnect"
@@ -0,0 +1,36 @@
+import pytest
+
+from nike_fleet import NikeFleet
+
+
+def test_run_all_reports_every_host(fake_ios):
+    fake_ios.unreachable.add("sw3")
+    fleet = NikeFleet(["sw1", "sw2", "sw3"], "user", "password")
+    results = fleet.run_all("get_interface_status", workers=2)
+    assert sorted(results) == ["sw1", "sw2", "sw3"]
+    assert results["sw1"].ok and results["sw1"].result == fake_ios.outputs["show interfaces status"]
+    assert results["sw2"].ok
+    assert not results["sw3"].ok and isinstance(results["sw3"].error, OSError)
+    assert results["sw3"].result is None
+
+
+def test_run_yields_results_as_hosts_finish(fake_ios):
+    fleet = NikeFleet([f"sw{index}" for index in range(10)], "user", "password")
+    results = list(fleet.run("get_interface_status", workers=4))
+    assert len(results) == 10 and all(result.ok for result in results)
+    assert all(result.elapsed >= 0 for result in results)
+
+
+def test_timeout_bounds_every_scrapli_timeout(fake_ios):
+    fleet = NikeFleet(["sw1"], "user", "password", timeout_ops=60)
+    assert fleet.run_all("get_interface_status", timeout=5)["sw1"].ok
+    options = fake_ios.drivers[0].options
+    assert options["timeout_socket"] == options["timeout_transport"] == 5
+    # An explicit device option wins over the fleet timeout.
+    assert options["timeout_ops"] == 60
+
+
+def test_unknown_method_is_rejected_before_connecting(fake_ios):
+    with pytest.raises(AttributeError):
+        list(NikeFleet(["sw1"], "user", "password").run("get_everything"))
+    assert fake_ios.opened == 0
@@ -0,0 +1,55 @@
+import pytest
+
+import nike_metrics
+from nike_devices import NikeCiscoDevice
+
+
+def test_device_phases_are_recorded(fake_ios):
+    pytest.importorskip("ntc_templates")
+    stats = nike_metrics.StatsRecorder()
+    device = NikeCiscoDevice("sw1", "user", "password", metrics=stats)
+    device.get_interface_status()
+    device.get_interface_status('textfsm')
+    summary = stats.summary()
+    assert summary[(nike_metrics.CONNECT, "ssh")]["count"] == 2
+    command = summary[(nike_metrics.COMMAND, "show interfaces status")]
+    assert command["count"] == 2
+    assert command["bytes"] == 2 * len(fake_ios.outputs["show interfaces status"])
+    assert summary[(nike_metrics.PARSE, "show interfaces status")]["count"] == 1
+
+
+def test_failed_connect_is_recorded_as_an_error(fake_ios):
+    fake_ios.unreachable.add("sw9")
+    stats = nike_metrics.StatsRecorder(by_host=True)
+    with pytest.raises(OSError):
+        NikeCiscoDevice("sw9", "user", "password", metrics=stats).get_interface_status()
+    assert stats.summary()[(nike_metrics.CONNECT, "ssh", "sw9")]["errors"] == 1
+
+
+def test_null_phase_accepts_writes_and_keeps_no_state():
+    with nike_metrics.NULL_RECORDER.phase(nike_metrics.HTTP, "vco", "/enterprise/getEnterpriseEdges") as phase:
+        phase.bytes += 100
+        phase.error = "HTTP 503"
+    phase = nike_metrics.NULL_RECORDER.phase(nike_metrics.HTTP, "vco", "/enterprise/getEnterpriseEdges")
+    assert phase.bytes == 0 and phase.error is None
+
+
+def test_default_recorder_applies_to_new_devices(fake_ios):
+    stats = nike_metrics.StatsRecorder()
+    nike_metrics.set_default_recorder(stats)
+    try:
+        NikeCiscoDevice("sw1", "user", "password").get_interface_status()
+    finally:
+        nike_metrics.set_default_recorder(None)
+    assert nike_metrics.default_recorder() is nike_metrics.NULL_RECORDER
+    assert stats.summary()[(nike_metrics.COMMAND, "show interfaces status")]["count"] == 1
+
+
+def test_prometheus_recorder_exports_the_phases(fake_ios):
+    prometheus_client = pytest.importorskip("prometheus_client")
+    registry = prometheus_client.CollectorRegistry()
+    device = NikeCiscoDevice("sw1", "user", "password", metrics=nike_metrics.PrometheusRecorder(registry=registry))
+    device.get_interface_status()
+    labels = {"phase": nike_metrics.COMMAND, "operation": "show interfaces status"}
+    assert registry.get_sample_value("nike_phase_seconds_count", labels) == 1
+    assert registry.get_sample_value("nike_phase_bytes_total", labels) == len(fake_ios.outputs["show interfaces status"])
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+from nike_scheduler import PollScheduler
+
+
+class FakeDevice:
+    """Device whose get_os_version returns results(poll number), or raises what it returns."""
+
+    def __init__(self, hostname, results=None, delay=0.0):
+        self.hostname = hostname
+        self.results = results or (lambda poll: "17.9.4")
+        self.delay = delay
+        self.polls = 0
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def get_os_version(self):
+        with self._lock:
+            self.polls += 1
+            poll = self.polls
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(self.delay)
+            result = self.results(poll)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+def test_unchanged_results_back_off_to_max_interval():
+    scheduler = PollScheduler(jitter=0)
+    job = scheduler.add(FakeDevice("sw1"), "get_os_version", interval=0.02, max_interval=0.08)
+    scheduler.run(duration=0.6)
+    assert job.interval == 0.08
+    assert job.changes == 0 and job.runs >= 4
+
+
+def test_changing_results_speed_up_to_min_interval():
+    scheduler = PollScheduler(jitter=0)
+    job = scheduler.add(FakeDevice("sw1", results=lambda poll: poll), "get_os_version", interval=0.08,
+                        min_interval=0.02)
+    scheduler.run(duration=0.4)
+    assert job.interval == 0.02
+    assert job.changes == job.runs - 1
+
+
+def test_errors_keep_the_interval_and_are_reported():
+    reported = []
+    scheduler = PollScheduler(jitter=0, on_result=lambda job, result, error: reported.append(error))
+    job = scheduler.add(FakeDevice("sw1", results=lambda poll: OSError("timeout")), "get_os_version", interval=0.02)
+    scheduler.run(duration=0.2)
+    assert job.interval == 0.02
+    assert job.errors == job.runs == len(reported) > 0
+    assert isinstance(job.last_error, OSError)
+
+
+@pytest.mark.parametrize("limit", [1, 2])
+def test_per_device_limit_bounds_concurrent_polls(limit):
+    device = FakeDevice("sw1", delay=0.03)
+    scheduler = PollScheduler(workers=8, jitter=0)
+    scheduler.set_limit(device, limit)
+    for _ in range(4):
+        scheduler.add(device, "get_os_version", interval=0.01)
+    scheduler.run(duration=0.3)
+    assert device.max_running == limit
+
+
+def test_removed_jobs_stop_polling():
+    device = FakeDevice("sw1")
+    scheduler = PollScheduler(jitter=0).start()
+    job = scheduler.add(device, "get_os_version", interval=0.01)
+    time.sleep(0.1)
+    scheduler.remove(job)
+    time.sleep(0.05)
+    polls = device.polls
+    time.sleep(0.1)
+    scheduler.stop()
+    assert polls > 0 and device.polls == polls
+    assert scheduler.stats() == {}
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(AttributeError):
+        PollScheduler().add(FakeDevice("sw1"), "get_everything")
+
+
+def test_busy_device_does_not_starve_the_others():
+    release = threading.Event()
+
+    def hang(poll):
+        release.wait(5)
+        return poll
+
+    slow, fast = FakeDevice("slow", results=hang), FakeDevice("fast")
+    scheduler = PollScheduler(workers=4, jitter=0)
+    # Two jobs on one device: the second one stays blocked while the first one hangs.
+    scheduler.add(slow, "get_os_version", interval=0.05)
+    scheduler.add(slow, "get_os_version", interval=0.05)
+    scheduler.add(fast, "get_os_version", interval=0.05, min_interval=0.05)
+    timer = threading.Timer(0.5, release.set)
+    timer.start()
+    try:
+        scheduler.run(duration=0.4)
+    finally:
+        release.set()
+        timer.cancel()
+    assert slow.polls == 1
+    assert fast.polls >= 4
@@ -0,0 +1,37 @@
+import warnings
+
+import pytest
+
+from nike_devices import NikeCiscoDevice
+
+
+def test_unsupported_parsing_module_returns_raw_output(fake_ios):
+    device = NikeCiscoDevice("sw1", "user", "password")
+    with pytest.warns(DeprecationWarning, match=r"get_clock_info\(\) does not support parsing_module 'fast'"):
+        assert device.get_clock_info('fast') == fake_ios.outputs["show clock"]
+    with pytest.warns(DeprecationWarning):
+        assert device.get_interface_status('Genie') == fake_ios.outputs["show interfaces status"]
+
+
+def test_supported_parsing_module_does_not_warn(fake_ios):
+    device = NikeCiscoDevice("sw1", "user", "password")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert device.get_clock_info() == fake_ios.outputs["show clock"]
+        assert device.get_interface_status('fast')['interfaces']
+
+
+def test_facts_are_collected_once_and_copied(monkeypatch):
+    device = NikeCiscoDevice("sw1", "user", "password")
+    collected = []
+
+    def get_os_version(parsing_module):
+        collected.append(parsing_module)
+        return {'version': {'chassis_sn': "FOC2235X0AB", 'switch_num': {'1': {'active': True}}}}
+
+    monkeypatch.setattr(device, "get_os_version", get_os_version)
+    facts = device.get_facts()
+    facts['switch_num'].clear()
+    assert device.get_number_of_switch_info() == 1
+    assert device.get_facts()['switch_num'] == {'1': {'active': True}}
+    assert collected == ['genie']
@@ -0,0 +1,44 @@
+import gc
+
+import pytest
+
+from nike_devices import NikeCiscoDevice
+
+
+def test_iter_command_yields_the_output_lines(fake_ios):
+    device = NikeCiscoDevice("sw1", "user", "password")
+    lines = list(device.iter_command("show ip nat translations"))
+    assert lines == fake_ios.outputs["show ip nat translations"].splitlines()
+    assert fake_ios.opened == fake_ios.closed == 1
+
+
+def test_stream_parsing_yields_one_row_per_entry(fake_ios):
+    device = NikeCiscoDevice("sw1", "user", "password")
+    rows = list(device.get_mac_address_table('stream'))
+    assert [(row['vlan_id'], row['destination_port']) for row in rows] == [
+        ('All', ['CPU']), ('20', ['Gi1/0/6']), ('30', ['Gi1/0/1', 'Gi1/0/2'])]
+    assert [row['protocol'] for row in device.get_ip_nat_translations('stream')] == ['tcp', 'tcp', 'udp', '---']
+
+
+def test_streamed_command_leaves_the_session_in_sync(fake_ios):
+    with NikeCiscoDevice("sw1", "user", "password") as device:
+        assert len(list(device.get_mac_address_table('stream'))) == 3
+        assert device.get_interface_status() == fake_ios.outputs["show interfaces status"]
+    assert fake_ios.opened == 1
+
+
+def test_stream_stopped_early_leaves_the_session_in_sync(fake_ios):
+    with NikeCiscoDevice("sw1", "user", "password") as device:
+        for line in device.iter_command("show ip nat translations"):
+            break
+        assert device.get_interface_status() == fake_ios.outputs["show interfaces status"]
+        with pytest.raises(KeyError):
+            for row in device.get_mac_address_table('stream'):
+                row['missing']
+        assert device.get_clock_info() == fake_ios.outputs["show clock"]
+        lines = device.iter_command("show ip nat translations")
+        next(lines)
+        del lines
+        gc.collect()
+        assert device.get_clock_info() == fake_ios.outputs["show clock"]
+    assert fake_ios.opened == 1
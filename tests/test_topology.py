@@ -0,0 +1,169 @@
+import time
+
+import pytest
+
+from nike_topology import Neighbor, TopologyCrawler, TopologyGraph
+
+SWITCH = "Router Switch IGMP"
+
+# Management IP: ((hostname, serial, platform, version), CDP neighbors)
+NETWORK = {
+    "10.0.0.1": (("core1", "SN1", "C9500", "17.9.4"), [
+        Neighbor("Te1/0/1", "dist1.lab", "10.0.0.2", "C9300", "Te1/1/1", SWITCH, ""),
+        Neighbor("Gi1/0/10", "ap1", "10.0.0.9", "AIR-AP2802I", "Gi0", "Trans-Bridge", ""),
+    ]),
+    "10.0.0.2": (("dist1", "SN2", "C9300", "17.9.4"), [
+        Neighbor("Te1/1/1", "core1.lab", "10.0.0.1", "C9500", "Te1/0/1", SWITCH, ""),
+        Neighbor("Gi1/0/1", "acc1.lab", "10.0.0.3", "C9200", "Gi1/1/1", SWITCH, ""),
+    ]),
+    "10.0.0.3": (("acc1", "SN3", "C9200", "17.6.5"), [
+        Neighbor("Gi1/1/1", "dist1.lab", "10.0.0.2", "C9300", "Gi1/0/1", SWITCH, ""),
+    ]),
+}
+
+
+@pytest.fixture
+def polled():
+    return []
+
+
+@pytest.fixture
+def crawler(polled):
+    crawler = TopologyCrawler("user", "password", workers=4)
+
+    def poll(host):
+        polled.append(host)
+        return NETWORK[host]
+
+    crawler._poll = poll
+    return crawler
+
+
+def test_crawl_polls_every_switch_once(crawler, polled):
+    graph = crawler.crawl(["10.0.0.1"])
+    assert sorted(polled) == ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+    assert sorted(graph.nodes) == ["SN1", "SN2", "SN3", "ip:10.0.0.9"]
+    assert graph.nodes["SN2"]["hostname"] == "dist1"
+    # The access point is stored as a neighbor, but not crawled.
+    assert graph.nodes["ip:10.0.0.9"]["crawled_at"] is None
+    assert graph.edges() == [(("SN1", "Gi1/0/10"), ("ip:10.0.0.9", "Gi0")),
+                             (("SN1", "Te1/0/1"), ("SN2", "Te1/1/1")),
+                             (("SN2", "Gi1/0/1"), ("SN3", "Gi1/1/1"))]
+
+
+def test_crawl_stops_at_max_depth(crawler, polled):
+    crawler.max_depth = 1
+    crawler.crawl(["10.0.0.1"])
+    assert sorted(polled) == ["10.0.0.1", "10.0.0.2"]
+
+
+def test_failed_poll_is_stored_and_does_not_stop_the_crawl(crawler, polled):
+    poll = crawler._poll
+
+    def flaky(host):
+        if host == "10.0.0.3":
+            raise OSError("timeout")
+        return poll(host)
+
+    crawler._poll = flaky
+    graph = crawler.crawl(["10.0.0.1"])
+    assert graph.nodes[graph.node_for("10.0.0.3")]["error"] == "OSError: timeout"
+    assert sorted(polled) == ["10.0.0.1", "10.0.0.2"]
+
+
+def test_recovered_device_loses_its_error(crawler, polled):
+    poll = crawler._poll
+
+    def flaky(host):
+        if host == "10.0.0.3":
+            raise OSError("timeout")
+        return poll(host)
+
+    crawler._poll = flaky
+    crawler.crawl(["10.0.0.1"])
+    crawler._poll = poll
+    graph = crawler.crawl(["10.0.0.1"], refresh_after=3600)
+    assert polled[-1:] == ["10.0.0.3"]
+    assert graph.nodes["SN3"]["error"] is None
+    polled.clear()
+    crawler.crawl(["10.0.0.1"], refresh_after=3600)
+    assert polled == []
+
+
+def test_incremental_crawl_reuses_recent_devices(crawler, polled, tmp_path):
+    crawler.crawl(["10.0.0.1"])
+    path = str(tmp_path / "topology.json")
+    crawler.graph.save(path)
+    graph = TopologyGraph.load(path)
+    assert graph.edges() == crawler.graph.edges()
+    polled.clear()
+    crawler.graph = graph
+    crawler.crawl(["10.0.0.1"], refresh_after=3600)
+    assert polled == []
+
+
+def test_device_seen_under_two_ips_is_one_node():
+    graph = TopologyGraph()
+    graph.add_device("10.0.0.2", None, hostname="dist1.lab")
+    node_id = graph.add_device("10.0.0.2", "SN2", hostname="dist1")
+    assert graph.add_device("10.0.1.2", "SN2") == node_id == "SN2"
+    assert graph.nodes["SN2"]["ips"] == ["10.0.0.2", "10.0.1.2"]
+    assert graph.node_for("10.0.1.2") == graph.node_for(serial="SN2") == "SN2"
+
+
+def test_links_follow_renamed_and_merged_nodes():
+    graph = TopologyGraph()
+    core = graph.add_device("10.0.0.1", "SN1", hostname="core1")
+    dist = graph.add_device("10.0.0.2", None, hostname="dist1.lab")
+    other_ip = graph.add_device("10.0.1.2", None, hostname="dist1.lab")
+    graph.set_links(core, {"Te1/0/1": (dist, "Te1/1/1"), "Te1/0/2": (other_ip, "Te1/1/2")})
+    graph.set_links(dist, {"Te1/1/1": (core, "Te1/0/1"), "Gi1/0/48": (dist, "Gi1/0/47")})
+    # Crawling dist1 reveals its serial, then that its second IP is the same chassis.
+    assert graph.add_device("10.0.0.2", "SN2") == "SN2"
+    assert graph.add_device("10.0.1.2", "SN2") == "SN2"
+    assert sorted(graph.nodes) == ["SN1", "SN2"]
+    assert graph.edges() == [(("SN1", "Te1/0/1"), ("SN2", "Te1/1/1")),
+                             (("SN1", "Te1/0/2"), ("SN2", "Te1/1/2")),
+                             (("SN2", "Gi1/0/47"), ("SN2", "Gi1/0/48"))]
+    # Replaced links are no longer repointed.
+    graph.set_links("SN1", {})
+    graph.add_device("10.0.2.2", None)
+    graph.set_links("SN2", {"Gi1/0/1": ("ip:10.0.2.2", "Gi0")})
+    assert graph.add_device("10.0.2.2", "SN3") == "SN3"
+    assert graph.links == {"SN1": {}, "SN2": {"Gi1/0/1": ("SN3", "Gi0")}}
+
+
+def stored_chain(length, stale=()):
+    """Graph of a chain of devices 10.0.x.y crawled a minute ago, each linked to the next one."""
+    graph = TopologyGraph()
+    ips = [f"10.0.{index // 256}.{index % 256}" for index in range(length)]
+    nodes = [graph.add_device(ip, f"SN{index:05d}", hostname=f"sw{index}",
+                              crawled_at=time.time() - (7200 if index in stale else 60))
+             for index, ip in enumerate(ips)]
+    for node_id, next_id in zip(nodes, nodes[1:]):
+        graph.set_links(node_id, {"Gi1/0/48": (next_id, "Gi1/0/1")})
+    return graph, ips
+
+
+def test_crawl_walks_a_deep_stored_chain_without_polling():
+    graph, ips = stored_chain(1500)
+    crawler = TopologyCrawler("user", "password", graph=graph)
+    polled = []
+    crawler._poll = polled.append
+    assert crawler.crawl([ips[0]], refresh_after=3600) is graph
+    assert polled == []
+
+
+def test_crawl_polls_stale_devices_at_the_end_of_a_deep_stored_chain():
+    graph, ips = stored_chain(1500, stale={1499})
+    crawler = TopologyCrawler("user", "password", graph=graph, max_depth=1499)
+    polled = []
+
+    def poll(host):
+        polled.append(host)
+        return ("sw1499", "SN01499", "C9300", "17.9.4"), []
+
+    crawler._poll = poll
+    crawler.crawl([ips[0]], refresh_after=3600)
+    assert polled == [ips[1499]]
+    assert graph.nodes["SN01499"]["version"] == "17.9.4"
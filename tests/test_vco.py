@@ -0,0 +1,134 @@
+import time
+
+import pytest
+import requests
+
+import nike_metrics
+from nike_devices import NikeVcoDevice
+
+
+def make_vco(fake_vco, **options):
+    return NikeVcoDevice(token="test", vco_url=fake_vco.url, **options)
+
+
+def test_calls_reuse_one_pooled_connection(fake_vco):
+    with make_vco(fake_vco) as vco:
+        for _ in range(5):
+            assert len(vco.post_vco_request('/enterprise/getEnterpriseEdges', data={"enterpriseId": 1})) == 5
+    assert fake_vco.connections == 1
+
+
+def test_unavailable_orchestrator_is_retried(fake_vco):
+    fake_vco.outages = [503, 503]
+    with make_vco(fake_vco, retries=3, backoff_factor=0) as vco:
+        assert len(vco.post_vco_request('/enterprise/getEnterpriseEdges', data={"enterpriseId": 1})) == 5
+    assert fake_vco.count('/enterprise/getEnterpriseEdges') == 3
+
+
+def test_edge_config_is_fetched_once_for_every_view(fake_vco):
+    vco = make_vco(fake_vco)
+    assert vco.getEdgeManagementIp(3) == "172.16.3.1"
+    assert sorted(vco.getEdgeLanSviInfo(3)) == [10, 20]
+    assert vco.getEdgeWanInterfaceInfo(3)["GE3"]["ipv4_address"] == "198.51.100.3"
+    assert vco.getEdgeConfiguration(3)[0]["id"] == 30
+    assert fake_vco.count('/edge/getEdgeConfigurationStack') == 1
+
+
+def test_edge_views_are_copies(fake_vco):
+    vco = make_vco(fake_vco)
+    vco.getEdgeLanSviInfo(3).clear()
+    vco.getEdgeWanInterfaceInfo(3)["GE3"]["ipv4_address"] = "0.0.0.0"
+    vco.getEdgeConfiguration(3)[0]["modules"].clear()
+    assert sorted(vco.getEdgeLanSviInfo(3)) == [10, 20]
+    assert vco.getEdgeWanInterfaceInfo(3)["GE3"]["ipv4_address"] == "198.51.100.3"
+    assert vco.getEdgeManagementIp(3) == "172.16.3.1"
+    assert fake_vco.count('/edge/getEdgeConfigurationStack') == 1
+
+
+def test_edge_config_refresh_and_invalidate(fake_vco):
+    vco = make_vco(fake_vco)
+    vco.get_edge_config(1)
+    vco.get_edge_config(2)
+    vco.get_edge_config(1, refresh=True)
+    vco.invalidate_edge_config(2)
+    vco.get_edge_config(2)
+    vco.get_edge_config(1)
+    assert fake_vco.count('/edge/getEdgeConfigurationStack') == 4
+
+
+def test_edge_config_expires_after_its_ttl(fake_vco):
+    vco = make_vco(fake_vco, edge_config_ttl=0)
+    vco.get_edge_config(1)
+    vco.get_edge_config(1)
+    assert fake_vco.count('/edge/getEdgeConfigurationStack') == 2
+
+
+def test_failed_edge_config_is_not_cached(fake_vco):
+    fake_vco.failures[3] = (200, {"error": {"code": -32000, "message": "rate limit exceeded"}})
+    vco = make_vco(fake_vco)
+    with pytest.raises(ValueError):
+        vco.getEdgeLanSviInfo(3)
+    fake_vco.failures[3] = (404, {"error": {"code": -32602, "message": "edge not found"}})
+    with pytest.raises(requests.HTTPError):
+        vco.getEdgeLanSviInfo(3)
+    del fake_vco.failures[3]
+    assert sorted(vco.getEdgeLanSviInfo(3)) == [10, 20]
+    assert fake_vco.count('/edge/getEdgeConfigurationStack') == 3
+
+
+def test_all_edge_configs_are_fetched_once_and_cached(fake_vco):
+    vco = make_vco(fake_vco)
+    results = {result.edge_id: result for result in vco.get_all_edge_configs(concurrency=4)}
+    assert sorted(results) == [1, 2, 3, 4, 5]
+    assert all(result.ok for result in results.values())
+    assert results[2].config.management_ip == "172.16.2.1"
+    assert sorted(vco.getEdgeLanSviInfo(4)) == [10, 20]
+    assert len(list(vco.get_all_edge_configs(edge_ids=[1, 2]))) == 2
+    assert fake_vco.count('/edge/getEdgeConfigurationStack') == 5
+    list(vco.get_all_edge_configs(edge_ids=[1], refresh=True))
+    assert fake_vco.count('/edge/getEdgeConfigurationStack') == 6
+
+
+def test_all_edge_configs_report_failing_edges(fake_vco):
+    fake_vco.failures[2] = (500, {"error": {"code": -32603, "message": "internal error"}})
+    fake_vco.failures[4] = (200, {"error": {"code": -32000, "message": "rate limit exceeded"}})
+    vco = make_vco(fake_vco, backoff_factor=0)
+    results = {result.edge_id: result for result in vco.get_all_edge_configs(concurrency=4)}
+    assert sorted(edge_id for edge_id, result in results.items() if result.ok) == [1, 3, 5]
+    assert isinstance(results[2].error, requests.HTTPError) and results[2].config is None
+    assert isinstance(results[4].error, ValueError) and results[4].config is None
+    assert results[5].config.management_ip == "172.16.5.1"
+
+
+def test_all_edge_configs_respect_the_rate_limit(fake_vco):
+    vco = make_vco(fake_vco)
+    start = time.monotonic()
+    assert len(list(vco.get_all_edge_configs(edge_ids=[1, 2, 3, 4, 5], concurrency=5, rate_limit=20))) == 5
+    # One request at once, then one every 50 ms.
+    assert time.monotonic() - start >= 0.19
+
+
+def test_streamed_calls_without_recorder(fake_vco):
+    # A fresh process has no recorder set, the calls must work on the shared null phase.
+    assert nike_metrics.default_recorder() is nike_metrics.NULL_RECORDER
+    vco = make_vco(fake_vco, retries=0)
+    assert vco.metrics is nike_metrics.NULL_RECORDER
+    assert vco.getEdgesByName("EDGE003")["id"] == 3
+    assert [link["interface"] for link in vco.getEdgeStatus("EDGE003")] == ["GE3"]
+    assert list(vco.getWanInterfaceStatus("EDGE003")) == ["GE3"]
+    results = list(vco.get_all_edge_configs())
+    assert len(results) == 5 and all(result.ok for result in results)
+
+
+def test_streamed_edges_and_bytes_are_recorded(fake_vco):
+    recorder = nike_metrics.StatsRecorder()
+    vco = make_vco(fake_vco, metrics=recorder)
+    assert list(vco.iter_edges()) == fake_vco.edges
+    parse = [totals for (phase, _), totals in recorder.summary().items() if phase == nike_metrics.PARSE]
+    assert parse and parse[0]["bytes"] > 0
+
+
+def test_streamed_error_object_raises(fake_vco):
+    vco = make_vco(fake_vco, retries=0)
+    with pytest.raises(ValueError):
+        list(vco.iter_vco_request('/enterprise/getEverything', data={}))